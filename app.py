@@ -1,6 +1,13 @@
+# Only light imports here: pandas, scikit-learn and the pipeline package are
+# imported by the cached loaders below, on a background thread at startup
+import math
 import os
+import time
+
 import streamlit as st
 
+RUN_STARTED = time.perf_counter()
+
 # --------------------------------------------------
 # Page Config
 # --------------------------------------------------
@@ -52,12 +59,281 @@ st.markdown(
 # --------------------------------------------------
 # Helper
 # --------------------------------------------------
+@st.cache_resource(show_spinner=False)
+def load_image(path: str, max_width: int = 1400) -> bytes:
+    """PNG bytes no wider than Streamlit's content width, so reruns don't rescale them."""
+    import io
+
+    from PIL import Image
+
+    with Image.open(path) as image:
+        if image.width > max_width:
+            image = image.resize((max_width, round(image.height * max_width / image.width)))
+        buffer = io.BytesIO()
+        image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
 def show_image(path: str, caption: str):
     if os.path.exists(path):
-        st.image(path, caption=caption, use_container_width=True)
+        st.image(load_image(path), caption=caption, use_container_width=True)
     else:
         st.warning(f"Image not found: `{path}`")
 
+
+SENTIMENT_COLORS = {"Positive": "#66c2a5", "Neutral": "#8da0cb", "Negative": "#fc8d62"}
+
+
+def sentiment_bars(counts, x_title: str, y_title: str):
+    """Stacked bars of a (category × sentiment) count table, as a plain Vega-Lite spec."""
+    data = counts.rename_axis("category").reset_index().melt(
+        id_vars="category", var_name="sentiment", value_name="count"
+    )
+    st.vega_lite_chart(
+        data,
+        {
+            "mark": "bar",
+            "encoding": {
+                "x": {"field": "category", "type": "nominal", "sort": None, "title": x_title},
+                "y": {"field": "count", "type": "quantitative", "title": y_title},
+                "color": {
+                    "field": "sentiment",
+                    "type": "nominal",
+                    "scale": {"domain": list(SENTIMENT_COLORS), "range": list(SENTIMENT_COLORS.values())},
+                },
+            },
+        },
+        use_container_width=True,
+    )
+
+
+def lines(table, x_title: str, y_title: str, x_type: str = "nominal"):
+    """One line per column of `table` over its index, as a plain Vega-Lite spec."""
+    data = table.rename_axis("x").reset_index().melt(id_vars="x", var_name="series", value_name="value")
+    st.vega_lite_chart(
+        data,
+        {
+            "mark": {"type": "line", "point": x_type == "nominal"},
+            "encoding": {
+                "x": {"field": "x", "type": x_type, "sort": None, "title": x_title},
+                "y": {"field": "value", "type": "quantitative", "title": y_title,
+                      "scale": {"zero": False}},
+                "color": {"field": "series", "type": "nominal", "title": None},
+            },
+        },
+        use_container_width=True,
+    )
+
+def listing_map(bins):
+    """Hexagonal cells from `Dashboard.listing_map` as sized, coloured points on a map projection."""
+    st.vega_lite_chart(
+        bins.round(5),
+        {
+            "projection": {"type": "mercator"},
+            "mark": {"type": "circle", "opacity": 0.8},
+            "encoding": {
+                "longitude": {"field": "longitude", "type": "quantitative"},
+                "latitude": {"field": "latitude", "type": "quantitative"},
+                "size": {"field": "count", "type": "quantitative", "title": "Listings"},
+                "color": {"field": "avg_vader_score", "type": "quantitative", "title": "Mean score",
+                          "scale": {"scheme": "redyellowgreen"}},
+                "tooltip": [
+                    {"field": "count", "type": "quantitative", "title": "Listings"},
+                    {"field": "avg_vader_score", "type": "quantitative", "title": "Mean score", "format": ".3f"},
+                    {"field": "price", "type": "quantitative", "title": "Mean price", "format": "$.0f"},
+                ],
+            },
+        },
+        use_container_width=True,
+    )
+
+
+def listing_ranking(ranking: dict):
+    """Top and bottom listings as lollipop-style bars, with the selection's quartiles as rules."""
+    import pandas as pd
+
+    listings = pd.concat([ranking["top"], ranking["bottom"]])
+    data = pd.DataFrame({
+        "listing": listings["listing_id"].astype(str),
+        "score": listings["avg_vader_score"].round(4),
+        "group": ["Top"] * len(ranking["top"]) + ["Bottom"] * len(ranking["bottom"]),
+    })
+    quartiles = pd.DataFrame({"score": ranking["quantiles"].loc[[0.25, 0.5, 0.75]].round(4).to_numpy()})
+    st.vega_lite_chart(
+        {
+            "layer": [
+                {
+                    "data": {"values": data.to_dict("records")},
+                    "mark": {"type": "bar", "height": 3},
+                    "encoding": {
+                        "y": {"field": "listing", "type": "nominal", "sort": None, "title": "Listing ID"},
+                        "x": {"field": "score", "type": "quantitative", "title": "Average VADER Score"},
+                        "color": {"field": "group", "type": "nominal", "title": None,
+                                  "scale": {"domain": ["Top", "Bottom"], "range": ["#1a9850", "#d73027"]}},
+                    },
+                },
+                {
+                    "data": {"values": quartiles.to_dict("records")},
+                    "mark": {"type": "rule", "strokeDash": [4, 3], "color": "#9CA3AF"},
+                    "encoding": {"x": {"field": "score", "type": "quantitative"}},
+                },
+            ],
+        },
+        use_container_width=True,
+    )
+
+# --------------------------------------------------
+# Data: precomputed by the pipeline's `dashboard` stage, loaded once per
+# process and shared by all sessions; per-filter views are memoized
+# --------------------------------------------------
+ARTIFACTS_DIR = os.environ.get("SENTIMENT_PRICING_WORKDIR", "artifacts")
+
+
+KEY_VISUALS = [
+    ("positive_negative_words.png", "Top Positive and Negative Review Words"),
+    ("sentiment_over_time.png", "Average Sentiment Over Time"),
+    ("sentiment_price_ranges.png", "Sentiment Distribution Across Price Ranges"),
+    ("predicted_vs_actual.png", "Predicted vs Actual Satisfaction Ratings"),
+]
+
+# Print per-run render times (and show them in the sidebar) when set
+SHOW_TIMINGS = bool(os.environ.get("SENTIMENT_PRICING_TIMINGS"))
+
+
+@st.cache_resource(show_spinner=False)
+def load_dashboard(workdir: str):
+    path = os.path.join(workdir, "dashboard.pkl")
+    if not os.path.exists(path):
+        return None
+    import pickle
+
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+@st.cache_resource(show_spinner=False)
+def load_forecaster(workdir: str):
+    path = os.path.join(workdir, "forecaster.pkl")
+    if not os.path.exists(path):
+        return None
+    from sentiment_pricing.predict import load_forecaster as load
+
+    return load(path)
+
+
+@st.cache_resource(show_spinner=False)
+def preload_artifacts(workdir: str) -> dict:
+    """Load the artifacts on a background thread, once per process, so the first
+    page paints without waiting and later sessions find them in the cache."""
+    import threading
+
+    def load():
+        load_dashboard(workdir)
+        load_forecaster(workdir)
+        for path, _ in KEY_VISUALS:
+            if os.path.exists(path):
+                load_image(path)
+
+    threading.Thread(target=load, name="preload-artifacts", daemon=True).start()
+    return {"process_started": time.perf_counter()}
+
+
+@st.cache_data(max_entries=512, show_spinner=False)
+def dashboard_views(workdir: str, filters: tuple) -> dict:
+    dashboard = load_dashboard(workdir)
+    selection = dict(filters)
+    return {
+        "overview": dashboard.overview(selection),
+        "price_ranges": dashboard.price_range_sentiment(selection),
+        "scores": dashboard.score_by_price_range(selection),
+        "room_types": dashboard.segment_sentiment("room_type", selection),
+        "superhost": dashboard.segment_sentiment("host_is_superhost", selection),
+        "trend": dashboard.weekly_trend(selection),
+        "map": dashboard.listing_map(selection),
+        "ranking": dashboard.listing_ranking(selection),
+        "alerts": dashboard.drift_alerts(selection),
+    }
+
+
+def show_dashboard(dashboard):
+    options = dashboard.options()
+    f1, f2, f3, f4 = st.columns(4)
+    filters = (
+        ("price_range", tuple(f1.multiselect("Price range", options["price_range"]))),
+        ("room_type", tuple(f2.multiselect("Room type", options["room_type"]))),
+        ("host_is_superhost", tuple(f3.multiselect("Superhost", options["host_is_superhost"]))),
+        ("neighbourhood_cleansed", tuple(f4.multiselect("Neighbourhood", options["neighbourhood_cleansed"]))),
+    )
+    views = dashboard_views(ARTIFACTS_DIR, filters)
+
+    overview = views["overview"]
+    if not overview["listings"]:
+        st.warning("No reviewed listings match these filters.")
+        return
+    m1, m2, m3, m4 = st.columns(4)
+    m1.metric("Listings", f"{overview['listings']:,}")
+    m2.metric("Reviews", f"{overview['reviews']:,}")
+    m3.metric("Avg VADER score", f"{overview['avg_vader_score']:.3f}")
+    m4.metric("Negative reviews", f"{overview['negative_share']:.1%}")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown("**Listings by price range and most common sentiment**")
+        sentiment_bars(views["price_ranges"], "Price Range", "Number of Listings")
+    with col2:
+        st.markdown("**Listing sentiment score by price range**")
+        lines(views["scores"][["q25", "median", "q75"]], "Price Range", "VADER Sentiment Score")
+
+    col3, col4 = st.columns(2)
+    with col3:
+        st.markdown("**Reviews by room type and sentiment**")
+        sentiment_bars(views["room_types"], "Room Type", "Number of Reviews")
+    with col4:
+        st.markdown("**Reviews by superhost status and sentiment**")
+        sentiment_bars(views["superhost"], "Superhost", "Number of Reviews")
+
+    st.markdown("**Weekly average sentiment (EWMA)**")
+    lines(views["trend"][["avg_vader_score"]], "Week", "Average VADER Compound Score", "temporal")
+
+    col5, col6 = st.columns(2)
+    with col5:
+        st.markdown("**Where the listings are** (hexagonal cells; size: listings, colour: mean score)")
+        listing_map(views["map"])
+    with col6:
+        ranking = views["ranking"]
+        st.markdown(f"**Highest- and lowest-scoring listings** (of {ranking['count']:,})")
+        listing_ranking(ranking)
+    if not views["alerts"].empty:
+        st.markdown("**Listings with a recent sentiment drop**")
+        st.dataframe(views["alerts"][["n_reviews", "baseline_score", "recent_score", "recent_negative",
+                                      "alert_since", "severity"]])
+
+
+def show_forecast(forecaster):
+    """What-if rating forecast for a listing described in the form (single-row fast path)."""
+    categories = forecaster.categories()
+    c1, c2, c3 = st.columns(3)
+    listing = {
+        "log_price": math.log1p(c1.number_input("Nightly price ($)", 10, 5000, 200, step=10)),
+        "room_type": c1.selectbox("Room type", categories["room_type"]),
+        "property_type": c1.selectbox("Property type", categories["property_type"]),
+        "neighbourhood_cleansed": c2.selectbox("Neighbourhood", categories["neighbourhood_cleansed"]),
+        "bedrooms": c2.number_input("Bedrooms", 0, 20, 2),
+        "bathrooms": c2.number_input("Bathrooms", 0.0, 20.0, 1.0, step=0.5),
+        "accommodates": c3.number_input("Guests", 1, 30, 4),
+        "host_is_superhost": float(c3.checkbox("Superhost")),
+        "avg_vader_score": c3.slider("Average review sentiment (VADER)", -1.0, 1.0, 0.4, step=0.05),
+    }
+    # The form has no location, so neighbour features (nb_*), if the model uses them, are imputed
+    rating = forecaster.predict(listing)
+    meta = forecaster.metadata
+    st.metric("Forecast rating", f"{rating:.2f}")
+    st.caption(f"{meta['backend']} model trained {meta['created_at'][:10]}, "
+               f"test MAE {meta['metrics']['test_mae']:.3f}")
+
+
+PROCESS = preload_artifacts(ARTIFACTS_DIR)
+
 # --------------------------------------------------
 # Sidebar Navigation
 # --------------------------------------------------
@@ -149,6 +425,20 @@ elif section == "Data & Methodology":
 elif section == "Results & Visuals":
     st.header("📊 Results & Visual Insights")
 
+    dashboard = load_dashboard(ARTIFACTS_DIR)
+    if dashboard is None:
+        st.info(
+            f"Interactive views need `{ARTIFACTS_DIR}/dashboard.pkl`; "
+            "run `python -m sentiment_pricing` to build it."
+        )
+    else:
+        st.subheader("🔎 Explore by Segment")
+        show_dashboard(dashboard)
+        forecaster = load_forecaster(ARTIFACTS_DIR)
+        if forecaster is not None:
+            with st.expander("🔮 Forecast a listing's rating"):
+                show_forecast(forecaster)
+
     st.markdown(
         """
         • Positive sentiment dominates across nearly all listings<br>
@@ -160,17 +450,10 @@ elif section == "Results & Visuals":
 
     st.subheader("🖼️ Key Visuals")
 
-    col1, col2 = st.columns(2)
-    with col1:
-        show_image("positive_negative_words.png", "Top Positive and Negative Review Words")
-    with col2:
-        show_image("sentiment_over_time.png", "Average Sentiment Over Time")
-
-    col3, col4 = st.columns(2)
-    with col3:
-        show_image("sentiment_price_ranges.png", "Sentiment Distribution Across Price Ranges")
-    with col4:
-        show_image("sentiment_price_ranges.png", "Sentiment Distribution Across Price Ranges")
+    for row in range(0, len(KEY_VISUALS), 2):
+        for col, (path, caption) in zip(st.columns(2), KEY_VISUALS[row:row + 2]):
+            with col:
+                show_image(path, caption)
 
 elif section == "Business Impact":
     st.header("💼 Business Impact")
@@ -205,3 +488,15 @@ elif section == "Key Takeaways":
 # --------------------------------------------------
 st.markdown("<div class='divider'></div>", unsafe_allow_html=True)
 st.caption("📊 Portfolio Project | Rhode Island Airbnb | Sentiment & Pricing Analysis")
+
+# --------------------------------------------------
+# Render timings: the session's first render (time to first paint) and reruns
+# --------------------------------------------------
+if SHOW_TIMINGS:
+    elapsed_ms = (time.perf_counter() - RUN_STARTED) * 1000
+    kind = "rerun" if "first_render_ms" in st.session_state else "first render"
+    st.session_state.setdefault("first_render_ms", elapsed_ms)
+    since_start = (time.perf_counter() - PROCESS["process_started"]) * 1000
+    print(f"[app] {kind} of '{section}' in {elapsed_ms:.0f} ms ({since_start:.0f} ms since startup)")
+    st.sidebar.caption(f"First render {st.session_state['first_render_ms']:.0f} ms · "
+                       f"this run {elapsed_ms:.0f} ms")
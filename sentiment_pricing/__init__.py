@@ -0,0 +1,7 @@
+"""Rhode Island Airbnb listings — NLP sentiment, pricing and forecasting pipeline.
+
+Stage modules (`load`, `clean`, `score`, `aggregate`, `merge`, `model`, `render`)
+import their heavy dependencies lazily, so importing one stage stays cheap.
+"""
+
+__version__ = "0.1.0"
@@ -0,0 +1,232 @@
+"""Aggregate stage: listing-level sentiment (`summary_df`) and segment views.
+
+Reviews are reduced to one row per listing before anything is joined to the
+listing table, so listing attributes are never copied onto every review.
+"""
+
+from collections import Counter
+from itertools import chain
+from typing import Dict, Iterable
+
+import numpy as np
+import pandas as pd
+
+from .config import SENTIMENT_LABELS
+
+# VADER rounds compound scores to 4 decimals, so sums are kept as exact integers
+# in units of 1e-4 and partials combine to the same totals in any grouping
+SCORE_SCALE = 10_000
+# Reviews tokenized at a time when counting words
+WORD_CHUNKSIZE = 10_000
+
+# Per-listing partial aggregate columns: review count, compound-score sum, and
+# for each label its count and the position of its first review (for tie-breaks)
+COUNT_COLUMNS = [f"n_{label.lower()}" for label in SENTIMENT_LABELS]
+FIRST_COLUMNS = [f"first_{label.lower()}" for label in SENTIMENT_LABELS]
+
+
+def join_reviews(ri_df: pd.DataFrame, reviews_df: pd.DataFrame) -> pd.DataFrame:
+    """Review-level frame with listing attributes attached (`final_df`)."""
+    return pd.merge(ri_df, reviews_df, on="listing_id", how="inner")
+
+
+def summarize_listings_reference(final_df: pd.DataFrame) -> pd.DataFrame:
+    """Original per-listing lambda aggregation, kept for parity checks and benchmarks."""
+    return (
+        final_df.groupby("listing_id")
+        .agg(
+            price_range=("price_range", lambda x: x.mode()[0]),
+            latitude=("latitude", "first"),
+            longitude=("longitude", "first"),
+            avg_vader_score=("vader_score", "mean"),
+            most_common_sentiment=("sentiment", lambda x: x.value_counts().idxmax()),
+        )
+        .reset_index()
+    )
+
+
+def _plain_keys(reviews_df: pd.DataFrame) -> pd.DataFrame:
+    """Reviews with `listing_id` as plain ids (compact tables store it as a categorical)."""
+    if isinstance(reviews_df["listing_id"].dtype, pd.CategoricalDtype):
+        return reviews_df.assign(listing_id=np.asarray(reviews_df["listing_id"]))
+    return reviews_df
+
+
+def partial_sentiment(reviews_df: pd.DataFrame) -> pd.DataFrame:
+    """Mergeable per-listing sentiment totals for a batch of scored reviews.
+
+    The frame's index is taken as each review's position in the full table. With
+    a `date` column, the latest review date per listing is kept as `last_review`.
+    """
+    scaled = np.rint(reviews_df["vader_score"].to_numpy(dtype=np.float64) * SCORE_SCALE)
+    reviews_df = _plain_keys(reviews_df).assign(
+        _pos=reviews_df.index.to_numpy(),
+        _score=scaled.astype(np.int64),
+    )
+    by_listing = reviews_df.groupby("listing_id")
+    by_label = reviews_df.groupby(["listing_id", "sentiment"], observed=True)
+
+    counts = by_label.size().unstack().reindex(columns=SENTIMENT_LABELS)
+    first = by_label["_pos"].min().unstack().reindex(columns=SENTIMENT_LABELS)
+
+    out = pd.DataFrame({"n_reviews": by_listing.size(), "vader_sum": by_listing["_score"].sum()})
+    out[COUNT_COLUMNS] = counts.fillna(0).astype(np.int64).to_numpy()
+    out[FIRST_COLUMNS] = first.to_numpy(dtype=np.float64)
+    if "date" in reviews_df.columns:
+        out["last_review"] = by_listing["date"].max()
+    return out
+
+
+def combine_partials(parts: Iterable[pd.DataFrame]) -> pd.DataFrame:
+    """Merge partial totals from several batches into one row per listing."""
+    stacked = pd.concat(list(parts))
+    combined = stacked.groupby(level=0)
+    sums = combined[["n_reviews", "vader_sum"] + COUNT_COLUMNS].sum()
+    out = sums.join(combined[FIRST_COLUMNS].min())
+    if "last_review" in stacked.columns:
+        out["last_review"] = combined["last_review"].max()
+    return out
+
+
+def finalize_sentiment(partials: pd.DataFrame) -> pd.DataFrame:
+    """`avg_vader_score` and `most_common_sentiment` per listing from partial totals.
+
+    Ties between labels go to the label whose first review came earliest,
+    matching `value_counts().idxmax()` on the reviews in table order.
+    """
+    counts = partials[COUNT_COLUMNS].to_numpy()
+    first = partials[FIRST_COLUMNS].to_numpy(dtype=np.float64)
+    is_max = counts == counts.max(axis=1, keepdims=True)
+    winner = np.where(is_max, np.nan_to_num(first, nan=np.inf), np.inf).argmin(axis=1)
+
+    out = pd.DataFrame(
+        {
+            "listing_id": partials.index.to_numpy(),
+            "avg_vader_score": (partials["vader_sum"] / SCORE_SCALE / partials["n_reviews"]).to_numpy(),
+            "most_common_sentiment": np.asarray(SENTIMENT_LABELS, dtype=object)[winner],
+            "n_reviews": partials["n_reviews"].to_numpy(),
+            **{c: partials[c].to_numpy() for c in COUNT_COLUMNS},
+        }
+    )
+    if "last_review" in partials.columns:
+        out["last_review"] = partials["last_review"].to_numpy()
+    return out
+
+
+def listing_sentiment(reviews_df: pd.DataFrame, listing_ids=None) -> pd.DataFrame:
+    """Per-listing sentiment computed on the reviews side.
+
+    With `listing_ids`, only reviews of those listings are kept; the ids become
+    categorical keys, so the filter is a code lookup rather than a merge.
+    """
+    if listing_ids is not None:
+        keys = pd.Categorical(reviews_df["listing_id"], categories=pd.unique(np.asarray(listing_ids)))
+        reviews_df = reviews_df[keys.codes >= 0]
+    reviews_df = _plain_keys(reviews_df).reset_index(drop=True)
+
+    sentiment = finalize_sentiment(partial_sentiment(reviews_df))
+    # Same reduction as the original groupby mean, so scores match it exactly
+    means = reviews_df.groupby("listing_id")["vader_score"].mean()
+    sentiment["avg_vader_score"] = means.to_numpy()
+    return sentiment
+
+
+def summarize_from_sentiment(ri_df: pd.DataFrame, listing_sentiment: pd.DataFrame) -> pd.DataFrame:
+    """`summary_df` from listing-level sentiment and the listing attributes it needs."""
+    listings = ri_df[["listing_id", "price_range", "latitude", "longitude"]]
+    sentiment = listing_sentiment[["listing_id", "avg_vader_score", "most_common_sentiment"]]
+    summary_df = pd.merge(listings, sentiment, on="listing_id", how="inner")
+    return summary_df.sort_values("listing_id").reset_index(drop=True)
+
+
+def mode_by_group(keys: pd.Series, values: pd.Series) -> pd.Series:
+    """Most frequent value per key, ties going to the smallest value (like `Series.mode()[0]`)."""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        codes = values.cat.codes.to_numpy()
+        uniques = values.cat.categories
+    else:
+        codes, uniques = pd.factorize(values, sort=True)
+
+    pairs = pd.DataFrame({"key": keys.to_numpy(), "code": codes})
+    pairs = pairs[pairs["code"] >= 0]
+    counts = pairs.groupby(["key", "code"]).size().reset_index(name="n")
+    best = counts.sort_values(["key", "n", "code"], ascending=[True, False, True], kind="stable")
+    best = best.drop_duplicates("key").set_index("key")["code"]
+
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        out = pd.Categorical.from_codes(best.to_numpy(), dtype=values.dtype)
+    else:
+        out = uniques.take(best.to_numpy())
+    return pd.Series(out, index=best.index)
+
+
+def summarize_listings(final_df: pd.DataFrame) -> pd.DataFrame:
+    """Average and dominant sentiment per listing, with price range and location.
+
+    Equivalent to `summarize_listings_reference` but built from group sizes and
+    label counts instead of per-listing Python lambdas.
+    """
+    final_df = final_df.reset_index(drop=True)
+    by_listing = final_df.groupby("listing_id")
+    summary = pd.DataFrame(
+        {
+            "latitude": by_listing["latitude"].first(),
+            "longitude": by_listing["longitude"].first(),
+            "avg_vader_score": by_listing["vader_score"].mean(),
+        }
+    )
+    summary.insert(0, "price_range", mode_by_group(final_df["listing_id"], final_df["price_range"]))
+    dominant = finalize_sentiment(partial_sentiment(final_df)).set_index("listing_id")
+    summary["most_common_sentiment"] = dominant["most_common_sentiment"]
+    summary.index.name = "listing_id"
+    return summary.reset_index()
+
+
+def segment_counts(ri_df: pd.DataFrame, listing_sentiment: pd.DataFrame, segment: str) -> pd.DataFrame:
+    """Number of reviews per (segment, sentiment) pair, e.g. by superhost status.
+
+    Per-listing label counts are joined to a two-column listing lookup and summed.
+    """
+    lookup = ri_df[["listing_id", segment]]
+    counts = pd.merge(listing_sentiment[["listing_id"] + COUNT_COLUMNS], lookup, on="listing_id")
+    per_segment = counts.groupby(segment)[COUNT_COLUMNS].sum()
+    per_segment.columns = pd.Index(SENTIMENT_LABELS, name="sentiment")
+
+    long = per_segment.stack().reset_index(name="count")
+    long = long[long["count"] > 0]
+    return long.sort_values([segment, "sentiment"]).reset_index(drop=True)
+
+
+def segment_counts_reference(final_df: pd.DataFrame, segment: str) -> pd.DataFrame:
+    """Original review-level segment counts over `final_df`, kept for parity checks."""
+    return (
+        final_df.groupby([segment, "sentiment"])["vader_score"]
+        .count()
+        .reset_index(name="count")
+    )
+
+
+def update_word_counts(
+    counts: Dict[str, Counter], reviews_df: pd.DataFrame, chunksize: int = WORD_CHUNKSIZE
+) -> Dict[str, Counter]:
+    """Add the `clean_text` tokens of `reviews_df` to per-sentiment `counts`, in place.
+
+    Reviews are tokenized a chunk at a time, so no corpus-sized string is built.
+    """
+    for start in range(0, len(reviews_df), chunksize):
+        chunk = reviews_df.iloc[start : start + chunksize]
+        for label, texts in chunk.groupby("sentiment", observed=True)["clean_text"]:
+            counter = counts.setdefault(label, Counter())
+            counter.update(chain.from_iterable(map(str.split, texts)))
+    return counts
+
+
+def word_counts(reviews_df: pd.DataFrame, chunksize: int = WORD_CHUNKSIZE) -> Dict[str, Counter]:
+    """Token counts over `clean_text` for each sentiment label."""
+    counts = {label: Counter() for label in SENTIMENT_LABELS}
+    return update_word_counts(counts, reviews_df, chunksize)
+
+
+def word_frequencies(reviews_df: pd.DataFrame, sentiment: str) -> Counter:
+    """Token counts over `clean_text` for reviews with the given sentiment label."""
+    return word_counts(reviews_df[reviews_df["sentiment"] == sentiment])[sentiment]
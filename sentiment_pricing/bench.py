@@ -0,0 +1,798 @@
+"""Benchmarks for individual stages: `python -m sentiment_pricing.bench NAME ...`.
+
+Each benchmark loads its input once, times the stage on it and prints one line
+per configuration.
+"""
+
+import argparse
+import time
+from pathlib import Path
+from typing import Optional, Sequence
+
+import pandas as pd
+
+from .config import LISTINGS_URL, REVIEWS_URL
+
+
+def _load_raw_comments(path: str, limit: Optional[int]) -> pd.Series:
+    from .load import load_reviews
+
+    reviews_df = load_reviews(path)
+    if limit:
+        reviews_df = reviews_df.head(limit)
+    return reviews_df.dropna(subset=["comments", "reviewer_name"])["comments"]
+
+
+def _load_comments(path: str, limit: Optional[int]) -> pd.Series:
+    from .clean import clean_comments
+
+    return clean_comments(_load_raw_comments(path, limit))["comments"]
+
+
+def bench_cleaning(comments: pd.Series) -> pd.DataFrame:
+    """Fused single-pass cleaning vs the original three-pass version, with a parity check."""
+    from .clean import clean_comments, clean_comments_reference
+
+    rows = []
+    results = {}
+    for name, fn in [("three-pass", clean_comments_reference), ("fused", clean_comments)]:
+        start = time.perf_counter()
+        results[name] = fn(comments)
+        elapsed = time.perf_counter() - start
+        rows.append({"method": name, "seconds": round(elapsed, 3),
+                     "reviews_per_sec": round(len(comments) / elapsed)})
+
+    ref, fused = results["three-pass"], results["fused"]
+    mismatches = int(
+        ((ref["comments"] != fused["comments"]) | (ref["clean_text"] != fused["clean_text"])).sum()
+    )
+    out = pd.DataFrame(rows)
+    out["speedup"] = (out["seconds"].iloc[0] / out["seconds"]).round(1)
+    out["mismatches"] = [0, mismatches]
+    return out
+
+
+def bench_load(reviews: str, listings: str, workdir: str) -> pd.DataFrame:
+    """CSV parse vs projected Parquet read for both raw tables (converts first if needed)."""
+    from .columnar import convert_listings, convert_reviews, is_current
+    from .load import load_listings, load_reviews
+
+    rows = []
+    for name, source, convert, load in [
+        ("reviews", reviews, convert_reviews, load_reviews),
+        ("listings", listings, convert_listings, load_listings),
+    ]:
+        dest = Path(workdir) / "columnar" / f"{name}.parquet"
+        if not is_current(dest, source):
+            convert(source, dest)
+        for fmt, path in [("csv.gz", source), ("parquet", str(dest))]:
+            start = time.perf_counter()
+            df = load(path)
+            rows.append({"table": name, "format": fmt, "rows": len(df),
+                         "ms": round((time.perf_counter() - start) * 1000, 1)})
+    return pd.DataFrame(rows)
+
+
+def synthetic_final(n_listings: int, reviews_per_listing: int, seed: int = 0) -> pd.DataFrame:
+    """Review-level frame shaped like `final_df`, with many label ties."""
+    import numpy as np
+
+    from .config import PRICE_RANGE_LABELS, SENTIMENT_LABELS
+
+    rng = np.random.default_rng(seed)
+    n = n_listings * reviews_per_listing
+    listing_id = rng.integers(0, n_listings, n)
+    return pd.DataFrame(
+        {
+            "listing_id": listing_id,
+            "price_range": pd.Categorical.from_codes(
+                listing_id % len(PRICE_RANGE_LABELS), PRICE_RANGE_LABELS, ordered=True
+            ),
+            "latitude": 41.5 + listing_id * 1e-5,
+            "longitude": -71.5 + listing_id * 1e-5,
+            "vader_score": rng.uniform(-1, 1, n).astype(np.float32),
+            "sentiment": rng.choice(SENTIMENT_LABELS, n),
+        }
+    )
+
+
+def bench_aggregate(final_df: pd.DataFrame) -> pd.DataFrame:
+    """Vectorized vs lambda-based `summary_df` aggregation, with a parity check."""
+    from .aggregate import summarize_listings, summarize_listings_reference
+
+    rows = []
+    results = {}
+    for name, fn in [("lambda", summarize_listings_reference), ("vectorized", summarize_listings)]:
+        start = time.perf_counter()
+        results[name] = fn(final_df)
+        rows.append({"method": name, "seconds": round(time.perf_counter() - start, 3)})
+    out = pd.DataFrame(rows)
+    out["speedup"] = (out["seconds"].iloc[0] / out["seconds"]).round(1)
+    out["identical"] = [True, results["lambda"].equals(results["vectorized"])]
+    return out
+
+
+def bench_join(ri_df: pd.DataFrame, reviews_df: pd.DataFrame) -> pd.DataFrame:
+    """Time, traced peak memory and intermediate frame size of the review-level merge
+    path vs reviews-side aggregation (Arrow-backed strings are not traced, so the
+    intermediate size is the more complete memory figure)."""
+    import tracemalloc
+
+    from .aggregate import (
+        join_reviews,
+        listing_sentiment,
+        segment_counts,
+        segment_counts_reference,
+        summarize_from_sentiment,
+        summarize_listings,
+    )
+
+    def merged():
+        final_df = join_reviews(ri_df, reviews_df)
+        summary = summarize_listings(final_df)
+        segment_counts_reference(final_df, "host_is_superhost")
+        segment_counts_reference(final_df, "room_type")
+        return summary, final_df
+
+    def reviews_side():
+        sentiment = listing_sentiment(reviews_df, ri_df["listing_id"])
+        summary = summarize_from_sentiment(ri_df, sentiment)
+        segment_counts(ri_df, sentiment, "host_is_superhost")
+        segment_counts(ri_df, sentiment, "room_type")
+        return summary, sentiment
+
+    rows = []
+    results = {}
+    for name, fn in [("merge then aggregate", merged), ("aggregate then join", reviews_side)]:
+        tracemalloc.start()
+        start = time.perf_counter()
+        results[name], intermediate = fn()
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        rows.append(
+            {
+                "method": name,
+                "seconds": round(elapsed, 3),
+                "peak_mb": round(peak / 2**20, 1),
+                "intermediate_mb": round(intermediate.memory_usage(deep=True).sum() / 2**20, 1),
+            }
+        )
+    out = pd.DataFrame(rows)
+    out["identical"] = [True, results["merge then aggregate"].equals(results["aggregate then join"])]
+    return out
+
+
+def bench_memory(scored_reviews: pd.DataFrame) -> pd.DataFrame:
+    """Per-review footprint of the scored reviews table in the original and compact layouts."""
+    import numpy as np
+
+    from .memory import TEXT_COLUMNS, compact_reviews, frame_bytes
+
+    # The notebook's layout: Python-object strings and labels, 64-bit ids and counts
+    original = scored_reviews.astype(
+        {c: object for c in TEXT_COLUMNS + ["sentiment"] if c in scored_reviews.columns}
+    ).astype({"listing_id": np.int64, "word_count": np.int64, "char_count": np.int64})
+    layouts = [
+        ("original", original),
+        ("compact", compact_reviews(original)),
+        ("compact, no clean_text", compact_reviews(original, drop_clean_text=True)),
+    ]
+    baseline = frame_bytes(original)
+    rows = []
+    for name, df in layouts:
+        size = frame_bytes(df)
+        rows.append(
+            {
+                "layout": name,
+                "mb": round(size / 2**20, 2),
+                "bytes_per_review": round(size / len(df), 1),
+                "vs_original": round(size / baseline, 2),
+            }
+        )
+    return pd.DataFrame(rows)
+
+
+def bench_words(scored_reviews: pd.DataFrame) -> pd.DataFrame:
+    """Joined-string word counting vs chunked per-sentiment counters: time and traced peak."""
+    import tracemalloc
+    from collections import Counter
+
+    from .aggregate import word_counts
+
+    def joined():
+        " ".join(scored_reviews["clean_text"])
+        return {
+            label: Counter(
+                " ".join(scored_reviews[scored_reviews["sentiment"] == label]["clean_text"]).split()
+            )
+            for label in ["Positive", "Negative"]
+        }
+
+    def chunked():
+        return word_counts(scored_reviews)
+
+    rows = []
+    results = {}
+    for name, fn in [("joined strings", joined), ("chunked counters", chunked)]:
+        tracemalloc.start()
+        start = time.perf_counter()
+        results[name] = fn()
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        rows.append({"method": name, "seconds": round(elapsed, 3), "peak_mb": round(peak / 2**20, 1)})
+    out = pd.DataFrame(rows)
+    same = all(
+        results["joined strings"][label] == results["chunked counters"][label]
+        for label in ["Positive", "Negative"]
+    )
+    out["identical"] = [True, same]
+    return out
+
+
+def bench_drift(scored_reviews: pd.DataFrame, scale: int = 1, single: int = 5_000) -> pd.DataFrame:
+    """Replay the review history through the drift detector: in one batch, in monthly
+    batches and one review at a time (first `single` reviews), checking that they agree."""
+    import numpy as np
+
+    from .drift import DriftDetector
+
+    history = scored_reviews[["id", "listing_id", "date", "vader_score", "sentiment"]].assign(
+        listing_id=np.asarray(scored_reviews["listing_id"], dtype=np.int64),
+        sentiment=np.asarray(scored_reviews["sentiment"]),
+    )
+    if scale > 1:
+        # Copies of the history on disjoint listing ids
+        step = int(history["listing_id"].max()) + 1
+        history = pd.concat(
+            [history.assign(listing_id=history["listing_id"] + i * step, id=history["id"] + i * step)
+             for i in range(scale)],
+            ignore_index=True,
+        )
+    history = history.sort_values(["date", "id"], kind="mergesort")
+
+    def one_batch():
+        return DriftDetector().update(history)
+
+    def monthly():
+        detector = DriftDetector()
+        for _, batch in history.groupby(history["date"].dt.to_period("M"), sort=True):
+            detector.update(batch)
+        return detector
+
+    def one_at_a_time():
+        detector = DriftDetector()
+        for row in history.head(single).itertuples(index=False):
+            detector.add(row.listing_id, row.date, row.vader_score, row.sentiment)
+        return detector
+
+    rows = []
+    reference = None
+    for name, fn, n_reviews in [("one batch", one_batch, len(history)),
+                                ("monthly batches", monthly, len(history)),
+                                ("one at a time", one_at_a_time, min(single, len(history)))]:
+        start = time.perf_counter()
+        table = fn().table().sort_index()
+        elapsed = time.perf_counter() - start
+        if name == "one at a time":
+            expected = DriftDetector().update(history.head(single)).table().sort_index()
+        else:
+            reference = table if reference is None else reference
+            expected = reference
+        rows.append(
+            {
+                "mode": name,
+                "reviews": n_reviews,
+                "seconds": round(elapsed, 3),
+                "us_per_review": round(elapsed / max(n_reviews, 1) * 1e6, 1),
+                "alerting": int(table["alert_since"].notna().sum()),
+                "identical": bool(np.allclose(table["severity"], expected["severity"])
+                                  and table["alert_since"].equals(expected["alert_since"])),
+            }
+        )
+    return pd.DataFrame(rows)
+
+
+def bench_model(model_df: pd.DataFrame, repeats: int = 200) -> pd.DataFrame:
+    """Each forecaster backend on the 80/20 split: fit time, batch and single-row predict
+    latency, pickled size and test MAE/R²."""
+    import pickle
+
+    import numpy as np
+    from sklearn.metrics import mean_absolute_error, r2_score
+    from sklearn.model_selection import train_test_split
+
+    from .config import RANDOM_STATE
+    from .model import MODEL_BACKENDS, split_features
+
+    X, y = split_features(model_df)
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=0.2, random_state=RANDOM_STATE
+    )
+    rows = []
+    for name, build in MODEL_BACKENDS.items():
+        pipeline = build(n_jobs=-1)
+        start = time.perf_counter()
+        pipeline.fit(X_train, y_train)
+        fit_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        y_pred = pipeline.predict(X_test)
+        batch_ms = (time.perf_counter() - start) * 1000
+        single = []
+        for i in range(repeats):
+            row = X_test.iloc[[i % len(X_test)]]
+            start = time.perf_counter()
+            pipeline.predict(row)
+            single.append((time.perf_counter() - start) * 1000)
+        rows.append(
+            {
+                "model": name,
+                "fit_s": round(fit_seconds, 3),
+                "batch_ms": round(batch_ms, 2),
+                "batch_rows": len(X_test),
+                "single_p50_ms": round(float(np.percentile(single, 50)), 2),
+                "size_kb": round(len(pickle.dumps(pipeline)) / 1024, 1),
+                "mae": round(mean_absolute_error(y_test, y_pred), 4),
+                "r2": round(r2_score(y_test, y_pred), 3),
+            }
+        )
+    return pd.DataFrame(rows)
+
+
+def bench_predict(forecaster, model_df: pd.DataFrame, repeats: int = 500, batch_rows: int = 10_000,
+                  batch_repeats: int = 20) -> pd.DataFrame:
+    """p50/p99 latency of single-listing predictions (fast path vs one-row DataFrame)
+    and of `batch_rows`-row batches, drawn from `model_df`."""
+    import numpy as np
+
+    X = model_df[forecaster.features]
+    records = X.to_dict("records")
+    batch = X.sample(batch_rows, replace=True, random_state=0)
+
+    def timings(fn, n):
+        out = []
+        for i in range(n):
+            start = time.perf_counter()
+            fn(i)
+            out.append((time.perf_counter() - start) * 1000)
+        return np.array(out)
+
+    cases = [
+        ("single, fast path", 1, timings(lambda i: forecaster.predict(records[i % len(records)]), repeats)),
+        ("single, DataFrame", 1, timings(lambda i: forecaster.predict(X.iloc[[i % len(X)]]), repeats)),
+        (f"batch of {batch_rows}", batch_rows, timings(lambda i: forecaster.predict(batch), batch_repeats)),
+    ]
+    return pd.DataFrame(
+        [
+            {
+                "case": name,
+                "rows": rows,
+                "p50_ms": round(float(np.percentile(ms, 50)), 3),
+                "p99_ms": round(float(np.percentile(ms, 99)), 3),
+                "rows_per_sec": round(rows / (np.median(ms) / 1000)),
+            }
+            for name, rows, ms in cases
+        ]
+    )
+
+
+# Run in a fresh interpreter so the timing includes every import the app triggers
+_COLD_START = """
+import json, sys, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+imported = time.perf_counter()
+at = AppTest.from_file(sys.argv[1], default_timeout=120)
+at.run()
+done = time.perf_counter()
+print(json.dumps({"import_ms": (imported - start) * 1000, "first_render_ms": (done - imported) * 1000,
+                  "errors": [e.value for e in at.exception]}))
+"""
+
+
+def bench_app(app_path: str, workdir: str, cold_runs: int = 3, reruns: int = 20,
+              preload_wait: float = 3.0) -> pd.DataFrame:
+    """Streamlit app latency through `streamlit.testing`: cold time to first render
+    (fresh process each time), the first visit to the dashboard and rerun p50/p99
+    while changing filters. Times cover the script run, not the browser's drawing."""
+    import json
+    import os
+    import subprocess
+    import sys
+
+    import numpy as np
+    from streamlit.testing.v1 import AppTest
+
+    app_path = str(Path(app_path).resolve())
+    os.environ["SENTIMENT_PRICING_WORKDIR"] = workdir
+    cold = []
+    for _ in range(cold_runs):
+        out = subprocess.run([sys.executable, "-c", _COLD_START, app_path], check=True,
+                             capture_output=True, text=True, env=os.environ)
+        result = json.loads(out.stdout.strip().splitlines()[-1])
+        if result["errors"]:
+            raise RuntimeError(f"App raised on first render: {result['errors']}")
+        cold.append(result)
+
+    def timed_run(at):
+        start = time.perf_counter()
+        at.run()
+        if at.exception:
+            raise RuntimeError(f"App raised: {[e.value for e in at.exception]}")
+        return (time.perf_counter() - start) * 1000
+
+    at = AppTest.from_file(app_path, default_timeout=120)
+    timed_run(at)
+    # Give the background preload time to finish, as a reader of the first page would
+    time.sleep(preload_wait)
+    at.sidebar.radio[0].set_value("Results & Visuals")
+    first_visit = timed_run(at)
+
+    rerun = []
+    if at.multiselect:
+        for i in range(reruns):
+            widget = at.multiselect[i % len(at.multiselect)]
+            options = widget.options
+            widget.set_value([options[(i // len(at.multiselect)) % len(options)]] if i % 2 == 0 else [])
+            rerun.append(timed_run(at))
+
+    def row(case, ms):
+        ms = np.asarray(ms, dtype=np.float64)
+        return {"case": case, "runs": len(ms),
+                "p50_ms": round(float(np.percentile(ms, 50)), 1) if len(ms) else np.nan,
+                "p99_ms": round(float(np.percentile(ms, 99)), 1) if len(ms) else np.nan}
+
+    return pd.DataFrame(
+        [
+            row("cold: import streamlit", [r["import_ms"] for r in cold]),
+            row("cold: first render", [r["first_render_ms"] for r in cold]),
+            row("first dashboard visit", [first_visit]),
+            row("rerun on filter change", rerun),
+        ]
+    )
+
+
+def synthetic_listings(n: int, rng) -> pd.DataFrame:
+    """`n` listings scattered around a few centres, with a price and listing-level sentiment."""
+    import numpy as np
+
+    centres = rng.integers(0, 8, n)
+    scores = np.clip(rng.normal(0.4, 0.15, n), -1, 1)
+    return pd.DataFrame({
+        "listing_id": np.arange(n),
+        "latitude": 41.3 + centres * 0.08 + rng.normal(0, 0.03, n),
+        "longitude": -71.7 + centres * 0.07 + rng.normal(0, 0.03, n),
+        "price": np.round(np.exp(rng.normal(5.2, 0.6, n))),
+        "avg_vader_score": scores,
+        "most_common_sentiment": np.where(scores < 0.05, "Negative", "Positive"),
+    })
+
+
+def bench_spatial(sizes: Sequence[int], radius_km: float = 1.0, k: int = 20, queries: int = 1_000,
+                  seed: int = 0) -> pd.DataFrame:
+    """Spatial index on synthetic markets: build time, p50/p99 of single radius and kNN
+    summaries at random listings, and the batch neighbourhood table for all listings."""
+    import numpy as np
+
+    from .spatial import build_spatial_index
+
+    import scipy.spatial  # noqa: F401  (imported before the build is timed)
+
+    rng = np.random.default_rng(seed)
+    rows = []
+    for n in sizes:
+        listings = synthetic_listings(n, rng)
+        start = time.perf_counter()
+        index = build_spatial_index(listings, listings)
+        build_s = time.perf_counter() - start
+        points = listings[["latitude", "longitude"]].to_numpy()[rng.integers(0, n, queries)]
+        for case, query in [(f"radius {radius_km:g} km", {"radius_km": radius_km}), (f"k={k}", {"k": k})]:
+            index.summarize(*points[0], **query)
+            ms = []
+            neighbours = 0
+            for lat, lon in points:
+                start = time.perf_counter()
+                summary = index.summarize(lat, lon, **query)
+                ms.append((time.perf_counter() - start) * 1000)
+                neighbours += summary["n_neighbours"]
+            start = time.perf_counter()
+            index.neighbourhoods(**query)
+            batch_s = time.perf_counter() - start
+            rows.append({
+                "listings": n,
+                "query": case,
+                "build_s": round(build_s, 3),
+                "mean_neighbours": round(neighbours / queries, 1),
+                "single_p50_ms": round(float(np.percentile(ms, 50)), 3),
+                "single_p99_ms": round(float(np.percentile(ms, 99)), 3),
+                "batch_s": round(batch_s, 3),
+                "batch_per_listing_us": round(batch_s / n * 1e6, 1),
+            })
+    return pd.DataFrame(rows)
+
+
+def bench_features(sizes: Sequence[int], k: int = 20, naive_sample: int = 2_000, seed: int = 0) -> pd.DataFrame:
+    """Neighbour features for synthetic markets: index build plus bulk kNN features, against
+    a pairwise-distance loop timed on `naive_sample` listings and scaled by n² for the full size."""
+    import numpy as np
+
+    from .spatial import EARTH_RADIUS_KM, build_spatial_index, neighbour_features
+
+    def naive(listings: pd.DataFrame) -> None:
+        lat = np.radians(listings["latitude"].to_numpy())
+        lon = np.radians(listings["longitude"].to_numpy())
+        log_price = np.log1p(listings["price"].to_numpy())
+        for i in range(len(listings)):
+            a = (np.sin((lat - lat[i]) / 2) ** 2
+                 + np.cos(lat[i]) * np.cos(lat) * np.sin((lon - lon[i]) / 2) ** 2)
+            distance = 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+            distance[i] = np.inf
+            nearest = np.argpartition(distance, k)[:k]
+            np.median(log_price[nearest])
+
+    import scipy.spatial  # noqa: F401  (imported before anything is timed)
+
+    rng = np.random.default_rng(seed)
+    rows = []
+    for n in sizes:
+        listings = synthetic_listings(n, rng)
+        start = time.perf_counter()
+        index = build_spatial_index(listings, listings)
+        build_s = time.perf_counter() - start
+        start = time.perf_counter()
+        neighbour_features(index, k)
+        features_s = time.perf_counter() - start
+
+        sample = listings.iloc[:min(naive_sample, n)]
+        start = time.perf_counter()
+        naive(sample)
+        naive_s = (time.perf_counter() - start) * (n / len(sample)) ** 2
+        rows.append({
+            "listings": n,
+            "k": k,
+            "index_s": round(build_s, 3),
+            "features_s": round(features_s, 3),
+            "total_s": round(build_s + features_s, 3),
+            "pairwise_est_s": round(naive_s, 1),
+            "speedup": round(naive_s / (build_s + features_s)),
+        })
+    return pd.DataFrame(rows)
+
+
+def bench_charts(sizes: Sequence[int], seed: int = 0) -> pd.DataFrame:
+    """Display data for the map, the listing ranking and a daily series at each size:
+    preparation and figure render time, and payload (JSON) raw vs after binning/downsampling."""
+    import tempfile
+
+    import numpy as np
+
+    from . import render
+    from .chartdata import downsample, hex_bins, rank_summary
+
+    def kilobytes(frame: pd.DataFrame) -> float:
+        return round(len(frame.to_json(orient="records", date_format="iso")) / 1024, 1)
+
+    def timed(fn):
+        start = time.perf_counter()
+        out = fn()
+        return out, (time.perf_counter() - start) * 1000
+
+    rng = np.random.default_rng(seed)
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        # Import matplotlib before timing anything
+        render.plot_listing_map(pd.DataFrame({"latitude": [41.5], "longitude": [-71.4], "avg_vader_score": [0.0]}),
+                                Path(tmp) / "warmup.png")
+        for n in sizes:
+            summary_df = synthetic_listings(n, rng)
+            # A random-walk hourly score
+            series = pd.Series(np.clip(0.4 + rng.normal(0, 0.01, n).cumsum(), -1, 1),
+                               index=pd.date_range("2000-01-01", periods=n, freq="h"), name="avg_vader_score")
+
+            bins, prep = timed(lambda: hex_bins(summary_df, ["avg_vader_score"]))
+            _, draw = timed(lambda: render.plot_listing_map(summary_df, Path(tmp) / "map.png"))
+            rows.append({"chart": "map", "n": n, "prep_ms": prep, "render_ms": draw,
+                         "raw_kb": kilobytes(summary_df), "points": len(bins), "payload_kb": kilobytes(bins)})
+
+            ranking, prep = timed(lambda: rank_summary(summary_df))
+            shown = pd.concat([ranking["top"], ranking["bottom"]])
+            _, draw = timed(lambda: render.plot_listing_scores(summary_df, Path(tmp) / "ranking.png"))
+            rows.append({"chart": "ranking", "n": n, "prep_ms": prep, "render_ms": draw,
+                         "raw_kb": kilobytes(summary_df[["listing_id", "avg_vader_score"]]),
+                         "points": len(shown), "payload_kb": kilobytes(shown[["listing_id", "avg_vader_score"]])})
+
+            sampled, prep = timed(lambda: downsample(series))
+            rows.append({"chart": "series", "n": n, "prep_ms": prep, "render_ms": np.nan,
+                         "raw_kb": kilobytes(series.reset_index()), "points": len(sampled),
+                         "payload_kb": kilobytes(sampled.reset_index())})
+    out = pd.DataFrame(rows)
+    return out.round({"prep_ms": 1, "render_ms": 1})
+
+
+def bench_scoring(comments: pd.Series, n_jobs_list: Sequence[int], chunksize: int) -> pd.DataFrame:
+    """Reviews/sec for each worker count, checking output against the serial path."""
+    from .score import score_texts
+
+    rows = []
+    reference = None
+    for n_jobs in n_jobs_list:
+        start = time.perf_counter()
+        scores = score_texts(comments, n_jobs=n_jobs, chunksize=chunksize)
+        elapsed = time.perf_counter() - start
+        if reference is None:
+            reference = scores
+        rows.append(
+            {
+                "n_jobs": n_jobs,
+                "seconds": round(elapsed, 3),
+                "reviews_per_sec": round(len(comments) / elapsed),
+                "identical": scores.equals(reference),
+            }
+        )
+    return pd.DataFrame(rows)
+
+
+def bench_vader(comments: pd.Series, chunksize: int) -> pd.DataFrame:
+    """Reference vs vectorized VADER: serial throughput and agreement on `comments`."""
+    from .score import score_texts
+
+    rows = []
+    results = {}
+    for backend in ["vader", "vectorized"]:
+        start = time.perf_counter()
+        results[backend] = score_texts(comments, n_jobs=1, chunksize=chunksize, backend=backend)
+        elapsed = time.perf_counter() - start
+        rows.append({"backend": backend, "seconds": round(elapsed, 3),
+                     "reviews_per_sec": round(len(comments) / elapsed)})
+    out = pd.DataFrame(rows)
+    out["speedup"] = (out["seconds"].iloc[0] / out["seconds"]).round(1)
+
+    diff = (results["vader"] - results["vectorized"]).abs()
+    out["max_compound_diff"] = [0.0, float(diff["compound"].max()) if len(diff) else 0.0]
+    out["rows_identical"] = [1.0, float((diff.max(axis=1) == 0).mean()) if len(diff) else 1.0]
+    return out
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="sentiment_pricing.bench")
+    sub = parser.add_subparsers(dest="benchmark", required=True)
+
+    scoring = sub.add_parser("scoring", help="VADER scoring throughput by worker count")
+    scoring.add_argument("--reviews", default=REVIEWS_URL)
+    scoring.add_argument("--limit", type=int, default=None, help="Score only the first N reviews")
+    scoring.add_argument("--n-jobs", type=int, nargs="+", default=[1, 2, 4, -1])
+    scoring.add_argument("--chunksize", type=int, default=5_000)
+
+    vader = sub.add_parser("vader", help="Reference vs vectorized VADER throughput and agreement")
+    vader.add_argument("--reviews", default=REVIEWS_URL)
+    vader.add_argument("--limit", type=int, default=None)
+    vader.add_argument("--chunksize", type=int, default=5_000)
+
+    cleaning = sub.add_parser("cleaning", help="Fused vs three-pass review cleaning")
+    cleaning.add_argument("--reviews", default=REVIEWS_URL)
+    cleaning.add_argument("--limit", type=int, default=None)
+
+    load = sub.add_parser("load", help="CSV vs Parquet load time for the raw tables")
+    load.add_argument("--reviews", default=REVIEWS_URL)
+    load.add_argument("--listings", default=LISTINGS_URL)
+    load.add_argument("--workdir", default="artifacts")
+
+    aggregate = sub.add_parser("aggregate", help="Vectorized vs lambda listing aggregation")
+    aggregate.add_argument("--listings", type=int, default=20_000)
+    aggregate.add_argument("--reviews-per-listing", type=int, default=20)
+
+    join = sub.add_parser("join", help="Merge-then-aggregate vs aggregate-then-join memory")
+    join.add_argument("--workdir", default="artifacts", help="Run with 'listings' and 'scored_reviews'")
+
+    memory = sub.add_parser("memory", help="Original vs compact reviews table footprint")
+    memory.add_argument("--workdir", default="artifacts", help="Run with 'scored_reviews'")
+
+    words = sub.add_parser("words", help="Joined-string vs chunked word counting")
+    words.add_argument("--workdir", default="artifacts", help="Run with 'scored_reviews'")
+
+    drift = sub.add_parser("drift", help="Drift detector replay of the full review history")
+    drift.add_argument("--workdir", default="artifacts", help="Run with 'scored_reviews'")
+    drift.add_argument("--scale", type=int, default=1, help="Replay N copies of the history")
+    drift.add_argument("--single", type=int, default=5_000, help="Reviews to feed one at a time")
+
+    model = sub.add_parser("model", help="Random forest vs histogram gradient boosting forecaster")
+    model.add_argument("--workdir", default="artifacts", help="Run with 'model_df'")
+    model.add_argument("--repeats", type=int, default=200, help="Single-row predictions to time")
+
+    predict = sub.add_parser("predict", help="Single-row and batch latency of the saved forecaster")
+    predict.add_argument("--workdir", default="artifacts", help="Run with 'forecaster' and 'model_df'")
+    predict.add_argument("--repeats", type=int, default=500, help="Single-row predictions to time")
+    predict.add_argument("--batch-rows", type=int, default=10_000)
+    predict.add_argument("--batch-repeats", type=int, default=20)
+
+    charts = sub.add_parser("charts", help="Binned/downsampled chart data and render time by market size")
+    charts.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+
+    spatial = sub.add_parser("spatial", help="Spatial index radius/kNN query latency and batch neighbourhoods")
+    spatial.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    spatial.add_argument("--radius-km", type=float, default=1.0)
+    spatial.add_argument("-k", type=int, default=20)
+    spatial.add_argument("--queries", type=int, default=1_000, help="Single queries to time per case")
+
+    features = sub.add_parser("features", help="Bulk neighbour features vs a pairwise loop")
+    features.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    features.add_argument("-k", type=int, default=20)
+
+    app = sub.add_parser("app", help="Streamlit app cold start and rerun latency")
+    app.add_argument("--workdir", default="artifacts", help="Run with a 'dashboard' artifact")
+    app.add_argument("--app", default="app.py", help="Path to the Streamlit script")
+    app.add_argument("--cold-runs", type=int, default=3, help="Fresh processes to time")
+    app.add_argument("--reruns", type=int, default=20, help="Filter changes to time")
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.benchmark == "scoring":
+        comments = _load_comments(args.reviews, args.limit)
+        print(f"{len(comments)} reviews")
+        print(bench_scoring(comments, args.n_jobs, args.chunksize).to_string(index=False))
+    elif args.benchmark == "vader":
+        comments = _load_comments(args.reviews, args.limit)
+        print(f"{len(comments)} reviews")
+        print(bench_vader(comments, args.chunksize).to_string(index=False))
+    elif args.benchmark == "cleaning":
+        comments = _load_raw_comments(args.reviews, args.limit)
+        print(f"{len(comments)} reviews")
+        print(bench_cleaning(comments).to_string(index=False))
+    elif args.benchmark == "load":
+        print(bench_load(args.reviews, args.listings, args.workdir).to_string(index=False))
+    elif args.benchmark == "aggregate":
+        final_df = synthetic_final(args.listings, args.reviews_per_listing)
+        print(f"{args.listings} listings, {len(final_df)} reviews")
+        print(bench_aggregate(final_df).to_string(index=False))
+    elif args.benchmark == "join":
+        from .pipeline import ArtifactStore
+
+        store = ArtifactStore(args.workdir)
+        print(bench_join(store["listings"], store["scored_reviews"]).to_string(index=False))
+    elif args.benchmark == "memory":
+        from .pipeline import ArtifactStore
+
+        store = ArtifactStore(args.workdir)
+        print(bench_memory(store["scored_reviews"]).to_string(index=False))
+    elif args.benchmark == "words":
+        from .pipeline import ArtifactStore
+
+        store = ArtifactStore(args.workdir)
+        print(bench_words(store["scored_reviews"]).to_string(index=False))
+    elif args.benchmark == "drift":
+        from .pipeline import ArtifactStore
+
+        store = ArtifactStore(args.workdir)
+        print(bench_drift(store["scored_reviews"], args.scale, args.single).to_string(index=False))
+    elif args.benchmark == "model":
+        from .pipeline import ArtifactStore
+
+        store = ArtifactStore(args.workdir)
+        print(f"{len(store['model_df'])} listings")
+        print(bench_model(store["model_df"], args.repeats).to_string(index=False))
+    elif args.benchmark == "predict":
+        from .pipeline import ArtifactStore
+        from .predict import load_forecaster
+
+        forecaster = load_forecaster(Path(args.workdir) / "forecaster.pkl")
+        print(f"{forecaster.metadata['backend']} forecaster")
+        store = ArtifactStore(args.workdir)
+        print(bench_predict(forecaster, store["model_df"], args.repeats, args.batch_rows,
+                            args.batch_repeats).to_string(index=False))
+    elif args.benchmark == "charts":
+        print(bench_charts(args.sizes).to_string(index=False))
+    elif args.benchmark == "spatial":
+        print(bench_spatial(args.sizes, args.radius_km, args.k, args.queries).to_string(index=False))
+    elif args.benchmark == "features":
+        print(bench_features(args.sizes, args.k).to_string(index=False))
+    elif args.benchmark == "app":
+        print(bench_app(args.app, args.workdir, args.cold_runs, args.reruns).to_string(index=False))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,124 @@
+"""Persistent per-review cache for cleaned text and VADER scores.
+
+Rows are keyed by review `id`, a hash of the text they were computed from and a
+version string for the code that produced them (the cleaning rules or the VADER
+release). A review whose text or version changed is treated as a miss, so a new
+snapshot only pays for new or edited reviews.
+"""
+
+import hashlib
+import sqlite3
+from pathlib import Path
+from typing import Callable, Dict, Sequence
+
+import numpy as np
+import pandas as pd
+
+# Value columns (and SQLite types) stored per table
+TABLES: Dict[str, Dict[str, str]] = {
+    "cleaned": {"comments": "TEXT", "clean_text": "TEXT"},
+    "scores": {"vader_neg": "REAL", "vader_neu": "REAL", "vader_pos": "REAL", "vader_score": "REAL"},
+}
+
+
+def text_hashes(texts: Sequence[str]) -> np.ndarray:
+    """16-byte BLAKE2b digest of each text."""
+    return np.array(
+        [hashlib.blake2b(str(t).encode("utf-8"), digest_size=16).digest() for t in texts],
+        dtype=object,
+    )
+
+
+class ReviewCache:
+    """SQLite-backed lookup of previously computed per-review values."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path)
+        for table, columns in TABLES.items():
+            values = ", ".join(f"{name} {kind}" for name, kind in columns.items())
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} ("
+                f"review_id INTEGER NOT NULL, version TEXT NOT NULL, text_hash BLOB NOT NULL, "
+                f"{values}, PRIMARY KEY (review_id, version))"
+            )
+        self._conn.commit()
+
+    def lookup(self, table: str, review_ids, hashes, version: str) -> pd.DataFrame:
+        """Cached values aligned to `review_ids`; misses are NaN and flagged in `hit`.
+
+        Only the requested ids are read, so lookups for one chunk of reviews stay
+        proportional to the chunk rather than to the whole cache.
+        """
+        columns = list(TABLES[table])
+        review_ids = np.asarray(review_ids, dtype=np.int64)
+        self._conn.execute("CREATE TEMP TABLE IF NOT EXISTS _request (review_id INTEGER PRIMARY KEY)")
+        self._conn.execute("DELETE FROM _request")
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO _request VALUES (?)", ((int(i),) for i in review_ids)
+        )
+        cached = pd.read_sql_query(
+            f"SELECT t.review_id, t.text_hash, {', '.join('t.' + c for c in columns)} "
+            f"FROM {table} t JOIN _request r ON t.review_id = r.review_id WHERE t.version = ?",
+            self._conn,
+            params=(version,),
+        )
+        request = pd.DataFrame({"review_id": review_ids, "_hash": hashes})
+        out = request.merge(cached, on="review_id", how="left")
+        out["hit"] = (out["text_hash"] == out["_hash"]).to_numpy(dtype=bool)
+        out.loc[~out["hit"], columns] = np.nan
+        return out[columns + ["hit"]]
+
+    def store(self, table: str, review_ids, hashes, version: str, values: pd.DataFrame) -> None:
+        """Insert or replace the rows for `review_ids`."""
+        columns = list(TABLES[table])
+        rows = zip(
+            (int(i) for i in review_ids),
+            [version] * len(hashes),
+            hashes,
+            *(values[c].tolist() for c in columns),
+        )
+        placeholders = ", ".join(["?"] * (3 + len(columns)))
+        self._conn.executemany(
+            f"INSERT OR REPLACE INTO {table} (review_id, version, text_hash, {', '.join(columns)}) "
+            f"VALUES ({placeholders})",
+            rows,
+        )
+        self._conn.commit()
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def cached_apply(
+    cache: ReviewCache,
+    table: str,
+    review_ids,
+    texts: pd.Series,
+    version: str,
+    compute: Callable[[pd.Series], pd.DataFrame],
+) -> pd.DataFrame:
+    """Values for every text, running `compute` only on cache misses and storing them."""
+    review_ids = np.asarray(review_ids, dtype=np.int64)
+    hashes = text_hashes(texts)
+    found = cache.lookup(table, review_ids, hashes, version)
+    hit = found.pop("hit").to_numpy()
+    miss = ~hit
+
+    result = {c: np.array(found[c], dtype=object) for c in TABLES[table]}
+    if miss.any():
+        computed = compute(texts[miss])
+        cache.store(table, review_ids[miss], hashes[miss], version, computed)
+        for c in result:
+            result[c][miss] = computed[c].to_numpy(dtype=object)
+
+    report_hits(table, hit)
+    return pd.DataFrame(result, index=texts.index)
+
+
+def report_hits(name: str, hit: np.ndarray) -> None:
+    total = len(hit)
+    hits = int(np.sum(hit))
+    rate = hits / total * 100 if total else 0.0
+    print(f"{name} cache: {hits}/{total} hits ({rate:.1f}%), {total - hits} computed")
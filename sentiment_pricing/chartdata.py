@@ -0,0 +1,154 @@
+"""Display-sized chart data: bins and samples whose size does not grow with the market.
+
+Figures and the app draw from these instead of one mark per listing or per day:
+
+* `hex_bins`: listings aggregated into a hexagonal grid over their coordinates
+  (count and mean of chosen columns per cell), at most about `gridsize`² cells
+* `rank_summary`: top and bottom `n` listings by a score plus quantiles of the
+  whole distribution, instead of every listing in rank order
+* `lttb` / `downsample`: Largest-Triangle-Three-Buckets downsampling of a time
+  series to a fixed number of points, keeping its peaks and dips
+"""
+
+from typing import Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+MAP_GRIDSIZE = 40  # hexagons across the wider side of the map
+RANKED_LISTINGS = 15  # listings shown at each end of a ranking
+MAX_SERIES_POINTS = 1_000  # points kept per plotted time series
+QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+# Kilometres per degree of latitude; a degree of longitude is this times cos(latitude)
+KM_PER_DEGREE = 111.2
+
+
+def hex_bins(
+    df: pd.DataFrame,
+    values: Sequence[str] = (),
+    gridsize: int = MAP_GRIDSIZE,
+    lat: str = "latitude",
+    lon: str = "longitude",
+) -> pd.DataFrame:
+    """Listings per hexagonal cell: centre `latitude`/`longitude`, `count` and the mean of each of `values`.
+
+    Cells are regular hexagons in a local equirectangular projection, `gridsize`
+    of them across the wider side of the bounding box; `radius_km` is the
+    centre-to-corner size. Rows without coordinates are left out.
+    """
+    df = df[df[lat].notna() & df[lon].notna()]
+    columns = ["latitude", "longitude", "count"] + list(values)
+    if df.empty:
+        return pd.DataFrame(columns=columns)
+    lat_deg = df[lat].to_numpy(dtype=np.float64)
+    lon_deg = df[lon].to_numpy(dtype=np.float64)
+    lat0, lon0 = lat_deg.min(), lon_deg.min()
+    km_per_lon = KM_PER_DEGREE * np.cos(np.radians((lat0 + lat_deg.max()) / 2))
+    x = (lon_deg - lon0) * km_per_lon
+    y = (lat_deg - lat0) * KM_PER_DEGREE
+
+    # Two offset rectangular lattices form a triangular lattice of centres
+    # `step` apart, so the nearest centre's cell is a regular hexagon
+    step = max(x.max(), y.max(), 1e-9) / gridsize
+    height = step * np.sqrt(3)
+    ix, iy = np.rint(x / step), np.rint(y / height)
+    jx, jy = np.floor(x / step) + 0.5, np.floor(y / height) + 0.5
+    first = (x - ix * step) ** 2 + (y - iy * height) ** 2 <= (x - jx * step) ** 2 + (y - jy * height) ** 2
+    # Centres in half-steps are integers, so each cell has a single int64 key
+    col = (2 * np.where(first, ix, jx)).astype(np.int64)
+    row = (2 * np.where(first, iy, jy)).astype(np.int64)
+    width = int(col.max()) + 1
+    keys, cell = np.unique(row * width + col, return_inverse=True)
+    cells = np.stack([keys % width * step / 2, keys // width * height / 2], axis=1)
+    count = np.bincount(cell, minlength=len(cells))
+    out = {
+        "latitude": lat0 + cells[:, 1] / KM_PER_DEGREE,
+        "longitude": lon0 + cells[:, 0] / km_per_lon,
+        "count": count,
+    }
+    for column in values:
+        column_values = df[column].to_numpy(dtype=np.float64)
+        present = ~np.isnan(column_values)
+        totals = np.bincount(cell[present], weights=column_values[present], minlength=len(cells))
+        n = np.bincount(cell[present], minlength=len(cells))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            out[column] = totals / n
+    bins = pd.DataFrame(out)
+    bins.attrs["radius_km"] = step / np.sqrt(3)
+    return bins
+
+
+def rank_summary(
+    df: pd.DataFrame,
+    column: str = "avg_vader_score",
+    n: int = RANKED_LISTINGS,
+    quantiles: Sequence[float] = QUANTILES,
+) -> dict:
+    """The `n` highest and lowest rows by `column`, and quantiles of `column` over all rows.
+
+    Returns `top` (highest first), `bottom` (lowest last), `quantiles` (a Series
+    indexed by level) and `count`; `top` and `bottom` don't overlap.
+    """
+    scored = df[df[column].notna()]
+    top = scored.nlargest(n, column)
+    bottom = scored.drop(top.index).nsmallest(n, column).iloc[::-1]
+    return {
+        "top": top,
+        "bottom": bottom,
+        "quantiles": scored[column].quantile(list(quantiles)),
+        "count": len(scored),
+    }
+
+
+def lttb(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Positions of the `n_out` points Largest-Triangle-Three-Buckets keeps of (`x`, `y`).
+
+    The first and last points are always kept; in between, each of `n_out - 2`
+    equal buckets keeps the point forming the largest triangle with the point
+    kept before it and the mean of the next bucket. `x` must be increasing and
+    `y` free of NaN.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    edges = np.append((np.arange(n_out - 1) * ((n - 2) / (n_out - 2))).astype(np.int64) + 1, n)
+    # Mean point of every bucket (the last "bucket" is the final point)
+    sums_x = np.add.reduceat(x, edges[:-1])
+    sums_y = np.add.reduceat(y, edges[:-1])
+    sizes = np.diff(edges)
+    mean_x, mean_y = sums_x / sizes, sums_y / sizes
+
+    kept = np.empty(n_out, dtype=np.int64)
+    kept[0], kept[-1] = 0, n - 1
+    a = 0
+    for b in range(n_out - 2):
+        lo, hi = edges[b], edges[b + 1]
+        area = np.abs((x[a] - mean_x[b + 1]) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (mean_y[b + 1] - y[a]))
+        a = lo + int(np.argmax(area))
+        kept[b + 1] = a
+    return kept
+
+
+def downsample(
+    data: Union[pd.Series, pd.DataFrame],
+    n_out: int = MAX_SERIES_POINTS,
+    column: Optional[str] = None,
+) -> Union[pd.Series, pd.DataFrame]:
+    """Rows of a series (or of a frame, judged by `column`) kept by `lttb` over its index.
+
+    Rows where the judged values are NaN are dropped first.
+    """
+    values = data if column is None else data[column]
+    data = data[values.notna().to_numpy()]
+    values = values[values.notna()]
+    index = data.index
+    if isinstance(index, pd.DatetimeIndex):
+        x = index.asi8
+    elif pd.api.types.is_numeric_dtype(index.dtype):
+        x = index.to_numpy(dtype=np.float64)
+    else:
+        x = np.arange(len(index))
+    return data.iloc[lttb(x, values.to_numpy(dtype=np.float64), n_out)]
@@ -0,0 +1,276 @@
+"""Clean stage: review text preprocessing and listing feature preparation."""
+
+import re
+from functools import lru_cache
+from typing import TYPE_CHECKING, Optional
+
+import numpy as np
+import pandas as pd
+
+from .config import PRICE_RANGE_LABELS, RI_HOST_PATTERN, SELECTED_COLUMNS
+
+if TYPE_CHECKING:
+    from .cache import ReviewCache
+
+# Bump when the cleaning rules change so cached cleaned text is recomputed
+CLEANING_VERSION = "1"
+
+# Review tokens: lowercase words of two or more letters
+TOKEN_PATTERN = r"\b[a-z]{2,}\b"
+
+
+# --------------------------------------------------
+# Reviews
+# --------------------------------------------------
+@lru_cache(maxsize=1)
+def get_stop_words() -> frozenset:
+    """English stopwords from NLTK, downloaded on first use."""
+    import nltk
+    from nltk.corpus import stopwords
+
+    try:
+        words = stopwords.words("english")
+    except LookupError:
+        nltk.download("stopwords", quiet=True)
+        words = stopwords.words("english")
+    return frozenset(words)
+
+
+# Basic whitespace cleaning
+def basic_clean_text(s: str) -> str:
+    if not isinstance(s, str):
+        return ""
+    s = s.strip()
+    s = re.sub(r"\s+", " ", s)
+    return s
+
+
+# Remove HTML tags/entities
+def clean_raw_comment(text: str) -> str:
+    from bs4 import BeautifulSoup
+
+    if not isinstance(text, str):
+        return ""
+    text = BeautifulSoup(text, "html.parser").get_text(separator=" ")
+    text = re.sub(r"&[a-z]+;", " ", text)
+    text = re.sub(r"\s+", " ", text).strip()
+    return text
+
+
+# Tokenization + stopword removal
+def clean_text(text: str) -> str:
+    import nltk
+
+    stop_words = get_stop_words()
+    text = text.lower()
+    tokens = nltk.RegexpTokenizer(TOKEN_PATTERN).tokenize(text)
+    tokens = [w for w in tokens if w not in stop_words]
+    return " ".join(tokens)
+
+
+def clean_comments_reference(comments: pd.Series) -> pd.DataFrame:
+    """Original three-pass cleaning (whitespace → BeautifulSoup → tokenize), kept for parity checks."""
+    comments = comments.astype(str).map(basic_clean_text)
+    comments = comments.astype(str).map(clean_raw_comment)
+    return pd.DataFrame({"comments": comments, "clean_text": comments.apply(clean_text)})
+
+
+# Fused single-pass cleaning with precompiled patterns
+_WHITESPACE = re.compile(r"\s+")
+_TOKEN = re.compile(TOKEN_PATTERN)
+_LINE_BREAK = re.compile(r"<br\s*/?>", re.IGNORECASE)
+
+
+def _tokens(lowered: str, stop_words: frozenset, tokenizer) -> str:
+    # NLTK's regex engine treats word boundaries around non-ASCII marks differently
+    # from `re`, so only ASCII text takes the precompiled `re` path.
+    if lowered.isascii():
+        tokens = _TOKEN.findall(lowered)
+    else:
+        tokens = tokenizer.tokenize(lowered)
+    return " ".join(w for w in tokens if w not in stop_words)
+
+
+def _clean_one(text: str, stop_words: frozenset, tokenizer) -> tuple:
+    text = _WHITESPACE.sub(" ", text.strip())
+    # Plain comments come out of BeautifulSoup unchanged and line breaks become
+    # the separator, so only other tags or entities need a real HTML parser.
+    if "<" in text or "&" in text:
+        stripped = _LINE_BREAK.sub(" ", text)
+        if "<" in stripped or "&" in stripped:
+            text = clean_raw_comment(text)
+        else:
+            text = _WHITESPACE.sub(" ", stripped).strip()
+    return text, _tokens(text.lower(), stop_words, tokenizer)
+
+
+# Column-wise patterns. Character classes are spelled out instead of using `\s`,
+# `\w` or case-insensitive matching, so Python's `re` (object columns) and RE2
+# (Arrow string columns) match the same characters as `str.isspace` and the
+# HTML parser's ASCII-only tag names.
+_SPACES = "\t\n\x0b\x0c\r\x1c\x1d\x1e\x1f \x85\xa0\u1680\u2000-\u200a\u2028\u2029\u202f\u205f\u3000"
+_COLUMN_WHITESPACE = f"[{_SPACES}]+"
+_NON_ASCII = "[^\x00-\x7f]"
+# Attribute-free tags that BeautifulSoup reduces to a separator
+_TAG_NAMES = "|".join(
+    "".join(f"[{c}{c.upper()}]" for c in name)
+    for name in ("br", "b", "i", "u", "em", "strong", "p", "div", "span")
+)
+_SIMPLE_TAG = f"<(?:/(?:{_TAG_NAMES})|(?:{_TAG_NAMES}) ?/?)>"
+_ENTITY = "&[a-z]+;"
+
+
+def _stop_word_pattern(stop_words: frozenset) -> str:
+    """Words of lowercase ASCII text that are not kept as tokens: words with digits
+    or underscores, single letters and stopwords."""
+    words = sorted((w for w in stop_words if w.isascii() and w.isalpha()), key=len, reverse=True)
+    return r"\b(?:[a-z0-9_]*[0-9_][a-z0-9_]*|[a-z]|" + "|".join(words) + r")\b"
+
+
+def clean_comments(comments: pd.Series) -> pd.DataFrame:
+    """Cleaned `comments` and tokenized, stopword-free `clean_text` for raw comments.
+
+    Produces the same output as `clean_comments_reference`. Whitespace, simple
+    tags, `&amp;` and tokenizing of ASCII text are column-wise string
+    operations; only comments with other markup (BeautifulSoup) or non-ASCII
+    text (NLTK's tokenizer) are handled row by row.
+    """
+    import nltk
+
+    stop_words = get_stop_words()
+    tokenizer = nltk.RegexpTokenizer(TOKEN_PATTERN)
+    raw = comments.astype(str).reset_index(drop=True)
+    text = raw.str.replace(_COLUMN_WHITESPACE, " ", regex=True).str.strip(" ")
+    has_markup = text.str.contains("[<&]", regex=True).to_numpy(dtype=bool)
+    # Markup left once simple tags and `&amp;` are gone needs the HTML parser
+    needs_parser = has_markup & (
+        text.str.replace(_SIMPLE_TAG, " ", regex=True)
+        .str.replace("&amp;", "", regex=False)
+        .str.contains("[<&]", regex=True)
+        .to_numpy(dtype=bool)
+    )
+    simple_markup = has_markup & ~needs_parser
+    if simple_markup.any():
+        text[simple_markup] = (
+            text[simple_markup]
+            .str.replace(_SIMPLE_TAG, " ", regex=True)
+            .str.replace("&amp;", "&", regex=False)
+            .str.replace(_ENTITY, " ", regex=True)
+            .str.replace(" +", " ", regex=True)
+            .str.strip(" ")
+        )
+
+    cleaned = np.empty((len(raw), 2), dtype=object)
+    cleaned[:, 0] = text.to_numpy(dtype=object)
+    ascii_text = ~needs_parser & ~text.str.contains(_NON_ASCII, regex=True).to_numpy(dtype=bool)
+    if ascii_text.any():
+        # Tokens are whole words of two or more letters, so dropping punctuation,
+        # other words and stopwords leaves exactly the kept tokens
+        cleaned[ascii_text, 1] = (
+            text[ascii_text]
+            .str.lower()
+            .str.replace("[^a-z0-9_]+", " ", regex=True)
+            .str.replace(_stop_word_pattern(stop_words), " ", regex=True)
+            .str.replace(" +", " ", regex=True)
+            .str.strip(" ")
+            .to_numpy(dtype=object)
+        )
+    other_text = ~needs_parser & ~ascii_text
+    cleaned[other_text, 1] = [_tokens(t.lower(), stop_words, tokenizer) for t in text[other_text]]
+    if needs_parser.any():
+        cleaned[needs_parser] = [_clean_one(t, stop_words, tokenizer) for t in raw[needs_parser]]
+    return pd.DataFrame(cleaned, columns=["comments", "clean_text"], index=comments.index)
+
+
+def clean_reviews(
+    reviews_df: pd.DataFrame, cache: Optional["ReviewCache"] = None, dedup: bool = True
+) -> pd.DataFrame:
+    """Drop unusable rows, clean comment text and add length statistics.
+
+    With a `cache`, reviews whose raw comment is unchanged since an earlier run
+    reuse their cleaned text instead of being cleaned again; with `dedup`, each
+    distinct raw comment is cleaned once.
+    """
+    reviews_df = reviews_df.dropna(subset=["comments", "reviewer_name"]).copy()
+    reviews_df["date"] = pd.to_datetime(reviews_df["date"])
+
+    def compute(comments: pd.Series) -> pd.DataFrame:
+        if not dedup:
+            return clean_comments(comments)
+        from .dedup import dedup_apply
+
+        return dedup_apply(comments, clean_comments, name="cleaned")
+
+    raw = reviews_df["comments"].astype(str)
+    if cache is None:
+        cleaned = compute(raw)
+    else:
+        from .cache import cached_apply
+
+        cleaned = cached_apply(cache, "cleaned", reviews_df["id"], raw, CLEANING_VERSION, compute)
+    reviews_df["comments"] = cleaned["comments"].astype(str)
+    reviews_df["clean_text"] = cleaned["clean_text"].astype(str)
+
+    reviews_df["word_count"] = reviews_df["clean_text"].apply(lambda x: len(x.split()))
+    reviews_df["char_count"] = reviews_df["comments"].apply(len)
+    return reviews_df
+
+
+# --------------------------------------------------
+# Listings
+# --------------------------------------------------
+def parse_price(price: pd.Series) -> pd.Series:
+    """Numeric price from strings like "$1,250.00"; already-numeric input is kept."""
+    if pd.api.types.is_numeric_dtype(price):
+        return price.astype(float)
+    return price.replace(r"[\$,]", "", regex=True).astype(float)
+
+
+def prepare_listings(listings_df: pd.DataFrame) -> pd.DataFrame:
+    """Rhode Island listing features used for aggregation and modeling (`ri_df`)."""
+    ri_df = listings_df[
+        listings_df["host_location"].str.contains(RI_HOST_PATTERN, case=False, na=False)
+    ].copy()
+
+    ri_df = ri_df[SELECTED_COLUMNS].copy()
+    ri_df = ri_df.rename(columns={"id": "listing_id"})
+
+    # Drop rows where price or review_scores_rating is missing (needed for modeling)
+    ri_df = ri_df.dropna(subset=["price", "review_scores_rating"])
+
+    # Impute bathrooms & bedrooms if needed
+    if ri_df["bathrooms"].isna().sum() > 0:
+        ri_df["bathrooms"] = ri_df["bathrooms"].fillna(ri_df["bathrooms"].mean())
+
+    if ri_df["bedrooms"].isna().sum() > 0:
+        ri_df["bedrooms"] = ri_df["bedrooms"].fillna(ri_df["bedrooms"].median())
+
+    # Derive amenities_count from amenities text
+    ri_df["amenities"] = ri_df["amenities"].fillna("")
+    ri_df["amenities_count"] = ri_df["amenities"].str.count(",") + 1
+
+    ri_df["price"] = parse_price(ri_df["price"])
+
+    # Map t/f to 1/0 for host flags
+    ri_df["host_identity_verified"] = ri_df["host_identity_verified"].map({"t": 1, "f": 0})
+    ri_df["host_is_superhost"] = ri_df["host_is_superhost"].map({"t": 1, "f": 0})
+
+    # One-hot encode room_type for EDA (but keep original room_type column)
+    room_type_dummies = pd.get_dummies(
+        ri_df["room_type"], prefix="room_type", drop_first=True
+    ).astype(int)
+    ri_df = pd.concat([ri_df, room_type_dummies], axis=1)
+
+    ri_df["log_price"] = np.log1p(ri_df["price"])
+    ri_df["price_range"] = pd.cut(
+        ri_df["price"],
+        bins=[0, 100, 200, 300, ri_df["price"].max()],
+        labels=PRICE_RANGE_LABELS,
+    )
+    return ri_df
+
+
+def remove_price_outliers(ri_df: pd.DataFrame, quantile: float = 0.99) -> pd.DataFrame:
+    """Listings at or below the given price quantile (top 1% removed by default)."""
+    price_cap = ri_df["price"].quantile(quantile)
+    return ri_df[ri_df["price"] <= price_cap].copy()
@@ -0,0 +1,155 @@
+"""Command line entry point: `python -m sentiment_pricing [STAGE ...]`."""
+
+import argparse
+from typing import Optional, Sequence
+
+from .config import LISTINGS_URL, REVIEWS_URL, PipelineConfig
+from .pipeline import STAGES, run
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="sentiment_pricing",
+        description="Rhode Island Airbnb sentiment & pricing pipeline.",
+    )
+    parser.add_argument(
+        "stages",
+        nargs="*",
+        metavar="STAGE",
+        help=f"Stages to run, in pipeline order (default: all). One of: {', '.join(STAGES)}.",
+    )
+    parser.add_argument("--reviews", default=REVIEWS_URL, help="Path or URL of reviews.csv.gz")
+    parser.add_argument("--listings", default=LISTINGS_URL, help="Path or URL of listings.csv.gz")
+    parser.add_argument(
+        "--snapshot",
+        action="append",
+        default=[],
+        metavar="REGION[@DATE]",
+        help="Read a registered local snapshot instead of --reviews/--listings (repeatable)",
+    )
+    parser.add_argument("--registry", default="snapshots.json", help="Snapshot registry file")
+    parser.add_argument("--workdir", default="artifacts", help="Directory for stage outputs")
+    parser.add_argument("--figures-dir", default=None, help="Directory for rendered figures")
+    parser.add_argument(
+        "--n-jobs", type=int, default=1, help="Worker processes for scoring (-1 = all cores)"
+    )
+    parser.add_argument(
+        "--chunksize", type=int, default=5_000, help="Comments per scoring chunk"
+    )
+    parser.add_argument(
+        "--backend",
+        choices=["vader", "vectorized"],
+        default="vader",
+        help="Scoring backend: reference VADER or its vectorized reimplementation",
+    )
+    parser.add_argument(
+        "--no-dedup",
+        action="store_true",
+        help="Clean and score repeated comments separately instead of once per distinct text",
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true", help="Clean and score every review, ignoring the cache"
+    )
+    parser.add_argument("--cache-path", default=None, help="SQLite review cache location")
+    parser.add_argument(
+        "--stream",
+        type=int,
+        default=None,
+        metavar="ROWS",
+        help="Stream reviews in chunks of ROWS rows, keeping only listing-level aggregates",
+    )
+    parser.add_argument(
+        "--no-columnar",
+        action="store_true",
+        help="Read the CSV sources directly instead of converted Parquet copies",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Fold only reviews newer than the stored listing-level state into it",
+    )
+    parser.add_argument(
+        "--no-compact",
+        action="store_true",
+        help="Keep review tables in their original column types",
+    )
+    parser.add_argument(
+        "--drop-clean-text",
+        action="store_true",
+        help="Keep per-sentiment word counts instead of the clean_text column after scoring",
+    )
+    parser.add_argument(
+        "--memory-report", action="store_true", help="Print the memory used by each stage's outputs"
+    )
+    parser.add_argument(
+        "--model-n-jobs", type=int, default=-1, help="Worker processes for model training (-1 = all cores)"
+    )
+    parser.add_argument(
+        "--model",
+        choices=["forest", "hgb"],
+        default="forest",
+        help="Forecaster: one-hot random forest or histogram gradient boosting",
+    )
+    parser.add_argument(
+        "--search",
+        action="store_true",
+        help="Pick the forecaster by randomized search with K-fold cross-validation",
+    )
+    parser.add_argument("--search-iter", type=int, default=20, help="Configurations to try with --search")
+    parser.add_argument("--cv-folds", type=int, default=5, help="Cross-validation folds with --search")
+    parser.add_argument(
+        "--neighbour-radius-km",
+        type=float,
+        default=1.0,
+        help="Radius of each listing's neighbourhood summary (spatial stage)",
+    )
+    parser.add_argument(
+        "--neighbour-k",
+        type=int,
+        default=20,
+        help="Nearest listings behind the forecaster's neighbour features (features stage)",
+    )
+    parser.add_argument(
+        "--neighbour-features",
+        action="store_true",
+        help="Train the forecaster on the neighbour features as well (needs the features stage)",
+    )
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    unknown = [s for s in args.stages if s not in STAGES]
+    if unknown:
+        parser.error(f"unknown stage(s): {', '.join(unknown)}")
+    config = PipelineConfig(
+        reviews_path=args.reviews,
+        listings_path=args.listings,
+        workdir=args.workdir,
+        figures_dir=args.figures_dir,
+        n_jobs=args.n_jobs,
+        score_chunksize=args.chunksize,
+        score_backend=args.backend,
+        dedup=not args.no_dedup,
+        use_cache=not args.no_cache,
+        cache_path=args.cache_path,
+        stream_chunksize=args.stream,
+        use_columnar=not args.no_columnar,
+        snapshots=args.snapshot,
+        registry_path=args.registry,
+        incremental=args.incremental,
+        compact=not args.no_compact,
+        drop_clean_text=args.drop_clean_text,
+        memory_report=args.memory_report,
+        model_n_jobs=args.model_n_jobs,
+        model_backend=args.model,
+        model_search=args.search,
+        search_iter=args.search_iter,
+        cv_folds=args.cv_folds,
+        neighbour_radius_km=args.neighbour_radius_km,
+        neighbour_k=args.neighbour_k,
+        neighbour_features=args.neighbour_features,
+    )
+    run(args.stages or None, config)
+    return 0
@@ -0,0 +1,111 @@
+"""Typed Parquet copies of the raw listings and reviews tables.
+
+Converting once keeps only the columns the pipeline reads, fixes the id dtypes,
+parses `price` and review dates, and records the source file it came from. Later
+runs read the Parquet files with column projection instead of decompressing and
+parsing the CSVs again.
+"""
+
+from pathlib import Path
+from typing import Optional, Sequence
+
+import pandas as pd
+
+from .clean import parse_price
+from .config import LISTING_COLUMNS, REVIEW_COLUMNS
+from .load import iter_reviews, load_listings
+
+SOURCE_KEY = b"sentiment_pricing.source"
+
+
+def is_columnar(path) -> bool:
+    return str(path).endswith(".parquet")
+
+
+def source_fingerprint(path: str) -> str:
+    """Identifies a source file version: resolved path, size and mtime (or the URL)."""
+    local = Path(path)
+    if local.exists():
+        stat = local.stat()
+        return f"{local.resolve()}:{stat.st_size}:{stat.st_mtime_ns}"
+    return str(path)
+
+
+def is_current(dest: Path, source: str) -> bool:
+    """Whether `dest` exists and was converted from the current version of `source`."""
+    import pyarrow.parquet as pq
+
+    if not Path(dest).exists():
+        return False
+    metadata = pq.read_schema(dest).metadata or {}
+    return metadata.get(SOURCE_KEY) == source_fingerprint(source).encode()
+
+
+def _with_source(table, source: str):
+    metadata = dict(table.schema.metadata or {})
+    metadata[SOURCE_KEY] = source_fingerprint(source).encode()
+    return table.replace_schema_metadata(metadata)
+
+
+def convert_listings(source: str, dest: Path) -> Path:
+    """Write the listing columns the pipeline uses, with `id` as int64 and numeric `price`."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    listings_df = load_listings(source)
+    listings_df["id"] = listings_df["id"].astype("int64")
+    listings_df["price"] = parse_price(listings_df["price"])
+
+    dest = Path(dest)
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    table = pa.Table.from_pandas(listings_df[LISTING_COLUMNS], preserve_index=False)
+    pq.write_table(_with_source(table, source), dest)
+    return dest
+
+
+def convert_reviews(source: str, dest: Path, chunksize: int = 200_000) -> Path:
+    """Write the review columns the pipeline uses chunk by chunk, with parsed dates."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema(
+        [
+            ("id", pa.int64()),
+            ("listing_id", pa.int64()),
+            ("date", pa.timestamp("us")),
+            ("reviewer_name", pa.string()),
+            ("comments", pa.string()),
+        ]
+    )
+    schema = _with_source(schema.empty_table(), source).schema
+
+    dest = Path(dest)
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dest.with_suffix(".parquet.tmp")
+    with pq.ParquetWriter(tmp, schema) as writer:
+        for chunk in iter_reviews(source, chunksize):
+            chunk["date"] = pd.to_datetime(chunk["date"])
+            table = pa.Table.from_pandas(chunk[REVIEW_COLUMNS], preserve_index=False)
+            writer.write_table(table.cast(schema))
+    tmp.replace(dest)
+    return dest
+
+
+def read_columnar(path, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """Read a converted table, loading only `columns`."""
+    return pd.read_parquet(
+        path, columns=list(columns) if columns is not None else None, memory_map=True
+    )
+
+
+def iter_columnar(path, chunksize: int, columns: Optional[Sequence[str]] = None):
+    """Record batches of a converted table as DataFrames with a running row index."""
+    import pyarrow.parquet as pq
+
+    offset = 0
+    parquet = pq.ParquetFile(path, memory_map=True)
+    for batch in parquet.iter_batches(batch_size=chunksize, columns=columns):
+        chunk = batch.to_pandas()
+        chunk.index = pd.RangeIndex(offset, offset + len(chunk))
+        offset += len(chunk)
+        yield chunk
@@ -0,0 +1,135 @@
+"""Shared constants and run configuration for the pipeline stages."""
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional
+
+# InsideAirbnb Rhode Island data (2025-06-28 snapshot)
+REVIEWS_URL = "https://data.insideairbnb.com/united-states/ri/rhode-island/2025-06-28/data/reviews.csv.gz"
+LISTINGS_URL = "https://data.insideairbnb.com/united-states/ri/rhode-island/2025-06-28/data/listings.csv.gz"
+
+# Listing columns kept for analysis and modeling
+SELECTED_COLUMNS = [
+    "id",
+    "price",
+    "bathrooms",
+    "bedrooms",
+    "accommodates",
+    "number_of_reviews",
+    "latitude",
+    "longitude",
+    "room_type",
+    "property_type",
+    "neighbourhood_cleansed",
+    "host_identity_verified",
+    "host_is_superhost",
+    "amenities",
+    "review_scores_rating",
+]
+
+# Columns read from the raw tables (listings also need `host_location` for the RI filter)
+LISTING_COLUMNS = SELECTED_COLUMNS + ["host_location"]
+REVIEW_COLUMNS = ["id", "listing_id", "date", "reviewer_name", "comments"]
+
+# Rhode Island host filter (non-capturing group to avoid warnings)
+RI_HOST_PATTERN = r"\b(?:RI|Rhode\s*Island)\b"
+
+PRICE_RANGE_LABELS = ["< $100", "$100–$200", "$200–$300", ">$300"]
+
+# VADER compound thresholds
+POSITIVE_THRESHOLD = 0.05
+NEGATIVE_THRESHOLD = -0.05
+SENTIMENT_LABELS = ["Positive", "Neutral", "Negative"]
+
+# Forecasting model
+TARGET = "review_scores_rating"
+
+NUMERIC_FEATURES = [
+    "log_price",
+    "bedrooms",
+    "bathrooms",
+    "accommodates",
+    "number_of_reviews",
+    "amenities_count",
+    "host_identity_verified",
+    "host_is_superhost",
+    "avg_vader_score",
+]
+
+# Local market around the listing, from its nearest neighbours (features stage);
+# added to NUMERIC_FEATURES only with `neighbour_features`
+NEIGHBOUR_FEATURES = [
+    "nb_median_log_price",
+    "nb_avg_vader_score",
+    "nb_density_km2",
+]
+
+CATEGORICAL_FEATURES = ["property_type", "room_type", "neighbourhood_cleansed"]
+
+RANDOM_STATE = 42
+
+
+@dataclass
+class PipelineConfig:
+    """Inputs and output locations for one pipeline run."""
+
+    reviews_path: str = REVIEWS_URL
+    listings_path: str = LISTINGS_URL
+    # Stage outputs are persisted here so any subset of stages can run later
+    workdir: Path = field(default_factory=lambda: Path("artifacts"))
+    figures_dir: Optional[Path] = None
+    # VADER scoring: worker processes (-1 = all cores) and comments per chunk
+    n_jobs: int = 1
+    score_chunksize: int = 5_000
+    # "vader" (reference analyzer) or "vectorized" (batched NumPy reimplementation)
+    score_backend: str = "vader"
+    # Clean and score each distinct comment once, broadcasting to its repeats
+    dedup: bool = True
+    # Per-review cleaned text / score cache; defaults to workdir/review_cache.sqlite
+    use_cache: bool = True
+    cache_path: Optional[Path] = None
+    # When set, reviews are streamed in chunks of this many rows and only
+    # listing-level sentiment is kept (no review-level artifacts)
+    stream_chunksize: Optional[int] = None
+    # Snapshots (`region` or `region@date`) from the registry; when given they
+    # replace `reviews_path`/`listings_path` and several are loaded concurrently
+    snapshots: List[str] = field(default_factory=list)
+    registry_path: Path = Path("snapshots.json")
+    # Read typed Parquet copies (workdir/columnar) written by the convert stage
+    use_columnar: bool = True
+    # Fold only reviews newer than the stored `sentiment_state` into it instead
+    # of re-aggregating every review
+    incremental: bool = False
+    # Compact review tables (categorical keys/labels, float32 scores, small int
+    # counts, Arrow strings); `clean_text` is dropped after scoring if requested,
+    # since the render stage only needs the per-sentiment `word_counts`
+    compact: bool = True
+    drop_clean_text: bool = False
+    # Print the in-memory size of each stage's outputs
+    memory_report: bool = False
+    # Rating forecaster: worker processes (-1 = all cores); with `model_search`,
+    # a randomized search of `search_iter` configurations with `cv_folds`-fold CV
+    # replaces the single fit, caching fitted preprocessors in workdir/model_cache
+    model_n_jobs: int = -1
+    # "forest" (one-hot + RandomForestRegressor) or "hgb" (HistGradientBoostingRegressor
+    # with native categorical splits)
+    model_backend: str = "forest"
+    model_search: bool = False
+    search_iter: int = 20
+    cv_folds: int = 5
+    # Radius of the per-listing neighbourhood summaries from the spatial index,
+    # and the number of nearest listings behind the forecaster's neighbour features
+    neighbour_radius_km: float = 1.0
+    neighbour_k: int = 20
+    # Train the forecaster on the neighbour features too, when `model_df` has them
+    neighbour_features: bool = False
+
+    def __post_init__(self):
+        self.workdir = Path(self.workdir)
+        if self.figures_dir is None:
+            self.figures_dir = self.workdir / "figures"
+        self.figures_dir = Path(self.figures_dir)
+        if self.cache_path is None:
+            self.cache_path = self.workdir / "review_cache.sqlite"
+        self.cache_path = Path(self.cache_path)
+        self.registry_path = Path(self.registry_path)
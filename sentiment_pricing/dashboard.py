@@ -0,0 +1,182 @@
+"""Precomputed tables behind the Streamlit dashboard (`app.py`).
+
+The dashboard stage reduces the run's outputs to small tables keyed by the
+filter dimensions (price range, room type, superhost status, neighbourhood):
+
+* `segments`: one row per observed combination of filter values, with listing
+  and review counts, the exact score sum and per-label review and listing counts
+* `listings`: one row per reviewed listing with its segment and summary fields
+* `trend`: weekly review totals per segment
+
+Every view is a boolean mask over `segments` followed by a small group-by, so
+an interaction costs milliseconds whatever the number of reviews. Per-listing
+views (map, ranking) and the trend are reduced to display size by `chartdata`,
+so what is sent to the browser does not grow with the market either.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .aggregate import COUNT_COLUMNS, SCORE_SCALE
+from .chartdata import MAP_GRIDSIZE, MAX_SERIES_POINTS, RANKED_LISTINGS, downsample, hex_bins, rank_summary
+from .config import SENTIMENT_LABELS
+from .termindex import SEGMENT_COLUMNS
+from .timecube import ewma_rates
+
+SUPERHOST_LABELS = {1.0: "Superhost", 0.0: "Not superhost"}
+UNKNOWN = "Unknown"
+LISTING_COLUMNS = [f"listings_{label.lower()}" for label in SENTIMENT_LABELS]
+Filters = Mapping[str, Sequence]
+
+
+@dataclass
+class Dashboard:
+    segments: pd.DataFrame
+    listings: pd.DataFrame
+    trend: pd.DataFrame
+    alerts: pd.DataFrame
+
+    def options(self) -> Dict[str, list]:
+        """Selectable values of each filter column, in display order."""
+        return {column: self.segments[column].cat.categories.tolist() for column in SEGMENT_COLUMNS}
+
+    def segment_mask(self, filters: Optional[Filters] = None) -> np.ndarray:
+        """Segments matching `filters` (column → selected values; empty selects all)."""
+        keep = np.ones(len(self.segments), dtype=bool)
+        for column, values in (filters or {}).items():
+            if values:
+                keep &= self.segments[column].isin(values).to_numpy()
+        return keep
+
+    def _selected(self, filters: Optional[Filters]):
+        return self.segments[self.segment_mask(filters)]
+
+    def _selected_listings(self, filters: Optional[Filters]) -> pd.DataFrame:
+        segment_ids = self.segments.index[self.segment_mask(filters)]
+        return self.listings[self.listings["segment"].isin(segment_ids)]
+
+    def overview(self, filters: Optional[Filters] = None) -> dict:
+        """Headline numbers for the selection."""
+        selected = self._selected(filters)
+        n_reviews = int(selected["n_reviews"].sum())
+        listings = self._selected_listings(filters)
+        return {
+            "listings": int(selected["n_listings"].sum()),
+            "reviews": n_reviews,
+            "avg_vader_score": selected["vader_sum"].sum() / SCORE_SCALE / n_reviews if n_reviews else np.nan,
+            "negative_share": selected["n_negative"].sum() / n_reviews if n_reviews else np.nan,
+            "median_price": float(listings["price"].median()) if len(listings) else np.nan,
+        }
+
+    def price_range_sentiment(self, filters: Optional[Filters] = None) -> pd.DataFrame:
+        """Listings per price range and most common sentiment (rows: price ranges)."""
+        counts = self._selected(filters).groupby("price_range", observed=False)[LISTING_COLUMNS].sum()
+        counts.columns = pd.Index(SENTIMENT_LABELS, name="sentiment")
+        return counts
+
+    def score_by_price_range(self, filters: Optional[Filters] = None) -> pd.DataFrame:
+        """Quartiles and mean of listing-level average score per price range."""
+        listings = self._selected_listings(filters)
+        scores = listings.groupby("price_range", observed=False)["avg_vader_score"]
+        out = scores.quantile([0.25, 0.5, 0.75]).unstack()
+        out.columns = ["q25", "median", "q75"]
+        out["mean"] = scores.mean()
+        return out
+
+    def segment_sentiment(self, by: str, filters: Optional[Filters] = None) -> pd.DataFrame:
+        """Reviews per value of `by` and sentiment label (rows: `by` values)."""
+        counts = self._selected(filters).groupby(by, observed=True)[COUNT_COLUMNS].sum()
+        counts.columns = pd.Index(SENTIMENT_LABELS, name="sentiment")
+        return counts
+
+    def weekly_trend(self, filters: Optional[Filters] = None, halflife: float = 4,
+                     max_points: int = MAX_SERIES_POINTS) -> pd.DataFrame:
+        """Weekly `avg_vader_score`/`negative_rate` EWMA for the selection, downsampled to `max_points`."""
+        segment_ids = self.segments.index[self.segment_mask(filters)]
+        trend = self.trend[self.trend.index.get_level_values("segment").isin(segment_ids)]
+        if trend.empty:
+            return pd.DataFrame(columns=["n_reviews", "avg_vader_score", "negative_rate"])
+        trend = ewma_rates(trend.groupby(level="bucket").sum(), "W", halflife)
+        return downsample(trend, max_points, column="avg_vader_score")
+
+    def listing_map(self, filters: Optional[Filters] = None, gridsize: int = MAP_GRIDSIZE) -> pd.DataFrame:
+        """Selected listings in hexagonal cells, with mean score and price per cell."""
+        return hex_bins(self._selected_listings(filters), ["avg_vader_score", "price"], gridsize)
+
+    def listing_ranking(self, filters: Optional[Filters] = None, n: int = RANKED_LISTINGS) -> dict:
+        """Highest- and lowest-scoring selected listings, and score quantiles (see `rank_summary`)."""
+        return rank_summary(self._selected_listings(filters), "avg_vader_score", n)
+
+    def drift_alerts(self, filters: Optional[Filters] = None, n: int = 10) -> pd.DataFrame:
+        """Most severe drift alerts among the selected listings."""
+        if self.alerts.empty:
+            return self.alerts
+        listing_ids = self._selected_listings(filters)["listing_id"]
+        return self.alerts[self.alerts.index.isin(listing_ids)].head(n)
+
+
+def _filter_values(listings: pd.DataFrame) -> pd.DataFrame:
+    """Filter columns as categoricals with readable labels; missing values become 'Unknown'."""
+    out = {}
+    for column in SEGMENT_COLUMNS:
+        values = listings[column]
+        if column == "host_is_superhost":
+            values = values.map(SUPERHOST_LABELS)
+        if column == "price_range":
+            # Keep the price-range order; an 'Unknown' bucket goes last
+            values = values.astype("category")
+            if values.isna().any():
+                values = values.cat.add_categories([UNKNOWN]).fillna(UNKNOWN)
+            out[column] = values.cat.remove_unused_categories()
+            continue
+        values = values.astype(object).where(values.notna(), UNKNOWN)
+        categories = sorted(set(values) - {UNKNOWN}) + ([UNKNOWN] if (values == UNKNOWN).any() else [])
+        out[column] = pd.Categorical(values, categories=categories)
+    return pd.DataFrame(out, index=listings.index)
+
+
+def build_dashboard(
+    ri_df: pd.DataFrame,
+    listing_sentiment: pd.DataFrame,
+    cube=None,
+    alerts: Optional[pd.DataFrame] = None,
+) -> Dashboard:
+    """Dashboard tables for reviewed listings (`ri_df` joined to `listing_sentiment`)."""
+    attributes = ri_df.drop_duplicates("listing_id")[["listing_id", "price", "latitude", "longitude"] + SEGMENT_COLUMNS]
+    listings = pd.merge(attributes, listing_sentiment, on="listing_id", how="inner")
+    # Scores are multiples of 1e-4, so the exact sum is recovered from the average
+    listings["vader_sum"] = np.rint(
+        listings["avg_vader_score"] * listings["n_reviews"] * SCORE_SCALE
+    ).astype(np.int64)
+    filters = _filter_values(listings)
+    listings = pd.concat([listings.drop(columns=SEGMENT_COLUMNS), filters], axis=1)
+    listings["segment"] = listings.groupby(SEGMENT_COLUMNS, observed=True, sort=True).ngroup()
+
+    for label, column in zip(SENTIMENT_LABELS, LISTING_COLUMNS):
+        listings[column] = (listings["most_common_sentiment"] == label).astype(np.int64)
+    totals = ["n_reviews", "vader_sum"] + COUNT_COLUMNS + LISTING_COLUMNS
+    grouped = listings.groupby("segment")
+    segments = grouped[totals].sum()
+    segments.insert(0, "n_listings", grouped.size())
+    for column in SEGMENT_COLUMNS:
+        segments[column] = grouped[column].first().astype(listings[column].dtype)
+    segments = segments[SEGMENT_COLUMNS + ["n_listings"] + totals]
+
+    if cube is not None:
+        trend = cube.totals("W", ri_df=listings[["listing_id", "segment"]], segment="segment")
+    else:
+        trend = pd.DataFrame(
+            columns=["n_reviews", "vader_sum"] + COUNT_COLUMNS,
+            index=pd.MultiIndex.from_arrays([[], []], names=["bucket", "segment"]),
+        )
+    listings = listings[["listing_id", "segment", "price", "latitude", "longitude", "avg_vader_score",
+                         "most_common_sentiment", "n_reviews"] + SEGMENT_COLUMNS]
+    return Dashboard(
+        segments=segments,
+        listings=listings.reset_index(drop=True),
+        trend=trend,
+        alerts=alerts if alerts is not None else pd.DataFrame(),
+    )
@@ -0,0 +1,43 @@
+"""Compute per distinct review text instead of per review.
+
+Short-term rental reviews repeat a lot ("Great place!", automated cancellation
+notices), so cleaning and scoring run once per distinct text and the results
+are broadcast back through the factorized (categorical) codes.
+"""
+
+from typing import Callable, Optional
+
+import numpy as np
+import pandas as pd
+
+
+def normalize_comment(text: str) -> str:
+    """Collapse whitespace runs and trim; VADER splits on whitespace, so scores are unchanged."""
+    return " ".join(text.split())
+
+
+def dedup_apply(
+    texts: pd.Series,
+    compute: Callable[[pd.Series], pd.DataFrame],
+    normalize: Optional[Callable[[str], str]] = None,
+    name: str = "texts",
+) -> pd.DataFrame:
+    """`compute(texts)` evaluated on one representative of each distinct (normalized) text.
+
+    `normalize` must not change what `compute` returns for a text.
+    """
+    keys = texts if normalize is None else texts.map(normalize)
+    codes, uniques = pd.factorize(keys)
+    # First occurrence of each distinct text is its representative
+    _, first = np.unique(codes, return_index=True)
+    computed = compute(texts.iloc[first])
+    report_dedup(name, len(texts), len(uniques))
+
+    out = computed.iloc[codes]
+    out.index = texts.index
+    return out
+
+
+def report_dedup(name: str, total: int, distinct: int) -> None:
+    saved = (1 - distinct / total) * 100 if total else 0.0
+    print(f"{name} dedup: {distinct}/{total} distinct texts ({saved:.1f}% less work)")
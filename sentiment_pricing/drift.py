@@ -0,0 +1,191 @@
+"""Early-warning sentiment drift alerts per listing.
+
+`DriftDetector` follows each listing's reviews in date order and keeps a few
+numbers per listing: a slowly moving baseline and a fast EWMA of the compound
+score and of the negative-review indicator, and one-sided CUSUM statistics for
+drops below the baseline. Each review updates its listing's state in O(1), so
+new reviews can be fed in as they arrive (or replayed from the full history)
+and `alerts` ranks the listings whose sentiment recently dropped:
+
+    detector = DriftDetector().update(scored_reviews)
+    detector.alerts(n=20)
+
+Within a batch, the k-th review of every listing is applied in one vectorized
+step, which gives the same result as feeding the reviews one at a time.
+"""
+
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+NAT = np.iinfo(np.int64).min
+FLOAT_STATE = ["baseline_score", "recent_score", "score_cusum",
+               "baseline_negative", "recent_negative", "negative_cusum"]
+INT_STATE = ["n_reviews", "alert_since", "last_review"]
+
+
+@dataclass
+class DriftDetector:
+    warmup: int = 5  # reviews averaged into the baseline before CUSUM starts
+    slow: float = 0.05  # baseline EWMA weight
+    fast: float = 0.3  # recent EWMA weight
+    # Slack is about half a standard deviation of a single review (compound score
+    # ~0.6, negative indicator ~0.4); limits about five
+    score_slack: float = 0.3  # score drop per review tolerated as noise
+    score_limit: float = 3.0  # CUSUM level that raises a score alert
+    negative_slack: float = 0.2  # negative-rate rise per review tolerated as noise
+    negative_limit: float = 2.0  # CUSUM level that raises a negative-rate alert
+    ids: pd.Index = field(default_factory=lambda: pd.Index([], dtype=np.int64))
+    state: Dict[str, np.ndarray] = field(default_factory=dict)
+    late: int = 0  # reviews skipped for arriving after a newer one of the same listing
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def update(self, reviews_df: pd.DataFrame) -> "DriftDetector":
+        """Apply scored reviews (`listing_id`, `date`, `vader_score`, `sentiment`), in place.
+
+        Reviews dated before the latest one already applied for their listing
+        arrive too late to replay in order; they are skipped and counted in `late`.
+        """
+        if reviews_df.empty:
+            return self
+        order = ["listing_id", "date", "id"] if "id" in reviews_df.columns else ["listing_id", "date"]
+        reviews_df = reviews_df[order + ["vader_score", "sentiment"]].assign(
+            listing_id=np.asarray(reviews_df["listing_id"], dtype=np.int64),
+            date=pd.to_datetime(reviews_df["date"]),
+        ).sort_values(order, kind="mergesort")
+        slots = self._slots(reviews_df["listing_id"].to_numpy())
+        scores = reviews_df["vader_score"].to_numpy(dtype=np.float64)
+        negative = (np.asarray(reviews_df["sentiment"]) == "Negative").astype(np.float64)
+        dates = reviews_df["date"].to_numpy(dtype="datetime64[ns]").view(np.int64)
+        on_time = dates >= self.state["last_review"][slots]
+        if not on_time.all():
+            self.late += int((~on_time).sum())
+            reviews_df = reviews_df[on_time]
+            slots, scores, negative, dates = slots[on_time], scores[on_time], negative[on_time], dates[on_time]
+            if reviews_df.empty:
+                return self
+
+        # Rank of each review within its listing; step k applies every listing's k-th review
+        rank = reviews_df.groupby("listing_id", sort=False).cumcount().to_numpy()
+        by_rank = np.argsort(rank, kind="stable")
+        bounds = np.searchsorted(rank[by_rank], np.arange(rank.max() + 2))
+        for k in range(rank.max() + 1):
+            rows = by_rank[bounds[k]:bounds[k + 1]]
+            self._step(slots[rows], scores[rows], negative[rows], dates[rows])
+        return self
+
+    def add(self, listing_id: int, date, vader_score: float, sentiment: str) -> "DriftDetector":
+        """Apply a single new review, without the batch bookkeeping of `update`.
+
+        O(1) for a known listing; the first review of a new listing grows the state arrays.
+        """
+        try:
+            slot = np.array([self.ids.get_loc(listing_id)])
+        except KeyError:
+            slot = self._slots(np.array([listing_id], dtype=np.int64))
+        date = pd.Timestamp(date).value
+        if date < self.state["last_review"][slot[0]]:
+            self.late += 1
+            return self
+        self._step(
+            slot,
+            np.array([vader_score], dtype=np.float64),
+            np.array([sentiment == "Negative"], dtype=np.float64),
+            np.array([date], dtype=np.int64),
+        )
+        return self
+
+    def _slots(self, listing_ids: np.ndarray) -> np.ndarray:
+        """State positions of `listing_ids`, adding listings not seen before."""
+        new = pd.Index(listing_ids).unique().difference(self.ids)
+        if len(new):
+            self.ids = self.ids.append(new)
+            n = len(self.ids)
+            for name in FLOAT_STATE + INT_STATE:
+                old = self.state.get(name, np.empty(0))
+                fill = NAT if name in ("alert_since", "last_review") else 0
+                grown = np.full(n, fill, dtype=np.int64 if name in INT_STATE else np.float64)
+                grown[:len(old)] = old
+                self.state[name] = grown
+        return self.ids.get_indexer(listing_ids)
+
+    def _step(self, s: np.ndarray, score: np.ndarray, negative: np.ndarray, date: np.ndarray) -> None:
+        """One review for each of the (distinct) listings at positions `s`."""
+        st = self.state
+        n = st["n_reviews"][s]
+        warm = n < self.warmup
+        base, base_neg = st["baseline_score"][s], st["baseline_negative"][s]
+
+        # CUSUM of drops below (score) / rises above (negative rate) the baseline
+        score_cusum = np.maximum(0.0, st["score_cusum"][s] + (base - score) - self.score_slack)
+        negative_cusum = np.maximum(0.0, st["negative_cusum"][s] + (negative - base_neg) - self.negative_slack)
+        st["score_cusum"][s] = np.where(warm, 0.0, score_cusum)
+        st["negative_cusum"][s] = np.where(warm, 0.0, negative_cusum)
+
+        # Baseline is the plain mean during warm-up, then a slow EWMA
+        weight = np.where(warm, 1.0 / (n + 1), self.slow)
+        st["baseline_score"][s] = base + weight * (score - base)
+        st["baseline_negative"][s] = base_neg + weight * (negative - base_neg)
+        weight = np.where(n == 0, 1.0, self.fast)
+        st["recent_score"][s] += weight * (score - st["recent_score"][s])
+        st["recent_negative"][s] += weight * (negative - st["recent_negative"][s])
+
+        alarm = (st["score_cusum"][s] > self.score_limit) | (st["negative_cusum"][s] > self.negative_limit)
+        since = st["alert_since"][s]
+        st["alert_since"][s] = np.where(alarm, np.where(since == NAT, date, since), NAT)
+        st["last_review"][s] = date
+        st["n_reviews"][s] = n + 1
+
+    def table(self) -> pd.DataFrame:
+        """Current state of every listing, indexed by `listing_id`."""
+        out = pd.DataFrame({name: self.state.get(name, []) for name in INT_STATE[:1] + FLOAT_STATE},
+                           index=pd.Index(self.ids, name="listing_id"))
+        for name in INT_STATE[1:]:
+            values = self.state.get(name, np.empty(0, dtype=np.int64))
+            out[name] = pd.to_datetime(np.where(values == NAT, np.datetime64("NaT"), values.view("datetime64[ns]")))
+        out["severity"] = np.maximum(out["score_cusum"] / self.score_limit,
+                                     out["negative_cusum"] / self.negative_limit)
+        return out
+
+    def alerts(self, n: Optional[int] = 20, recent_days: int = 90, as_of=None) -> pd.DataFrame:
+        """Listings in alert with a review in the `recent_days` before `as_of`
+        (default: the latest review seen), most severe first."""
+        table = self.table()
+        if table.empty:
+            return table
+        as_of = table["last_review"].max() if as_of is None else pd.Timestamp(as_of)
+        recent = table["last_review"] >= as_of - pd.Timedelta(days=recent_days)
+        alerting = table[table["alert_since"].notna() & recent]
+        alerting = alerting.sort_values("severity", ascending=False)
+        return alerting if n is None else alerting.head(n)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """`python -m sentiment_pricing.drift [options]`: the ranked alert table from the stored detector."""
+    import argparse
+
+    from .pipeline import ArtifactStore
+
+    parser = argparse.ArgumentParser(prog="sentiment_pricing.drift")
+    parser.add_argument("--workdir", default="artifacts", help="Run with 'drift_detector'")
+    parser.add_argument("-n", type=int, default=20, help="Number of alerts")
+    parser.add_argument("--recent-days", type=int, default=90, help="Only listings reviewed this recently")
+    parser.add_argument("--as-of", help="Reference date (default: latest review)")
+    args = parser.parse_args(argv)
+
+    detector = ArtifactStore(args.workdir)["drift_detector"]
+    start = time.perf_counter()
+    alerts = detector.alerts(args.n, args.recent_days, args.as_of)
+    elapsed = time.perf_counter() - start
+    print(alerts.to_string(float_format="{:.3f}".format))
+    print(f"{len(alerts)} alerts of {len(detector)} listings, query in {elapsed * 1000:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
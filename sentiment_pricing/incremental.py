@@ -0,0 +1,115 @@
+"""Incremental listing-level sentiment.
+
+`SentimentState` holds the mergeable per-listing totals from `aggregate`
+(review count, exact compound-score sum, per-label counts and first positions,
+latest review date) plus a date watermark. A refresh folds in only the reviews
+past the watermark, so its cost depends on the new reviews, not on the history:
+
+    state = SentimentState.from_reviews(scored_reviews)   # first run
+    state = state.fold(next_snapshot_scored_reviews)      # later runs
+    listing_sentiment = state.listing_sentiment()
+
+Reviews are assumed to be append-only in date order, as in successive
+InsideAirbnb snapshots; a review already folded in is never counted twice, but
+edits to old reviews are not picked up.
+"""
+
+from typing import FrozenSet, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from .aggregate import FIRST_COLUMNS, combine_partials, finalize_sentiment, partial_sentiment
+
+
+class SentimentState:
+    """Per-listing sentiment totals that new reviews and other shards merge into.
+
+    `rows_seen` is the number of reviews folded in so far; positions of later
+    reviews start after it, which keeps `most_common_sentiment` tie-breaks the
+    same as if all reviews had been aggregated as one table in arrival order.
+    """
+
+    def __init__(
+        self,
+        totals: Optional[pd.DataFrame] = None,
+        rows_seen: int = 0,
+        watermark: Optional[pd.Timestamp] = None,
+        watermark_ids: FrozenSet[int] = frozenset(),
+    ):
+        self.totals = totals
+        self.rows_seen = rows_seen
+        # Latest review date folded in, and the review ids seen on that date
+        self.watermark = watermark
+        self.watermark_ids = watermark_ids
+
+    def __len__(self) -> int:
+        return 0 if self.totals is None else len(self.totals)
+
+    @classmethod
+    def from_reviews(cls, reviews_df: pd.DataFrame) -> "SentimentState":
+        """State for scored reviews (`listing_id`, `date`, `vader_score`, `sentiment`, `id`)."""
+        reviews_df = reviews_df.reset_index(drop=True)
+        if reviews_df.empty:
+            return cls()
+        dates = pd.to_datetime(reviews_df["date"])
+        watermark = dates.max()
+        return cls(
+            partial_sentiment(reviews_df.assign(date=dates)),
+            rows_seen=len(reviews_df),
+            watermark=watermark,
+            watermark_ids=frozenset(reviews_df.loc[dates == watermark, "id"].tolist()),
+        )
+
+    def unseen(self, reviews_df: pd.DataFrame) -> pd.DataFrame:
+        """Rows of `reviews_df` that are past the watermark."""
+        if self.watermark is None or reviews_df.empty:
+            return reviews_df
+        dates = pd.to_datetime(reviews_df["date"])
+        on_watermark = (dates == self.watermark) & ~reviews_df["id"].isin(self.watermark_ids)
+        return reviews_df[(dates > self.watermark) | on_watermark]
+
+    def merge(self, other: "SentimentState") -> "SentimentState":
+        """Combine with a shard of other reviews, taken to come after this state's."""
+        if other.totals is None:
+            return self
+        if self.totals is None:
+            return other
+        shifted = other.totals.copy()
+        shifted[FIRST_COLUMNS] += self.rows_seen
+        if self.watermark == other.watermark:
+            watermark, ids = self.watermark, self.watermark_ids | other.watermark_ids
+        else:
+            watermark, ids = max(
+                (self.watermark, self.watermark_ids), (other.watermark, other.watermark_ids),
+                key=lambda pair: pair[0],
+            )
+        return SentimentState(
+            combine_partials([self.totals, shifted]),
+            rows_seen=self.rows_seen + other.rows_seen,
+            watermark=watermark,
+            watermark_ids=ids,
+        )
+
+    def fold(self, reviews_df: pd.DataFrame) -> "SentimentState":
+        """State with the not-yet-seen reviews of `reviews_df` added."""
+        new = self.unseen(reviews_df)
+        print(f"folding {len(new)} new of {len(reviews_df)} reviews")
+        return self.merge(SentimentState.from_reviews(new))
+
+    def listing_sentiment(self, listing_ids: Optional[Iterable] = None) -> pd.DataFrame:
+        """Per-listing `avg_vader_score`, `most_common_sentiment`, counts and `last_review`."""
+        if self.totals is None:
+            return pd.DataFrame(columns=["listing_id", "avg_vader_score", "most_common_sentiment"])
+        totals = self.totals
+        if listing_ids is not None:
+            totals = totals[totals.index.isin(np.asarray(listing_ids))]
+        return finalize_sentiment(totals.sort_index())
+
+
+def merge_states(states: Iterable[SentimentState]) -> SentimentState:
+    """Merge shards in order, e.g. states built from consecutive chunks of one table."""
+    merged = SentimentState()
+    for state in states:
+        merged = merged.merge(state)
+    return merged
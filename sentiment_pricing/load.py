@@ -0,0 +1,61 @@
+"""Load stage: read the raw InsideAirbnb listings and reviews tables.
+
+Sources may be the original `.csv.gz` files (local path or URL) or Parquet copies
+written by `columnar.convert_*`; either way only the pipeline's columns are read.
+Local files are memory-mapped rather than read into Python buffers.
+"""
+
+from pathlib import Path
+from typing import Iterator, Optional, Sequence
+
+import pandas as pd
+
+from .config import LISTING_COLUMNS, REVIEW_COLUMNS
+
+
+def _is_local(path: str) -> bool:
+    return "://" not in str(path) and Path(path).exists()
+
+
+def _read(path: str, columns: Optional[Sequence[str]]) -> pd.DataFrame:
+    from .columnar import is_columnar, read_columnar
+    from .registry import open_mapped
+
+    if is_columnar(path):
+        return read_columnar(path, columns)
+    if _is_local(path):
+        with open_mapped(path) as stream:
+            return pd.read_csv(stream, usecols=columns)
+    return pd.read_csv(path, compression="gzip", usecols=columns)
+
+
+def load_reviews(path: str, columns: Optional[Sequence[str]] = REVIEW_COLUMNS) -> pd.DataFrame:
+    """Read reviews from `reviews.csv.gz` (local path or URL) or its Parquet copy."""
+    return _read(path, columns)
+
+
+def load_listings(path: str, columns: Optional[Sequence[str]] = LISTING_COLUMNS) -> pd.DataFrame:
+    """Read listings from `listings.csv.gz` (local path or URL) or its Parquet copy."""
+    return _read(path, columns)
+
+
+def iter_reviews(
+    path: str, chunksize: int, columns: Optional[Sequence[str]] = REVIEW_COLUMNS
+) -> Iterator[pd.DataFrame]:
+    """Read reviews in chunks of `chunksize` rows.
+
+    Chunks keep a running row index across the file, so the index doubles as the
+    review's position in the original table.
+    """
+    from .columnar import is_columnar, iter_columnar
+    from .registry import open_mapped
+
+    if is_columnar(path):
+        yield from iter_columnar(path, chunksize, columns)
+    elif _is_local(path):
+        with open_mapped(path) as stream:
+            with pd.read_csv(stream, usecols=columns, chunksize=chunksize) as reader:
+                yield from reader
+    else:
+        with pd.read_csv(path, compression="gzip", usecols=columns, chunksize=chunksize) as reader:
+            yield from reader
@@ -0,0 +1,73 @@
+"""Compact in-memory layout for review-level tables and per-stage memory reports.
+
+`compact_reviews` stores `listing_id` and `sentiment` as categoricals, text as
+Arrow-backed strings, scores as float32 and token counts in the smallest
+integer type that holds them. `clean_text` can be dropped once the word counts
+that need it have been taken.
+"""
+
+from typing import Mapping
+
+import numpy as np
+import pandas as pd
+
+from .config import SENTIMENT_LABELS
+from .score import SCORE_COLUMNS
+
+TEXT_COLUMNS = ["reviewer_name", "comments", "clean_text"]
+COUNT_COLUMNS = ["word_count", "char_count"]
+
+
+def _smallest_int(values: pd.Series) -> pd.Series:
+    """`values` as int16 or int32 when they fit, otherwise unchanged."""
+    if values.empty:
+        return values.astype(np.int16)
+    low, high = values.min(), values.max()
+    for dtype in (np.int16, np.int32):
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return values.astype(dtype)
+    return values
+
+
+def compact_reviews(reviews_df: pd.DataFrame, drop_clean_text: bool = False) -> pd.DataFrame:
+    """Reviews table with compact column types; columns not present are left out."""
+    columns = {}
+    for name, values in reviews_df.items():
+        if name == "clean_text" and drop_clean_text:
+            continue
+        if name == "listing_id":
+            values = values.astype("category")
+        elif name == "sentiment":
+            values = pd.Categorical(values, categories=SENTIMENT_LABELS)
+        elif name in TEXT_COLUMNS:
+            values = values.astype(pd.StringDtype("pyarrow"))
+        elif name in SCORE_COLUMNS.values():
+            values = values.astype(np.float32)
+        elif name in COUNT_COLUMNS:
+            values = _smallest_int(values)
+        columns[name] = values
+    return pd.DataFrame(columns).reset_index(drop=True)
+
+
+def frame_bytes(df: pd.DataFrame) -> int:
+    """Deep in-memory size of a frame, including its index."""
+    return int(df.memory_usage(deep=True, index=True).sum())
+
+
+def memory_report(artifacts: Mapping[str, object]) -> pd.DataFrame:
+    """Rows, total MB and bytes per row for each DataFrame in `artifacts`."""
+    rows = []
+    for name, value in artifacts.items():
+        if not isinstance(value, pd.DataFrame):
+            continue
+        size = frame_bytes(value)
+        rows.append(
+            {
+                "artifact": name,
+                "rows": len(value),
+                "mb": round(size / 2**20, 2),
+                "bytes_per_row": round(size / max(len(value), 1), 1),
+            }
+        )
+    return pd.DataFrame(rows, columns=["artifact", "rows", "mb", "bytes_per_row"])
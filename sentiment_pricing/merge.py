@@ -0,0 +1,25 @@
+"""Merge stage: listing features joined with listing-level sentiment (`model_df`)."""
+
+from typing import Optional
+
+import pandas as pd
+
+from .config import TARGET
+
+
+def build_model_df(
+    ri_df: pd.DataFrame,
+    summary_df: pd.DataFrame,
+    neighbour_features: Optional[pd.DataFrame] = None,
+) -> pd.DataFrame:
+    """One row per listing with attributes, `avg_vader_score`, neighbour features
+    (missing without coordinates) and a non-null target."""
+    model_df = pd.merge(
+        ri_df,
+        summary_df[["listing_id", "avg_vader_score"]],
+        on="listing_id",
+        how="inner",
+    )
+    if neighbour_features is not None:
+        model_df = pd.merge(model_df, neighbour_features, on="listing_id", how="left")
+    return model_df.dropna(subset=[TARGET, "avg_vader_score"])
@@ -0,0 +1,241 @@
+"""Model stage: forecast listing satisfaction (`review_scores_rating`)."""
+
+import time
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+
+from .config import CATEGORICAL_FEATURES, NUMERIC_FEATURES, RANDOM_STATE, TARGET
+
+
+def build_preprocessor(
+    numeric_features: Optional[list] = None,
+    categorical_features: Optional[list] = None,
+):
+    """Median-impute numeric columns; mode-impute and one-hot encode categoricals."""
+    from sklearn.compose import ColumnTransformer
+    from sklearn.impute import SimpleImputer
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import OneHotEncoder
+
+    numeric_features = numeric_features or NUMERIC_FEATURES
+    categorical_features = categorical_features or CATEGORICAL_FEATURES
+
+    numeric_transformer = Pipeline(
+        steps=[
+            ("imputer", SimpleImputer(strategy="median"))
+        ]
+    )
+    categorical_transformer = Pipeline(
+        steps=[
+            ("imputer", SimpleImputer(strategy="most_frequent")),
+            ("onehot", OneHotEncoder(handle_unknown="ignore"))
+        ]
+    )
+    return ColumnTransformer(
+        transformers=[
+            ("num", numeric_transformer, numeric_features),
+            ("cat", categorical_transformer, categorical_features)
+        ]
+    )
+
+
+def build_forecast_pipeline(
+    n_jobs: Optional[int] = None, memory=None, numeric_features: Optional[list] = None
+):
+    """Preprocessing + RandomForestRegressor (`forecast_pipeline`).
+
+    `memory` (a directory or `joblib.Memory`) caches the fitted preprocessor, so
+    candidates evaluated on the same training rows reuse its output.
+    """
+    from sklearn.ensemble import RandomForestRegressor
+    from sklearn.pipeline import Pipeline
+
+    rf_model = RandomForestRegressor(n_estimators=200, random_state=RANDOM_STATE, n_jobs=n_jobs)
+    return Pipeline(
+        steps=[
+            ("preprocessor", build_preprocessor(numeric_features)),
+            ("model", rf_model)
+        ],
+        memory=memory,
+    )
+
+
+def build_hgb_pipeline(
+    n_jobs: Optional[int] = None, memory=None, numeric_features: Optional[list] = None
+):
+    """Ordinal-encoded categoricals + HistGradientBoostingRegressor with native
+    categorical splits; no one-hot matrix, and missing numerics are handled by
+    the model itself. `n_jobs` is unused (the booster is multithreaded)."""
+    import numpy as np
+    from sklearn.compose import ColumnTransformer
+    from sklearn.ensemble import HistGradientBoostingRegressor
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import OrdinalEncoder
+
+    numeric_features = numeric_features or NUMERIC_FEATURES
+    # Unknown and missing categories become NaN, which the booster treats as missing;
+    # at most 255 categories per feature (rarer ones are grouped)
+    encoder = OrdinalEncoder(
+        handle_unknown="use_encoded_value",
+        unknown_value=np.nan,
+        encoded_missing_value=np.nan,
+        max_categories=255,
+    )
+    preprocessor = ColumnTransformer(
+        transformers=[
+            ("num", "passthrough", numeric_features),
+            ("cat", encoder, CATEGORICAL_FEATURES),
+        ]
+    )
+    n_numeric = len(numeric_features)
+    categorical = list(range(n_numeric, n_numeric + len(CATEGORICAL_FEATURES)))
+    hgb_model = HistGradientBoostingRegressor(
+        categorical_features=categorical, random_state=RANDOM_STATE
+    )
+    return Pipeline(
+        steps=[
+            ("preprocessor", preprocessor),
+            ("model", hgb_model)
+        ],
+        memory=memory,
+    )
+
+
+# Forecaster pipelines by name (`--model`)
+MODEL_BACKENDS = {"forest": build_forecast_pipeline, "hgb": build_hgb_pipeline}
+
+# Randomized search spaces (`model__` = pipeline step prefix)
+SEARCH_SPACES = {
+    "forest": {
+        "model__n_estimators": [100, 200, 300, 500],
+        "model__max_depth": [None, 5, 10, 20],
+        "model__min_samples_leaf": [1, 2, 4, 8],
+        "model__max_features": ["sqrt", 0.5, 1.0],
+    },
+    "hgb": {
+        "model__learning_rate": [0.03, 0.05, 0.1, 0.2],
+        "model__max_iter": [100, 200, 400],
+        "model__max_leaf_nodes": [7, 15, 31, 63],
+        "model__min_samples_leaf": [5, 10, 20, 40],
+        "model__l2_regularization": [0.0, 0.1, 1.0],
+    },
+}
+
+
+def _pipeline_builder(backend: str):
+    if backend not in MODEL_BACKENDS:
+        raise ValueError(f"Unknown model '{backend}'; choose from {', '.join(MODEL_BACKENDS)}")
+    return MODEL_BACKENDS[backend]
+
+
+def split_features(model_df: pd.DataFrame, numeric_features: Optional[list] = None):
+    """Feature matrix `X` and target `y` from `model_df`."""
+    numeric_features = numeric_features or NUMERIC_FEATURES
+    X = model_df[numeric_features + CATEGORICAL_FEATURES]
+    y = model_df[TARGET]
+    return X, y
+
+
+def train_forecaster(
+    model_df: pd.DataFrame,
+    n_jobs: Optional[int] = None,
+    backend: str = "forest",
+    numeric_features: Optional[list] = None,
+) -> dict:
+    """Fit the `backend` pipeline on an 80/20 split and report test MAE and R²."""
+    from sklearn.metrics import mean_absolute_error, r2_score
+    from sklearn.model_selection import train_test_split
+
+    numeric_features = numeric_features or NUMERIC_FEATURES
+    X, y = split_features(model_df, numeric_features)
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=0.2, random_state=RANDOM_STATE
+    )
+
+    forecast_pipeline = _pipeline_builder(backend)(n_jobs=n_jobs, numeric_features=numeric_features)
+    forecast_pipeline.fit(X_train, y_train)
+    y_pred = forecast_pipeline.predict(X_test)
+
+    return {
+        "pipeline": forecast_pipeline,
+        "y_test": y_test,
+        "y_pred": y_pred,
+        "mae": mean_absolute_error(y_test, y_pred),
+        "r2": r2_score(y_test, y_pred),
+        "numeric_features": numeric_features,
+    }
+
+
+def search_forecaster(
+    model_df: pd.DataFrame,
+    n_iter: int = 20,
+    cv: int = 5,
+    n_jobs: Optional[int] = -1,
+    cache_dir: Optional[Path] = None,
+    backend: str = "forest",
+    numeric_features: Optional[list] = None,
+) -> dict:
+    """Randomized search over the `backend`'s `SEARCH_SPACES` entry with K-fold CV on
+    the 80% training split.
+
+    Candidates × folds run in parallel on `n_jobs` processes, and each fold's
+    fitted preprocessor is cached in `cache_dir`. The best configuration is
+    refit on the whole training split and reported on the same 20% test split
+    as `train_forecaster`, plus per-fold CV MAE/R² and the wall time.
+    """
+    from joblib import Memory
+    from sklearn.metrics import mean_absolute_error, r2_score
+    from sklearn.model_selection import KFold, RandomizedSearchCV, train_test_split
+
+    build = _pipeline_builder(backend)
+    numeric_features = numeric_features or NUMERIC_FEATURES
+    X, y = split_features(model_df, numeric_features)
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=0.2, random_state=RANDOM_STATE
+    )
+
+    start = time.perf_counter()
+    memory = Memory(str(cache_dir), verbose=0) if cache_dir is not None else None
+    # Parallelism is across candidates and folds; forests stay single-threaded and
+    # worker processes cap the booster's own threads
+    search = RandomizedSearchCV(
+        build(n_jobs=1, memory=memory, numeric_features=numeric_features),
+        SEARCH_SPACES[backend],
+        n_iter=n_iter,
+        scoring={"mae": "neg_mean_absolute_error", "r2": "r2"},
+        refit="mae",
+        cv=KFold(n_splits=cv, shuffle=True, random_state=RANDOM_STATE),
+        n_jobs=n_jobs,
+        random_state=RANDOM_STATE,
+    )
+    search.fit(X_train, y_train)
+    wall_time = time.perf_counter() - start
+
+    results = search.cv_results_
+    best = search.best_index_
+    folds = pd.DataFrame(
+        {
+            "fold": range(1, cv + 1),
+            "mae": [-results[f"split{i}_test_mae"][best] for i in range(cv)],
+            "r2": [results[f"split{i}_test_r2"][best] for i in range(cv)],
+        }
+    )
+    forecast_pipeline = search.best_estimator_
+    # Drop the cache reference so the persisted pipeline does not depend on it
+    forecast_pipeline.memory = None
+    y_pred = forecast_pipeline.predict(X_test)
+
+    return {
+        "pipeline": forecast_pipeline,
+        "y_test": y_test,
+        "y_pred": y_pred,
+        "mae": mean_absolute_error(y_test, y_pred),
+        "r2": r2_score(y_test, y_pred),
+        "numeric_features": numeric_features,
+        "best_params": search.best_params_,
+        "cv_folds": folds,
+        "candidates": n_iter,
+        "wall_time": wall_time,
+    }
@@ -0,0 +1,496 @@
+"""Stage registry and runner.
+
+Stages run in the order convert → load → clean → score → aggregate → index →
+spatial → features → merge → model → dashboard → render.
+Each stage reads its inputs from an `ArtifactStore` and writes its outputs back,
+so any subset can run as long as earlier outputs exist in the store's workdir.
+"""
+
+import pickle
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+from .config import PipelineConfig
+
+
+class ArtifactStore:
+    """Named stage outputs kept in memory and pickled to `workdir`."""
+
+    def __init__(self, workdir: Path):
+        self.workdir = Path(workdir)
+        self._memory: Dict[str, object] = {}
+        # Names written since creation, in order; used for per-stage memory reports
+        self.written: List[str] = []
+
+    def path(self, name: str) -> Path:
+        return self.workdir / f"{name}.pkl"
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._memory or self.path(name).exists()
+
+    def __getitem__(self, name: str):
+        if name not in self._memory:
+            path = self.path(name)
+            if not path.exists():
+                raise KeyError(
+                    f"Artifact '{name}' not found in {self.workdir}; run the stage that produces it first"
+                )
+            with open(path, "rb") as f:
+                self._memory[name] = pickle.load(f)
+        return self._memory[name]
+
+    def __setitem__(self, name: str, value) -> None:
+        self._memory[name] = value
+        self.written.append(name)
+        self.workdir.mkdir(parents=True, exist_ok=True)
+        with open(self.path(name), "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+# --------------------------------------------------
+# Stages
+# --------------------------------------------------
+def data_sources(config: PipelineConfig) -> list:
+    """Snapshots to read: registry entries for `config.snapshots`, oldest first, or the
+    configured `reviews_path`/`listings_path` as a single unnamed source."""
+    from .registry import Snapshot, SnapshotFile, SnapshotRegistry
+
+    if not config.snapshots:
+        files = {
+            "reviews": SnapshotFile(config.reviews_path),
+            "listings": SnapshotFile(config.listings_path),
+        }
+        return [Snapshot("", "", files)]
+    registry = SnapshotRegistry.load(config.registry_path)
+    return sorted((registry.get(key) for key in config.snapshots), key=lambda s: s.date)
+
+
+def columnar_path(config: PipelineConfig, snapshot, name: str) -> Path:
+    base = config.workdir / "columnar"
+    if snapshot.region:
+        base = base / snapshot.region / snapshot.date
+    return base / f"{name}.parquet"
+
+
+def resolve_source(config: PipelineConfig, snapshot, name: str) -> str:
+    """Where to read a snapshot's `reviews`/`listings` table from: its current Parquet
+    copy if any, otherwise the source file, whose registered hash is checked first."""
+    from .columnar import is_columnar, is_current
+    from .registry import verify_file
+
+    snapshot_file = snapshot.files[name]
+    source = str(snapshot_file.path)
+    if not is_columnar(source) and config.use_columnar:
+        dest = columnar_path(config, snapshot, name)
+        if is_current(dest, source):
+            return str(dest)
+    if "://" not in source:
+        verify_file(snapshot_file)
+    return source
+
+
+def stage_convert(store: ArtifactStore, config: PipelineConfig) -> None:
+    from .columnar import convert_listings, convert_reviews, is_columnar, is_current
+    from .registry import verify_file
+
+    if not config.use_columnar:
+        return
+    for snapshot in data_sources(config):
+        for name, convert in [("reviews", convert_reviews), ("listings", convert_listings)]:
+            source = str(snapshot.files[name].path)
+            dest = columnar_path(config, snapshot, name)
+            if is_columnar(source) or is_current(dest, source):
+                continue
+            if "://" not in source:
+                verify_file(snapshot.files[name])
+            convert(source, dest)
+            print(f"Converted {source} -> {dest}")
+
+
+def stage_load(store: ArtifactStore, config: PipelineConfig) -> None:
+    import pandas as pd
+
+    from .load import load_listings, load_reviews
+    from .registry import load_snapshots
+
+    def load_one(snapshot):
+        reviews_df = None
+        if config.stream_chunksize is None:
+            reviews_df = load_reviews(resolve_source(config, snapshot, "reviews"))
+        return reviews_df, load_listings(resolve_source(config, snapshot, "listings"))
+
+    # Snapshots load concurrently; later snapshots win for repeated ids
+    loaded = list(load_snapshots(data_sources(config), load_one).values())
+    if config.stream_chunksize is None:
+        reviews = [r for r, _ in loaded]
+        store["raw_reviews"] = reviews[0] if len(reviews) == 1 else (
+            pd.concat(reviews, ignore_index=True).drop_duplicates("id", keep="last")
+        )
+    listings = [l for _, l in loaded]
+    store["raw_listings"] = listings[0] if len(listings) == 1 else (
+        pd.concat(listings, ignore_index=True).drop_duplicates("id", keep="last")
+    )
+
+
+def open_cache(config: PipelineConfig):
+    """The run's `ReviewCache`, or None when caching is disabled."""
+    if not config.use_cache:
+        return None
+    from .cache import ReviewCache
+
+    return ReviewCache(config.cache_path)
+
+
+def stage_clean(store: ArtifactStore, config: PipelineConfig) -> None:
+    from .clean import clean_reviews, prepare_listings
+    from .memory import compact_reviews
+
+    if config.stream_chunksize is None:
+        cache = open_cache(config)
+        try:
+            reviews_df = clean_reviews(store["raw_reviews"], cache=cache, dedup=config.dedup)
+            store["reviews"] = compact_reviews(reviews_df) if config.compact else reviews_df
+        finally:
+            if cache is not None:
+                cache.close()
+    store["listings"] = prepare_listings(store["raw_listings"])
+
+
+def stage_score(store: ArtifactStore, config: PipelineConfig) -> None:
+    from .aggregate import word_counts
+    from .memory import compact_reviews
+    from .score import score_reviews
+
+    cache = open_cache(config)
+    try:
+        if config.stream_chunksize is None:
+            scored_reviews = score_reviews(
+                store["reviews"],
+                n_jobs=config.n_jobs,
+                chunksize=config.score_chunksize,
+                cache=cache,
+                backend=config.score_backend,
+                dedup=config.dedup,
+            )
+            # Word counts are the only later use of `clean_text`
+            store["word_counts"] = word_counts(scored_reviews)
+            if config.compact or config.drop_clean_text:
+                scored_reviews = compact_reviews(scored_reviews, config.drop_clean_text)
+            store["scored_reviews"] = scored_reviews
+        else:
+            from .drift import DriftDetector
+            from .stream import stream_sentiment_state
+            from .timecube import SentimentCube
+
+            state = previous_state(store, config)
+            if state is not None and not trends_match(store, state):
+                # Older reviews are skipped before scoring, so trends that don't match
+                # the state can't be caught up; rescan every review instead
+                state = None
+            counts = store["word_counts"] if state is not None and "word_counts" in store else {}
+            cube = store["sentiment_cube"] if state is not None else SentimentCube()
+            detector = store["drift_detector"] if state is not None else DriftDetector()
+            state = stream_sentiment_state(
+                [resolve_source(config, snapshot, "reviews") for snapshot in data_sources(config)],
+                config.stream_chunksize,
+                partials_dir=config.workdir / "partials",
+                n_jobs=config.n_jobs,
+                score_chunksize=config.score_chunksize,
+                cache=cache,
+                state=state,
+                word_counts=counts,
+                cube=cube,
+                detector=detector,
+                backend=config.score_backend,
+                dedup=config.dedup,
+            )
+            store["word_counts"] = counts
+            store["sentiment_cube"] = cube
+            store["drift_detector"] = detector
+            store["sentiment_state"] = state
+            store["trend_watermark"] = trend_watermark(state)
+            store["listing_sentiment"] = state.listing_sentiment()
+    finally:
+        if cache is not None:
+            cache.close()
+
+
+def previous_state(store: ArtifactStore, config: PipelineConfig):
+    """The stored `SentimentState` to fold new reviews into, if running incrementally."""
+    if config.incremental and "sentiment_state" in store:
+        return store["sentiment_state"]
+    return None
+
+
+def trend_watermark(state) -> tuple:
+    """Where `state` stands: its watermark and number of reviews folded in."""
+    return state.watermark, state.rows_seen
+
+
+def trends_match(store: ArtifactStore, state) -> bool:
+    """Whether the stored cube and drift detector were last updated alongside `state`.
+
+    Both are written with `trend_watermark`; a missing or different one means
+    they come from another run and would double-count or miss reviews.
+    """
+    return (
+        "sentiment_cube" in store
+        and "drift_detector" in store
+        and "trend_watermark" in store
+        and store["trend_watermark"] == trend_watermark(state)
+    )
+
+
+def stage_aggregate(store: ArtifactStore, config: PipelineConfig) -> None:
+    from .aggregate import summarize_from_sentiment
+    from .drift import DriftDetector
+    from .incremental import SentimentState
+    from .timecube import SentimentCube
+
+    ri_df = store["listings"]
+    if config.stream_chunksize is None:
+        scored_reviews = store["scored_reviews"]
+        state = previous_state(store, config)
+        if state is not None and trends_match(store, state):
+            # Only reviews past the previous watermark are new to the cube and detector
+            new_reviews = state.unseen(scored_reviews)
+            cube, detector = store["sentiment_cube"], store["drift_detector"]
+        else:
+            new_reviews = scored_reviews
+            cube, detector = SentimentCube(), DriftDetector()
+        store["sentiment_cube"] = cube.update(new_reviews)
+        store["drift_detector"] = detector.update(new_reviews)
+        # Full runs write a fresh state too, so a later incremental run never folds
+        # into one left behind by an earlier run; both paths share its exact-sum means
+        if state is not None:
+            state = state.fold(scored_reviews)
+        else:
+            state = SentimentState.from_reviews(scored_reviews)
+        store["sentiment_state"] = state
+        store["trend_watermark"] = trend_watermark(state)
+        store["listing_sentiment"] = state.listing_sentiment(ri_df["listing_id"])
+    store["summary"] = summarize_from_sentiment(ri_df, store["listing_sentiment"])
+    alerts = store["drift_detector"].alerts(n=None)
+    print(f"drift: {len(alerts)} listings with a recent sentiment drop"
+          f" ({store['drift_detector'].late} late reviews skipped)")
+    store["drift_alerts"] = alerts
+
+
+def stage_index(store: ArtifactStore, config: PipelineConfig) -> None:
+    from .termindex import build_term_index
+
+    scored_reviews = None if config.stream_chunksize is not None else store["scored_reviews"]
+    if scored_reviews is None or "clean_text" not in scored_reviews.columns:
+        print("term index needs review-level clean_text (not kept with --stream/--drop-clean-text)")
+        return
+    index = build_term_index(scored_reviews, store["listings"])
+    print(f"term index: {index.matrix.shape[0]} reviews × {index.matrix.shape[1]} terms, "
+          f"{index.matrix.nnz} entries")
+    store["term_index"] = index
+
+
+def stage_spatial(store: ArtifactStore, config: PipelineConfig) -> None:
+    from .spatial import build_spatial_index
+
+    index = build_spatial_index(store["listings"], store["summary"])
+    store["spatial_index"] = index
+    start = time.perf_counter()
+    neighbourhoods = index.neighbourhoods(radius_km=config.neighbour_radius_km)
+    elapsed = time.perf_counter() - start
+    print(f"spatial index: {len(index)} listings, neighbourhoods within "
+          f"{config.neighbour_radius_km:g} km in {elapsed:.2f}s")
+    store["neighbourhoods"] = neighbourhoods
+
+
+def stage_features(store: ArtifactStore, config: PipelineConfig) -> None:
+    from .spatial import neighbour_features
+
+    start = time.perf_counter()
+    features = neighbour_features(store["spatial_index"], config.neighbour_k)
+    elapsed = time.perf_counter() - start
+    print(f"neighbour features: {len(features)} listings from {config.neighbour_k} nearest "
+          f"neighbours in {elapsed:.2f}s")
+    store["neighbour_features"] = features
+
+
+def stage_merge(store: ArtifactStore, config: PipelineConfig) -> None:
+    from .merge import build_model_df
+
+    neighbour_features = store["neighbour_features"] if "neighbour_features" in store else None
+    store["model_df"] = build_model_df(store["listings"], store["summary"], neighbour_features)
+
+
+def stage_model(store: ArtifactStore, config: PipelineConfig) -> None:
+    from .model import search_forecaster, train_forecaster
+    from .predict import model_artifact
+
+    numeric_features = model_features(config, store["model_df"])
+    if config.model_search:
+        result = search_forecaster(
+            store["model_df"],
+            n_iter=config.search_iter,
+            cv=config.cv_folds,
+            n_jobs=config.model_n_jobs,
+            cache_dir=config.workdir / "model_cache",
+            backend=config.model_backend,
+            numeric_features=numeric_features,
+        )
+        print(f"Searched {result['candidates']} configurations × {config.cv_folds} folds "
+              f"in {result['wall_time']:.2f}s")
+        print(result["cv_folds"].round(3).to_string(index=False))
+        print("Best configuration:", result["best_params"])
+    else:
+        result = train_forecaster(
+            store["model_df"],
+            n_jobs=config.model_n_jobs,
+            backend=config.model_backend,
+            numeric_features=numeric_features,
+        )
+    print("Test MAE:", round(result["mae"], 2))
+    print("Test R²:", round(result["r2"], 3))
+    store["model"] = result
+    store["forecaster"] = model_artifact(result, config.model_backend, training_snapshot(config, store))
+
+
+def model_features(config: PipelineConfig, model_df) -> list:
+    """Numeric forecaster features: `NUMERIC_FEATURES`, plus the neighbour features
+    with `neighbour_features` when `model_df` has them."""
+    from .config import NEIGHBOUR_FEATURES, NUMERIC_FEATURES
+
+    if not config.neighbour_features:
+        return list(NUMERIC_FEATURES)
+    missing = [name for name in NEIGHBOUR_FEATURES if name not in model_df.columns]
+    if missing:
+        print(f"neighbour features not in model_df ({', '.join(missing)}); run the features "
+              f"and merge stages first")
+    return list(NUMERIC_FEATURES) + [name for name in NEIGHBOUR_FEATURES if name in model_df.columns]
+
+
+def training_snapshot(config: PipelineConfig, store: ArtifactStore) -> dict:
+    """What the model was trained on: source snapshots, listing count and latest review date."""
+    sources = [
+        {"region": s.region, "date": s.date, **{name: str(f.path) for name, f in s.files.items()}}
+        for s in data_sources(config)
+    ]
+    latest = None
+    if config.stream_chunksize is None and "scored_reviews" in store:
+        latest = store["scored_reviews"]["date"].max()
+    elif (config.stream_chunksize is not None or config.incremental) and "sentiment_state" in store:
+        # Only this run's own streaming or incremental state is known to be current
+        latest = store["sentiment_state"].watermark
+    return {
+        "sources": sources,
+        "listings": len(store["model_df"]),
+        "latest_review": None if latest is None else str(latest.date()),
+    }
+
+
+def stage_dashboard(store: ArtifactStore, config: PipelineConfig) -> None:
+    from .dashboard import build_dashboard
+
+    cube = store["sentiment_cube"] if "sentiment_cube" in store else None
+    alerts = store["drift_alerts"] if "drift_alerts" in store else None
+    dashboard = build_dashboard(store["listings"], store["listing_sentiment"], cube, alerts)
+    print(f"dashboard: {len(dashboard.segments)} segments, {len(dashboard.listings)} listings")
+    store["dashboard"] = dashboard
+
+
+def stage_render(store: ArtifactStore, config: PipelineConfig) -> None:
+    from collections import Counter
+
+    from . import render
+    from .aggregate import segment_counts
+
+    out = config.figures_dir
+    summary_df = store["summary"]
+    render.plot_sentiment_price_ranges(summary_df, out / "sentiment_price_ranges.png")
+    render.plot_score_by_price_range(summary_df, out / "score_by_price_range.png")
+    render.plot_listing_scores(summary_df, out / "vader_per_listing.png")
+    render.plot_listing_map(summary_df, out / "listing_map.png")
+    if "model" in store:
+        result = store["model"]
+        render.plot_predicted_vs_actual(
+            result["y_test"], result["y_pred"], out / "predicted_vs_actual.png"
+        )
+
+    ri_df = store["listings"]
+    sentiment = store["listing_sentiment"]
+    render.plot_segment_sentiment(
+        segment_counts(ri_df, sentiment, "host_is_superhost"),
+        "host_is_superhost",
+        "Sentiment Distribution by Superhost Status",
+        out / "sentiment_by_superhost.png",
+    )
+    render.plot_segment_sentiment(
+        segment_counts(ri_df, sentiment, "room_type"),
+        "room_type",
+        "Sentiment Distribution by Room Type",
+        out / "sentiment_by_room_type.png",
+    )
+
+    word_counts = store["word_counts"]
+    all_words = Counter()
+    for counts in word_counts.values():
+        all_words.update(counts)
+    render.plot_wordcloud(all_words, out / "wordcloud.png")
+    render.plot_top_words(
+        word_counts.get("Positive", Counter()),
+        word_counts.get("Negative", Counter()),
+        out / "positive_negative_words.png",
+    )
+
+    if "sentiment_cube" in store:
+        render.plot_sentiment_over_time(store["sentiment_cube"], out / "sentiment_over_time.png")
+
+    # Review-level figures are unavailable when reviews were streamed
+    if config.stream_chunksize is not None:
+        return
+    render.plot_sentiment_distribution(store["scored_reviews"], out / "sentiment_distribution.png")
+
+
+STAGES: Dict[str, Callable[[ArtifactStore, PipelineConfig], None]] = {
+    "convert": stage_convert,
+    "load": stage_load,
+    "clean": stage_clean,
+    "score": stage_score,
+    "aggregate": stage_aggregate,
+    "index": stage_index,
+    "spatial": stage_spatial,
+    "features": stage_features,
+    "merge": stage_merge,
+    "model": stage_model,
+    "dashboard": stage_dashboard,
+    "render": stage_render,
+}
+
+
+def run(
+    stages: Optional[Iterable[str]] = None,
+    config: Optional[PipelineConfig] = None,
+    store: Optional[ArtifactStore] = None,
+) -> ArtifactStore:
+    """Run the given stages (all by default) in pipeline order and return the store."""
+    config = config or PipelineConfig()
+    store = store or ArtifactStore(config.workdir)
+    selected = list(STAGES) if stages is None else list(stages)
+
+    unknown = [s for s in selected if s not in STAGES]
+    if unknown:
+        raise ValueError(f"Unknown stage(s): {', '.join(unknown)}; choose from {', '.join(STAGES)}")
+
+    for name in STAGES:
+        if name not in selected:
+            continue
+        start = time.perf_counter()
+        written = len(store.written)
+        STAGES[name](store, config)
+        print(f"[{name}] done in {time.perf_counter() - start:.2f}s")
+        if config.memory_report:
+            from .memory import memory_report
+
+            outputs = {n: store[n] for n in dict.fromkeys(store.written[written:])}
+            report = memory_report(outputs)
+            if not report.empty:
+                print(report.to_string(index=False))
+    return store
@@ -0,0 +1,198 @@
+"""Persisted rating forecaster and prediction API.
+
+The model stage stores a `forecaster` artifact: the fitted pipeline plus
+versioned metadata (backend, feature lists, training snapshot, metrics).
+`Forecaster` loads it once and scores a batch DataFrame through the pipeline,
+or a single listing dict through a fast path that encodes the row with plain
+lookups instead of building a one-row DataFrame:
+
+    forecaster = load_forecaster("artifacts/forecaster.pkl")
+    forecaster.predict({"log_price": 5.1, "room_type": "Entire home/apt", ...})
+    forecaster.predict(listings_df)
+"""
+
+import math
+import pickle
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Mapping, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from .config import CATEGORICAL_FEATURES, NUMERIC_FEATURES, TARGET
+
+# Bumped whenever the artifact layout changes; older readers refuse newer files
+FORMAT_VERSION = 1
+
+
+def model_artifact(result: dict, backend: str, snapshot: dict) -> dict:
+    """Artifact for a trained `result` from `train_forecaster`/`search_forecaster`."""
+    import sklearn
+
+    metrics = {"test_mae": float(result["mae"]), "test_r2": float(result["r2"])}
+    if "cv_folds" in result:
+        metrics["cv_mae"] = float(result["cv_folds"]["mae"].mean())
+        metrics["cv_r2"] = float(result["cv_folds"]["r2"].mean())
+    metadata = {
+        "format_version": FORMAT_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "sklearn_version": sklearn.__version__,
+        "backend": backend,
+        "target": TARGET,
+        "numeric_features": list(result.get("numeric_features", NUMERIC_FEATURES)),
+        "categorical_features": list(CATEGORICAL_FEATURES),
+        "snapshot": snapshot,
+        "n_test": len(result["y_test"]),
+        "metrics": metrics,
+        "params": result.get("best_params", {}),
+    }
+    return {"metadata": metadata, "pipeline": result["pipeline"]}
+
+
+class Forecaster:
+    """A loaded forecaster artifact: `predict` takes a listing dict or a DataFrame."""
+
+    def __init__(self, artifact: dict):
+        metadata = artifact["metadata"]
+        if metadata.get("format_version", 0) > FORMAT_VERSION:
+            raise ValueError(
+                f"Forecaster format {metadata['format_version']} is newer than supported "
+                f"({FORMAT_VERSION}); upgrade sentiment_pricing"
+            )
+        self.metadata = metadata
+        self.pipeline = artifact["pipeline"]
+        self.numeric_features = metadata["numeric_features"]
+        self.categorical_features = metadata["categorical_features"]
+        self._row_encoder = _RowEncoder(self.pipeline.named_steps["preprocessor"],
+                                        self.numeric_features, self.categorical_features)
+        model = self.pipeline.named_steps["model"]
+        # Forests average their trees directly, skipping the per-call thread pool and checks
+        self._trees = [tree.tree_ for tree in model.estimators_] if hasattr(model, "estimators_") else None
+        self._model = model
+
+    @property
+    def features(self) -> list:
+        return self.numeric_features + self.categorical_features
+
+    def categories(self) -> dict:
+        """Known values of each categorical feature, as seen in training."""
+        return {column: list(lookup) for column, lookup, _, _ in self._row_encoder.columns}
+
+    def predict(self, listings: Union[Mapping, pd.DataFrame]) -> Union[float, np.ndarray]:
+        """Predicted rating for one listing (a mapping) or each row of a DataFrame."""
+        if isinstance(listings, Mapping):
+            return self.predict_one(listings)
+        return self.pipeline.predict(listings[self.features])
+
+    def predict_one(self, listing: Mapping) -> float:
+        """Fast path for a single listing; missing keys count as missing values."""
+        row = self._row_encoder.encode(listing)
+        if self._trees is None:
+            return float(self._model.predict(row)[0])
+        # Same float32 input and summation order as RandomForestRegressor.predict
+        row = row.astype(np.float32)
+        total = np.zeros(1)
+        for tree in self._trees:
+            total += tree.predict(row)[:, 0]
+        return float(total[0] / len(self._trees))
+
+
+class _RowEncoder:
+    """The fitted preprocessor as per-column lookups for a single row.
+
+    Numeric columns are median-imputed (forest) or passed through (gradient
+    boosting). Categorical encoders work column by column into disjoint output
+    columns, so a row's encoding is the encoding of a reference row plus, for
+    each column, the change its value makes; those changes are precomputed for
+    every known category, for unknown values and for missing values.
+    """
+
+    def __init__(self, preprocessor, numeric_features: list, categorical_features: list):
+        transformers = {name: transformer for name, transformer, _ in preprocessor.transformers_}
+        numeric = transformers["num"]
+        self.fill = getattr(_last_step(numeric), "statistics_", None)
+        self.numeric_features = numeric_features
+
+        categorical = transformers["cat"]
+        known = [list(c) for c in _last_step(categorical).categories_]
+        reference = pd.DataFrame({c: [known[i][0]] for i, c in enumerate(categorical_features)}, dtype=object)
+        self.reference = _dense(categorical.transform(reference))[0]
+        self.columns = []
+        for i, column in enumerate(categorical_features):
+            values = known[i] + ["\0unknown", np.nan]
+            frame = reference.loc[[0] * len(values)].reset_index(drop=True)
+            frame[column] = pd.Series(values, dtype=object)
+            deltas = _dense(categorical.transform(frame)) - self.reference
+            lookup = {value: deltas[k] for k, value in enumerate(known[i])}
+            self.columns.append((column, lookup, deltas[-2], deltas[-1]))
+        self.width = len(numeric_features) + len(self.reference)
+
+    def encode(self, listing: Mapping) -> np.ndarray:
+        row = np.empty((1, self.width), dtype=np.float64)
+        for i, column in enumerate(self.numeric_features):
+            value = listing.get(column)
+            value = math.nan if value is None else float(value)
+            if value != value and self.fill is not None:
+                value = self.fill[i]
+            row[0, i] = value
+        # NaN deltas (unknown/missing with ordinal encoding) make the output NaN, as intended
+        encoded = self.reference.copy()
+        for column, lookup, unknown, missing in self.columns:
+            value = listing.get(column)
+            if value is None or value != value:
+                encoded += missing
+            else:
+                encoded += lookup.get(value, unknown)
+        row[0, len(self.numeric_features):] = encoded
+        return row
+
+
+def _last_step(transformer):
+    """The final estimator of a Pipeline, or the transformer itself."""
+    from sklearn.pipeline import Pipeline
+
+    return transformer.steps[-1][1] if isinstance(transformer, Pipeline) else transformer
+
+
+def _dense(values) -> np.ndarray:
+    return np.asarray(values.toarray() if hasattr(values, "toarray") else values, dtype=np.float64)
+
+
+def load_forecaster(path: Union[str, Path]) -> Forecaster:
+    with open(path, "rb") as f:
+        return Forecaster(pickle.load(f))
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """`python -m sentiment_pricing.predict`: predictions for a CSV or JSON listings file."""
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(prog="sentiment_pricing.predict")
+    parser.add_argument("listings", help="CSV file, or JSON file with one listing object or a list")
+    parser.add_argument("--workdir", default="artifacts", help="Run with a 'forecaster' artifact")
+    args = parser.parse_args(argv)
+
+    forecaster = load_forecaster(Path(args.workdir) / "forecaster.pkl")
+    meta = forecaster.metadata
+    print(f"{meta['backend']} forecaster trained {meta['created_at']}, "
+          f"test MAE {meta['metrics']['test_mae']:.3f}")
+    start = time.perf_counter()
+    if args.listings.endswith(".json"):
+        with open(args.listings) as f:
+            listings = json.load(f)
+        listings = [listings] if isinstance(listings, dict) else listings
+        predictions = [forecaster.predict(listing) for listing in listings]
+    else:
+        predictions = forecaster.predict(pd.read_csv(args.listings))
+    elapsed = time.perf_counter() - start
+    for value in predictions:
+        print(round(float(value), 3))
+    print(f"{len(predictions)} predictions in {elapsed * 1000:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,206 @@
+"""Registry of local InsideAirbnb snapshots.
+
+A JSON file maps each region and snapshot date to local `listings` / `reviews`
+files and their SHA-256 hashes, so the pipeline can run fully offline against any
+set of downloaded snapshots:
+
+    {
+      "snapshots": [
+        {
+          "region": "rhode-island",
+          "date": "2025-06-28",
+          "listings": {"path": "listings.csv.gz", "sha256": "992e5b74..."},
+          "reviews": {"path": "data/rhode-island/2025-06-28/reviews.csv.gz", "sha256": null}
+        }
+      ]
+    }
+
+Relative paths are resolved against the registry file's directory. Snapshots are
+referred to as `region@date`, or just `region` for its latest date.
+"""
+
+import gzip
+import hashlib
+import json
+import mmap
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Sequence
+
+TABLE_NAMES = ("listings", "reviews")
+
+
+@dataclass
+class SnapshotFile:
+    path: Path
+    sha256: Optional[str] = None
+
+
+@dataclass
+class Snapshot:
+    region: str
+    date: str
+    files: Dict[str, SnapshotFile] = field(default_factory=dict)
+
+    @property
+    def key(self) -> str:
+        return f"{self.region}@{self.date}"
+
+
+def sha256_file(path: Path) -> str:
+    """SHA-256 of a file, read through a memory map."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        if Path(path).stat().st_size == 0:
+            return digest.hexdigest()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for start in range(0, len(mm), 1 << 24):
+                digest.update(mm[start : start + (1 << 24)])
+    return digest.hexdigest()
+
+
+def verify_file(snapshot_file: SnapshotFile) -> None:
+    """Raise if the file is missing or its hash differs from the registered one."""
+    path = Path(snapshot_file.path)
+    if not path.exists():
+        raise FileNotFoundError(f"Snapshot file not found: {path}")
+    if snapshot_file.sha256 is not None:
+        actual = sha256_file(path)
+        if actual != snapshot_file.sha256:
+            raise ValueError(
+                f"Hash mismatch for {path}: expected {snapshot_file.sha256}, got {actual}"
+            )
+
+
+@contextmanager
+def open_mapped(path: Path) -> Iterator:
+    """Binary stream over a memory-mapped local file, decompressed if it is gzipped."""
+    with open(path, "rb") as f:
+        if not str(path).endswith(".gz") or Path(path).stat().st_size == 0:
+            yield f
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with gzip.GzipFile(fileobj=mm) as stream:
+                yield stream
+
+
+class SnapshotRegistry:
+    """Region/date → local file lookup backed by a JSON file."""
+
+    def __init__(self, path: Path, snapshots: Optional[List[Snapshot]] = None):
+        self.path = Path(path)
+        self.snapshots: List[Snapshot] = snapshots or []
+
+    @classmethod
+    def load(cls, path: Path) -> "SnapshotRegistry":
+        path = Path(path)
+        if not path.exists():
+            return cls(path)
+        with open(path) as f:
+            raw = json.load(f)
+        base = path.parent
+        snapshots = []
+        for entry in raw.get("snapshots", []):
+            files = {}
+            for name in TABLE_NAMES:
+                if name in entry:
+                    files[name] = SnapshotFile(base / entry[name]["path"], entry[name].get("sha256"))
+            snapshots.append(Snapshot(entry["region"], entry["date"], files))
+        return cls(path, snapshots)
+
+    def save(self) -> None:
+        base = self.path.parent.resolve()
+        entries = []
+        for snapshot in sorted(self.snapshots, key=lambda s: (s.region, s.date)):
+            entry = {"region": snapshot.region, "date": snapshot.date}
+            for name, snapshot_file in snapshot.files.items():
+                file_path = Path(snapshot_file.path).resolve()
+                try:
+                    file_path = file_path.relative_to(base)
+                except ValueError:
+                    pass
+                entry[name] = {"path": file_path.as_posix(), "sha256": snapshot_file.sha256}
+            entries.append(entry)
+        with open(self.path, "w") as f:
+            json.dump({"snapshots": entries}, f, indent=2)
+            f.write("\n")
+
+    def get(self, key: str) -> Snapshot:
+        """Snapshot for `region@date`, or the latest snapshot of `region`."""
+        region, _, date = key.partition("@")
+        matches = [s for s in self.snapshots if s.region == region and (not date or s.date == date)]
+        if not matches:
+            raise KeyError(f"No snapshot '{key}' in {self.path}")
+        return max(matches, key=lambda s: s.date)
+
+    def register(self, region: str, date: str, hash_files: bool = True, **paths: str) -> Snapshot:
+        """Add or replace a snapshot, e.g. `register("rhode-island", "2025-06-28", listings=...)`."""
+        unknown = set(paths) - set(TABLE_NAMES)
+        if unknown:
+            raise ValueError(f"Unknown table(s): {', '.join(sorted(unknown))}")
+        files = {
+            name: SnapshotFile(Path(p), sha256_file(Path(p)) if hash_files else None)
+            for name, p in paths.items()
+        }
+        self.snapshots = [s for s in self.snapshots if (s.region, s.date) != (region, date)]
+        snapshot = Snapshot(region, date, files)
+        self.snapshots.append(snapshot)
+        return snapshot
+
+
+def load_snapshots(
+    snapshots: Sequence[Snapshot],
+    loader: Callable[[Snapshot], object],
+    max_workers: Optional[int] = None,
+) -> Dict[str, object]:
+    """Run `loader` for several snapshots concurrently; results keyed by `region@date`.
+
+    Loading is dominated by file I/O, decompression and pandas' C parser, which
+    release the GIL, so a thread pool overlaps them without copying the frames.
+    """
+    if len(snapshots) <= 1:
+        return {s.key: loader(s) for s in snapshots}
+    with ThreadPoolExecutor(max_workers=max_workers or len(snapshots)) as pool:
+        results = pool.map(loader, snapshots)
+        return {s.key: result for s, result in zip(snapshots, results)}
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """`python -m sentiment_pricing.registry {list,register,verify}`."""
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="sentiment_pricing.registry")
+    parser.add_argument("--registry", default="snapshots.json")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="Show registered snapshots")
+    register = sub.add_parser("register", help="Add a snapshot and record its file hashes")
+    register.add_argument("region")
+    register.add_argument("date")
+    for name in TABLE_NAMES:
+        register.add_argument(f"--{name}", help=f"Local path of {name}.csv.gz")
+    verify = sub.add_parser("verify", help="Check a snapshot's files against their hashes")
+    verify.add_argument("key", metavar="REGION[@DATE]")
+    args = parser.parse_args(argv)
+
+    registry = SnapshotRegistry.load(args.registry)
+    if args.command == "list":
+        for snapshot in registry.snapshots:
+            files = ", ".join(f"{name}={f.path}" for name, f in snapshot.files.items())
+            print(f"{snapshot.key}: {files}")
+    elif args.command == "register":
+        paths = {name: getattr(args, name) for name in TABLE_NAMES if getattr(args, name)}
+        snapshot = registry.register(args.region, args.date, **paths)
+        registry.save()
+        print(f"Registered {snapshot.key}")
+    elif args.command == "verify":
+        snapshot = registry.get(args.key)
+        for snapshot_file in snapshot.files.values():
+            verify_file(snapshot_file)
+        print(f"{snapshot.key}: OK")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
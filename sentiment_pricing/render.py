@@ -0,0 +1,191 @@
+"""Render stage: write the report figures as PNG files."""
+
+from collections import Counter
+from pathlib import Path
+from typing import TYPE_CHECKING, Mapping
+
+import numpy as np
+import pandas as pd
+
+from .chartdata import MAP_GRIDSIZE, MAX_SERIES_POINTS, RANKED_LISTINGS, downsample, hex_bins, rank_summary
+from .config import SENTIMENT_LABELS
+
+if TYPE_CHECKING:
+    from .timecube import SentimentCube
+
+
+def _pyplot():
+    """Headless matplotlib/seaborn with the project's plot aesthetics."""
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    sns.set(style="whitegrid")
+    plt.rcParams["figure.dpi"] = 120
+    return plt, sns
+
+
+def _save(plt, path: Path) -> Path:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    plt.tight_layout()
+    plt.savefig(path)
+    plt.close("all")
+    return path
+
+
+def plot_sentiment_distribution(reviews_df: pd.DataFrame, path: Path) -> Path:
+    plt, sns = _pyplot()
+    plt.figure(figsize=(6, 4))
+    sns.countplot(
+        data=reviews_df,
+        x="sentiment",
+        hue="sentiment",
+        order=SENTIMENT_LABELS,
+        palette="Set2",
+        legend=False,
+    )
+    plt.title("Sentiment Distribution of Rhode Island Airbnb Reviews")
+    plt.xlabel("Sentiment")
+    plt.ylabel("Number of Reviews")
+    return _save(plt, path)
+
+
+def plot_sentiment_over_time(cube: "SentimentCube", path: Path, halflife: float = 14,
+                             max_points: int = MAX_SERIES_POINTS) -> Path:
+    """Daily mean score (faint) under its review-weighted EWMA, both read from the cube
+    and downsampled to `max_points` each."""
+    plt, sns = _pyplot()
+    daily = downsample(cube.series("D"), max_points, column="avg_vader_score")
+    trend = downsample(cube.ewma("D", halflife=halflife), max_points, column="avg_vader_score")
+    plt.figure(figsize=(10, 4))
+    plt.plot(daily.index, daily["avg_vader_score"], color="green", alpha=0.2, linewidth=0.8,
+             label="Daily mean")
+    plt.plot(trend.index, trend["avg_vader_score"], color="green",
+             label=f"EWMA (half-life {halflife:g} days)")
+    plt.title("Average Sentiment Score Over Time")
+    plt.xlabel("Date")
+    plt.ylabel("Average VADER Compound Score")
+    plt.legend()
+    return _save(plt, path)
+
+
+def plot_top_words(pos_freq: Counter, neg_freq: Counter, path: Path, n: int = 10) -> Path:
+    plt, sns = _pyplot()
+    fig, ax = plt.subplots(1, 2, figsize=(12, 4))
+    for axis, freq, title, color in [
+        (ax[0], pos_freq, "Top Positive Words", "seagreen"),
+        (ax[1], neg_freq, "Top Negative Words", "indianred"),
+    ]:
+        top = pd.DataFrame(freq.most_common(n), columns=["Word", "Frequency"])
+        sns.barplot(data=top, x="Frequency", y="Word", color=color, ax=axis)
+        axis.set_title(title)
+    return _save(plt, path)
+
+
+def plot_wordcloud(frequencies: Mapping[str, int], path: Path) -> Path:
+    from wordcloud import WordCloud
+
+    plt, _ = _pyplot()
+    wordcloud = WordCloud(
+        width=1000, height=600, background_color="white", max_words=100, colormap="viridis"
+    ).generate_from_frequencies(frequencies)
+    plt.figure(figsize=(10, 6))
+    plt.imshow(wordcloud, interpolation="bilinear")
+    plt.axis("off")
+    plt.title("Top Words in Rhode Island Airbnb Reviews")
+    return _save(plt, path)
+
+
+def plot_sentiment_price_ranges(summary_df: pd.DataFrame, path: Path) -> Path:
+    plt, sns = _pyplot()
+    plt.figure(figsize=(8, 6))
+    sns.countplot(
+        data=summary_df, x="price_range", hue="most_common_sentiment", palette="Set2"
+    )
+    plt.title("Sentiment Distribution Across Price Ranges")
+    plt.xlabel("Price Range")
+    plt.ylabel("Number of Listings")
+    plt.xticks(rotation=45)
+    return _save(plt, path)
+
+
+def plot_score_by_price_range(summary_df: pd.DataFrame, path: Path) -> Path:
+    plt, sns = _pyplot()
+    plt.figure(figsize=(10, 6))
+    sns.boxplot(
+        data=summary_df,
+        x="price_range",
+        y="avg_vader_score",
+        hue="price_range",
+        palette="viridis",
+        legend=False,
+    )
+    plt.title("Sentiment Score Distribution Across Price Ranges")
+    plt.xlabel("Price Range")
+    plt.ylabel("VADER Sentiment Score")
+    plt.xticks(rotation=45)
+    return _save(plt, path)
+
+
+def plot_listing_scores(summary_df: pd.DataFrame, path: Path, n: int = RANKED_LISTINGS) -> Path:
+    """Lollipops for the `n` highest- and lowest-scoring listings, over the quantiles of all listings."""
+    plt, _ = _pyplot()
+    ranking = rank_summary(summary_df, "avg_vader_score", n)
+    df_sorted = pd.concat([ranking["top"], ranking["bottom"]])
+    rows = range(len(df_sorted))[::-1]
+    plt.figure(figsize=(10, 8))
+    for level, value in ranking["quantiles"].items():
+        plt.axvline(value, color="steelblue", linestyle=":" if level != 0.5 else "--", linewidth=1)
+        plt.text(value, len(df_sorted) - 0.4, f"p{level * 100:g}", color="steelblue",
+                 ha="center", va="bottom", fontsize=8)
+    plt.hlines(y=rows, xmin=0, xmax=df_sorted["avg_vader_score"], color="gray")
+    plt.scatter(df_sorted["avg_vader_score"], rows, color="darkgreen", s=40)
+    if len(ranking["bottom"]):
+        plt.axhline(len(ranking["bottom"]) - 0.5, color="lightgray", linewidth=1)
+    plt.yticks(list(rows), df_sorted["listing_id"].astype(str), fontsize=7)
+    plt.title(f"Average VADER Score per Listing (top and bottom {n} of {ranking['count']:,})")
+    plt.xlabel("Average VADER Score")
+    plt.ylabel("Listing ID")
+    return _save(plt, path)
+
+
+def plot_listing_map(summary_df: pd.DataFrame, path: Path, gridsize: int = MAP_GRIDSIZE) -> Path:
+    """Listings binned into hexagons: marker area by listing count, colour by mean score."""
+    plt, _ = _pyplot()
+    bins = hex_bins(summary_df, ["avg_vader_score"], gridsize)
+    plt.figure(figsize=(8, 8))
+    points = plt.scatter(
+        bins["longitude"], bins["latitude"], s=20 + 180 * bins["count"] / max(bins["count"].max(), 1),
+        c=bins["avg_vader_score"], cmap="RdYlGn", marker="h", edgecolors="none",
+    )
+    plt.colorbar(points, label="Mean listing VADER score", shrink=0.7)
+    plt.gca().set_aspect(1 / np.cos(np.radians(bins["latitude"].mean())) if len(bins) else "auto")
+    plt.title(f"Listings by Location ({len(summary_df):,} listings in {len(bins)} cells)")
+    plt.xlabel("Longitude")
+    plt.ylabel("Latitude")
+    return _save(plt, path)
+
+
+def plot_segment_sentiment(counts: pd.DataFrame, segment: str, title: str, path: Path) -> Path:
+    plt, sns = _pyplot()
+    plt.figure(figsize=(8, 5))
+    sns.barplot(data=counts, x=segment, y="count", hue="sentiment", palette="Set2")
+    plt.title(title)
+    plt.ylabel("Number of Reviews")
+    plt.xticks(rotation=15)
+    return _save(plt, path)
+
+
+def plot_predicted_vs_actual(y_test, y_pred, path: Path) -> Path:
+    plt, _ = _pyplot()
+    plt.figure(figsize=(6, 6))
+    plt.scatter(y_test, y_pred, alpha=0.5, color="steelblue")
+    lo, hi = min(y_test.min(), y_pred.min()), max(y_test.max(), y_pred.max())
+    plt.plot([lo, hi], [lo, hi], color="gray", linestyle="--")
+    plt.title("Predicted vs Actual Ratings (Test Set)")
+    plt.xlabel("Actual review_scores_rating")
+    plt.ylabel("Predicted review_scores_rating")
+    return _save(plt, path)
@@ -0,0 +1,169 @@
+"""Score stage: VADER polarity scores per review.
+
+Comments are split into chunks and scored either serially or across a process
+pool; each worker builds its `SentimentIntensityAnalyzer` once. Both paths run the
+same per-chunk function, so their output is bit-identical. The per-chunk function
+is the reference analyzer or the vectorized reimplementation in `vader`.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .config import NEGATIVE_THRESHOLD, POSITIVE_THRESHOLD
+
+if TYPE_CHECKING:
+    from .cache import ReviewCache
+
+VADER_FIELDS = ["neg", "neu", "pos", "compound"]
+
+# Output column per VADER field; compound keeps its historical `vader_score` name
+SCORE_COLUMNS = {
+    "neg": "vader_neg",
+    "neu": "vader_neu",
+    "pos": "vader_pos",
+    "compound": "vader_score",
+}
+
+DEFAULT_CHUNKSIZE = 5_000
+
+_analyzer = None
+
+
+def _get_analyzer():
+    """Per-process analyzer, built on first use (once per pool worker)."""
+    global _analyzer
+    if _analyzer is None:
+        from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+
+        _analyzer = SentimentIntensityAnalyzer()
+    return _analyzer
+
+
+def _score_chunk(texts: Sequence[str]) -> np.ndarray:
+    """(n, 4) float32 array of neg/neu/pos/compound for one chunk of comments."""
+    analyzer = _get_analyzer()
+    out = np.empty((len(texts), len(VADER_FIELDS)), dtype=np.float32)
+    for i, text in enumerate(texts):
+        scores = analyzer.polarity_scores(str(text))
+        out[i] = [scores[f] for f in VADER_FIELDS]
+    return out
+
+
+def _score_chunk_vectorized(texts: Sequence[str]) -> np.ndarray:
+    from .vader import score_batch
+
+    return score_batch(texts)
+
+
+# Scoring backends: the reference analyzer, or the batched NumPy reimplementation
+# in `vader` (same scores, several times the throughput)
+BACKENDS = {"vader": _score_chunk, "vectorized": _score_chunk_vectorized}
+
+
+def analyzer_version(backend: str = "vader") -> str:
+    """Installed vaderSentiment release (and backend), part of the score cache key."""
+    from importlib.metadata import version
+
+    suffix = "" if backend == "vader" else f"+{backend}"
+    return f"vaderSentiment-{version('vaderSentiment')}{suffix}"
+
+
+def resolve_n_jobs(n_jobs: Optional[int]) -> int:
+    """`None`/1 means serial, -1 means all cores."""
+    if n_jobs is None:
+        return 1
+    if n_jobs < 0:
+        return max(1, (os.cpu_count() or 1) + 1 + n_jobs)
+    return max(1, n_jobs)
+
+
+def score_texts(
+    texts: Sequence[str],
+    n_jobs: Optional[int] = 1,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    backend: str = "vader",
+) -> pd.DataFrame:
+    """Score comments in chunks; returns float32 neg/neu/pos/compound columns."""
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown scoring backend '{backend}'; choose from {', '.join(BACKENDS)}")
+    score_chunk = BACKENDS[backend]
+    texts = list(texts)
+    chunks = [texts[i : i + chunksize] for i in range(0, len(texts), chunksize)]
+    workers = min(resolve_n_jobs(n_jobs), max(1, len(chunks)))
+
+    if workers == 1:
+        parts = [score_chunk(chunk) for chunk in chunks]
+    else:
+        # Only the reference backend needs each worker's VADER analyzer built up front
+        initializer = _get_analyzer if backend == "vader" else None
+        with ProcessPoolExecutor(max_workers=workers, initializer=initializer) as pool:
+            parts = list(pool.map(score_chunk, chunks))
+
+    scores = np.concatenate(parts) if parts else np.empty((0, len(VADER_FIELDS)), np.float32)
+    return pd.DataFrame(scores, columns=VADER_FIELDS)
+
+
+def label_sentiment(score: float) -> str:
+    if score >= POSITIVE_THRESHOLD:
+        return "Positive"
+    elif score <= NEGATIVE_THRESHOLD:
+        return "Negative"
+    else:
+        return "Neutral"
+
+
+def label_sentiments(scores) -> np.ndarray:
+    """Vectorized `label_sentiment` over an array of compound scores."""
+    scores = np.asarray(scores)
+    return np.select(
+        [scores >= POSITIVE_THRESHOLD, scores <= NEGATIVE_THRESHOLD],
+        ["Positive", "Negative"],
+        default="Neutral",
+    ).astype(object)
+
+
+def score_reviews(
+    reviews_df: pd.DataFrame,
+    n_jobs: Optional[int] = 1,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    cache: Optional["ReviewCache"] = None,
+    backend: str = "vader",
+    dedup: bool = True,
+) -> pd.DataFrame:
+    """Add VADER neg/neu/pos, `vader_score` (compound, in [-1, 1]) and its `sentiment` label.
+
+    With a `cache`, only reviews that are new or whose comment changed are scored;
+    with `dedup`, each distinct comment (up to whitespace) is scored once.
+    """
+
+    def score(comments: pd.Series) -> pd.DataFrame:
+        scores = score_texts(comments, n_jobs=n_jobs, chunksize=chunksize, backend=backend)
+        scores.index = comments.index
+        return scores.rename(columns=SCORE_COLUMNS)
+
+    def compute(comments: pd.Series) -> pd.DataFrame:
+        if not dedup:
+            return score(comments)
+        from .dedup import dedup_apply, normalize_comment
+
+        return dedup_apply(comments, score, normalize_comment, name="scores")
+
+    comments = reviews_df["comments"].astype(str)
+    if cache is None:
+        scores = compute(comments)
+    else:
+        from .cache import cached_apply
+
+        scores = cached_apply(
+            cache, "scores", reviews_df["id"], comments, analyzer_version(backend), compute
+        )
+
+    reviews_df = reviews_df.copy()
+    for column in SCORE_COLUMNS.values():
+        reviews_df[column] = scores[column].to_numpy(dtype=np.float32)
+    reviews_df["sentiment"] = label_sentiments(reviews_df["vader_score"])
+    return reviews_df
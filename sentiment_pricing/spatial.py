@@ -0,0 +1,250 @@
+"""Spatial index over listing coordinates for radius and nearest-neighbour queries.
+
+The spatial stage builds a k-d tree over every listing's position on the unit
+sphere, alongside the listing's price and its listing-level sentiment from
+`summary_df`. Straight-line (chord) distance between points on the sphere
+grows with great-circle distance, so radius and nearest-neighbour results are
+exactly the haversine ones while the tree works with plain Euclidean distance.
+Point queries return neighbours with their distance, or a summary of them,
+without touching the listings table:
+
+    index.summarize(41.82, -71.41, radius_km=1)   # sentiment and price within 1 km
+    index.neighbours(41.82, -71.41, k=20)          # 20 nearest listings
+
+`neighbourhoods` answers the same question for every listing at once, with
+vectorized tree queries over blocks of listings:
+
+    python -m sentiment_pricing.spatial --lat 41.82 --lon -71.41 --radius-km 1
+"""
+
+import time
+import warnings
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+EARTH_RADIUS_KM = 6371.0088
+# Listing columns kept next to the tree
+INDEX_COLUMNS = ["listing_id", "latitude", "longitude", "price", "log_price",
+                 "avg_vader_score", "most_common_sentiment"]
+NEIGHBOURHOOD_COLUMNS = ["n_neighbours", "radius_km", "density_km2", "avg_vader_score",
+                         "negative_share", "median_price", "median_log_price"]
+# Listings per block in `neighbourhoods`; bounds the (listing, neighbour) pairs held at once
+BLOCK_SIZE = 10_000
+
+
+def unit_vectors(lat, lon) -> np.ndarray:
+    """Points on the unit sphere for latitudes/longitudes in degrees, shape (n, 3)."""
+    lat = np.radians(np.asarray(lat, dtype=np.float64))
+    lon = np.radians(np.asarray(lon, dtype=np.float64))
+    return np.stack([np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)], axis=-1)
+
+
+def chord(km):
+    """Unit-sphere chord length for a great-circle distance in km."""
+    return 2 * np.sin(np.asarray(km) / (2 * EARTH_RADIUS_KM))
+
+
+def great_circle_km(chord_length):
+    """Great-circle distance in km for a unit-sphere chord length."""
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.minimum(np.asarray(chord_length) / 2, 1.0))
+
+
+@dataclass
+class SpatialIndex:
+    tree: "object"  # scipy.spatial.cKDTree over `unit_vectors` of the listings
+    listings: pd.DataFrame  # one row per tree point, INDEX_COLUMNS
+    _values: Dict[str, np.ndarray] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        # Plain arrays for the per-query summaries
+        sentiment = self.listings["most_common_sentiment"]
+        self._values = {
+            "avg_vader_score": self.listings["avg_vader_score"].to_numpy(dtype=np.float64),
+            "negative": np.where(sentiment.isna(), np.nan, (sentiment == "Negative").astype(np.float64)),
+            "price": self.listings["price"].to_numpy(dtype=np.float64),
+            "log_price": self.listings["log_price"].to_numpy(dtype=np.float64),
+        }
+
+    def __len__(self) -> int:
+        return len(self.listings)
+
+    def query(self, lat: float, lon: float, radius_km: Optional[float] = None,
+              k: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Positions and distances (km) of listings within `radius_km`, or of the `k`
+        nearest, closest first."""
+        _check_query(radius_km, k)
+        point = unit_vectors(lat, lon)
+        if k is not None:
+            distances, positions = self.tree.query(point, k=[i + 1 for i in range(min(k, len(self)))])
+            found = positions < len(self)
+            return positions[found], great_circle_km(distances[found])
+        positions = np.asarray(self.tree.query_ball_point(point, chord(radius_km)), dtype=np.int64)
+        distances = np.sqrt(((self.tree.data[positions] - point) ** 2).sum(axis=1))
+        order = np.argsort(distances, kind="stable")
+        return positions[order], great_circle_km(distances[order])
+
+    def neighbours(self, lat: float, lon: float, radius_km: Optional[float] = None,
+                   k: Optional[int] = None) -> pd.DataFrame:
+        """Listings returned by `query`, with a `distance_km` column."""
+        positions, distances = self.query(lat, lon, radius_km, k)
+        return self.listings.iloc[positions].assign(distance_km=distances)
+
+    def summarize(self, lat: float, lon: float, radius_km: Optional[float] = None,
+                  k: Optional[int] = None) -> dict:
+        """Count, density and mean sentiment / median price of the listings returned by `query`."""
+        positions, distances = self.query(lat, lon, radius_km, k)
+        n = len(positions)
+        radius = radius_km if radius_km is not None else (distances[-1] if n else np.nan)
+        values = {name: array[positions] for name, array in self._values.items()}
+        with np.errstate(invalid="ignore", divide="ignore"), warnings.catch_warnings():
+            # nanmean/nanmedian warn when no neighbour has reviews
+            warnings.simplefilter("ignore", RuntimeWarning)
+            return {
+                "n_neighbours": n,
+                "radius_km": float(radius),
+                "density_km2": float(n / (np.pi * radius ** 2)) if radius else np.nan,
+                "avg_vader_score": float(np.nanmean(values["avg_vader_score"])) if n else np.nan,
+                "negative_share": float(np.nanmean(values["negative"])) if n else np.nan,
+                "median_price": float(np.nanmedian(values["price"])) if n else np.nan,
+                "median_log_price": float(np.nanmedian(values["log_price"])) if n else np.nan,
+            }
+
+    def neighbourhoods(self, radius_km: Optional[float] = None, k: Optional[int] = None,
+                       block_size: int = BLOCK_SIZE) -> pd.DataFrame:
+        """`summarize` for every indexed listing (itself excluded), indexed by `listing_id`.
+
+        Each block of listings is one tree query; the per-listing statistics are
+        then array reductions over the block's (listing, neighbour) pairs.
+        """
+        _check_query(radius_km, k)
+        n = len(self)
+        columns = {name: np.full(n, np.nan) for name in NEIGHBOURHOOD_COLUMNS}
+        for lo in range(0, n, block_size):
+            block = np.arange(lo, min(lo + block_size, n))
+            if k is not None:
+                rows, positions, radius = self._nearest_pairs(block, k)
+            else:
+                rows, positions, radius = self._radius_pairs(block, radius_km)
+            for name, values in _pair_stats(self._values, rows, positions, len(block), radius).items():
+                columns[name][block] = values
+        out = pd.DataFrame(columns, index=pd.Index(self.listings["listing_id"].to_numpy(), name="listing_id"))
+        out["n_neighbours"] = out["n_neighbours"].astype(np.int64)
+        return out
+
+    def _nearest_pairs(self, block: np.ndarray, k: int):
+        """(row in block, neighbour position) pairs for the `k` nearest other listings, and
+        the distance to the farthest of them."""
+        k = min(k, len(self) - 1)
+        if k < 1:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.full(len(block), np.nan)
+        distances, positions = self.tree.query(self.tree.data[block], k=k + 1)
+        # Drop each listing itself; with duplicate coordinates it need not come first,
+        # and when it isn't returned at all the farthest neighbour goes instead
+        keep = positions != block[:, None]
+        keep[keep.all(axis=1), -1] = False
+        positions = positions[keep].reshape(len(block), k)
+        distances = distances[keep].reshape(len(block), k)
+        rows = np.repeat(np.arange(len(block)), k)
+        return rows, positions.ravel(), great_circle_km(distances[:, -1])
+
+    def _radius_pairs(self, block: np.ndarray, radius_km: float):
+        """(row in block, neighbour position) pairs for other listings within `radius_km`."""
+        from scipy.spatial import cKDTree
+
+        pairs = cKDTree(self.tree.data[block]).sparse_distance_matrix(
+            self.tree, chord(radius_km), output_type="ndarray"
+        )
+        rows, positions = pairs["i"].astype(np.int64), pairs["j"].astype(np.int64)
+        other = positions != block[rows]
+        return rows[other], positions[other], np.full(len(block), float(radius_km))
+
+
+def _check_query(radius_km, k) -> None:
+    if (radius_km is None) == (k is None):
+        raise ValueError("Pass exactly one of radius_km and k")
+
+
+def _pair_stats(values: Dict[str, np.ndarray], rows: np.ndarray, positions: np.ndarray,
+                n: int, radius: np.ndarray) -> Dict[str, np.ndarray]:
+    """Per-row neighbourhood statistics from (row, neighbour position) pairs."""
+    counts = np.bincount(rows, minlength=n)
+    out = {"n_neighbours": counts, "radius_km": radius}
+    with np.errstate(invalid="ignore", divide="ignore"):
+        out["density_km2"] = counts / (np.pi * radius ** 2)
+        for name, column in [("avg_vader_score", "avg_vader_score"), ("negative", "negative_share")]:
+            neighbour = values[name][positions]
+            present = ~np.isnan(neighbour)
+            out[column] = (np.bincount(rows[present], weights=neighbour[present], minlength=n)
+                           / np.bincount(rows[present], minlength=n))
+    for name, column in [("price", "median_price"), ("log_price", "median_log_price")]:
+        neighbour = pd.Series(values[name][positions])
+        out[column] = neighbour.groupby(rows).median().reindex(range(n)).to_numpy()
+    return out
+
+
+def neighbour_features(index: SpatialIndex, k: int = 20) -> pd.DataFrame:
+    """Forecaster features from each listing's `k` nearest other listings: their median
+    log price, mean sentiment and density (k over the area of the circle reaching the
+    k-th neighbour), one row per indexed listing."""
+    neighbourhoods = index.neighbourhoods(k=k)
+    return pd.DataFrame(
+        {
+            "listing_id": neighbourhoods.index.to_numpy(),
+            "nb_median_log_price": neighbourhoods["median_log_price"].to_numpy(),
+            "nb_avg_vader_score": neighbourhoods["avg_vader_score"].to_numpy(),
+            "nb_density_km2": neighbourhoods["density_km2"].to_numpy(),
+        }
+    )
+
+
+def build_spatial_index(ri_df: pd.DataFrame, summary_df: Optional[pd.DataFrame] = None) -> SpatialIndex:
+    """Index every listing with coordinates, joined to listing-level sentiment where it has reviews."""
+    from scipy.spatial import cKDTree
+
+    listings = ri_df.drop_duplicates("listing_id")
+    listings = listings[listings["latitude"].notna() & listings["longitude"].notna()]
+    columns = ["listing_id", "latitude", "longitude", "price"]
+    listings = listings[columns].assign(log_price=np.log1p(listings["price"].to_numpy(dtype=np.float64)))
+    sentiment = (summary_df[["listing_id", "avg_vader_score", "most_common_sentiment"]]
+                 if summary_df is not None else
+                 pd.DataFrame(columns=["listing_id", "avg_vader_score", "most_common_sentiment"]))
+    listings = pd.merge(listings, sentiment, on="listing_id", how="left").reset_index(drop=True)
+    listings["avg_vader_score"] = listings["avg_vader_score"].astype(np.float64)
+    tree = cKDTree(unit_vectors(listings["latitude"], listings["longitude"]))
+    return SpatialIndex(tree=tree, listings=listings[INDEX_COLUMNS])
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """`python -m sentiment_pricing.spatial --lat .. --lon .. (--radius-km R | -k K)`:
+    neighbours of a point from the stored index."""
+    import argparse
+
+    from .pipeline import ArtifactStore
+
+    parser = argparse.ArgumentParser(prog="sentiment_pricing.spatial")
+    parser.add_argument("--workdir", default="artifacts", help="Run with 'spatial_index'")
+    parser.add_argument("--lat", type=float, required=True)
+    parser.add_argument("--lon", type=float, required=True)
+    query = parser.add_mutually_exclusive_group(required=True)
+    query.add_argument("--radius-km", type=float, help="Listings within this distance")
+    query.add_argument("-k", type=int, help="This many nearest listings")
+    parser.add_argument("--show", type=int, default=10, help="Neighbours to print")
+    args = parser.parse_args(argv)
+
+    index = ArtifactStore(args.workdir)["spatial_index"]
+    neighbours = index.neighbours(args.lat, args.lon, args.radius_km, args.k)
+    start = time.perf_counter()
+    summary = index.summarize(args.lat, args.lon, args.radius_km, args.k)
+    elapsed = time.perf_counter() - start
+    print(neighbours.head(args.show).to_string(index=False, float_format="{:.3f}".format))
+    for name, value in summary.items():
+        print(f"{name}: {value:.3f}" if isinstance(value, float) else f"{name}: {value}")
+    print(f"{len(index)} listings indexed, query in {elapsed * 1000:.2f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,130 @@
+"""Streaming reviews ingestion with bounded memory.
+
+`reviews.csv.gz` is read in chunks; each chunk is cleaned, scored and reduced to
+per-listing partial totals before the next one is read. Partial totals are
+written to disk after every chunk and merged into a running `SentimentState`,
+so peak memory depends on the chunk size and the number of listings rather
+than on the number of reviews. Given an earlier state, chunks are filtered to
+reviews past its watermark before cleaning, so a refresh only processes new
+reviews.
+"""
+
+from collections import Counter
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterator, Optional, Sequence, Set
+
+import pandas as pd
+
+from .aggregate import update_word_counts
+from .clean import clean_reviews
+from .drift import DriftDetector
+from .incremental import SentimentState
+from .load import iter_reviews
+from .score import DEFAULT_CHUNKSIZE, score_reviews
+from .timecube import SentimentCube
+
+if TYPE_CHECKING:
+    from .cache import ReviewCache
+
+
+def _review_ids(path: str, chunksize: int) -> Set[int]:
+    """Ids of all reviews in `path`, read one column at a time."""
+    ids: Set[int] = set()
+    for chunk in iter_reviews(path, chunksize, columns=["id"]):
+        ids.update(chunk["id"].tolist())
+    return ids
+
+
+def _chain_chunks(paths: Sequence[str], chunksize: int) -> Iterator[pd.DataFrame]:
+    """Chunks of all files in turn, with row positions continuing across files.
+
+    A review whose id is also in a later file is left out, so later files (e.g.
+    newer snapshots of the same region) replace earlier copies, as
+    `drop_duplicates("id", keep="last")` does for loaded tables.
+    """
+    later_ids = [_review_ids(path, chunksize) for path in paths[1:]]
+    offset = 0
+    for i, path in enumerate(paths):
+        n_rows = 0
+        for chunk in iter_reviews(path, chunksize):
+            n_rows = max(n_rows, int(chunk.index.max()) + 1) if len(chunk) else n_rows
+            chunk.index = chunk.index + offset
+            for ids in later_ids[i:]:
+                chunk = chunk[~chunk["id"].isin(ids)]
+            yield chunk
+        offset += n_rows
+
+
+def stream_sentiment_state(
+    paths: Sequence[str],
+    chunksize: int,
+    partials_dir: Optional[Path] = None,
+    n_jobs: Optional[int] = 1,
+    score_chunksize: int = DEFAULT_CHUNKSIZE,
+    cache: Optional["ReviewCache"] = None,
+    state: Optional[SentimentState] = None,
+    word_counts: Optional[Dict[str, Counter]] = None,
+    cube: Optional[SentimentCube] = None,
+    detector: Optional[DriftDetector] = None,
+    backend: str = "vader",
+    dedup: bool = True,
+) -> SentimentState:
+    """Per-listing `SentimentState` streamed from `paths`, on top of `state` if given.
+
+    Several files are read one after another as if they were one table, with
+    each review taken from the last file holding its id. Per-sentiment token
+    counts of the new reviews are added to `word_counts`, their per-day totals to
+    `cube` and the reviews themselves to the drift `detector`, if given.
+    """
+    if isinstance(paths, (str, Path)):
+        paths = [paths]
+    if partials_dir is not None:
+        partials_dir = Path(partials_dir)
+        partials_dir.mkdir(parents=True, exist_ok=True)
+        for stale in partials_dir.glob("part-*.pkl"):
+            stale.unlink()
+
+    base = state or SentimentState()
+    running = base
+    n_reviews = 0
+    for i, chunk in enumerate(_chain_chunks(paths, chunksize)):
+        chunk = base.unseen(chunk)
+        if chunk.empty:
+            continue
+        scored = score_reviews(
+            clean_reviews(chunk, cache=cache, dedup=dedup),
+            n_jobs=n_jobs,
+            chunksize=score_chunksize,
+            cache=cache,
+            backend=backend,
+            dedup=dedup,
+        )
+        part = SentimentState.from_reviews(scored)
+        if word_counts is not None:
+            update_word_counts(word_counts, scored)
+        if cube is not None:
+            cube.update(scored)
+        if detector is not None:
+            detector.update(scored)
+        if partials_dir is not None and part.totals is not None:
+            part.totals.to_pickle(partials_dir / f"part-{i:05d}.pkl")
+
+        running = running.merge(part)
+        n_reviews += len(scored)
+        print(f"chunk {i}: {len(scored)} reviews, {n_reviews} total, {len(running)} listings")
+    return running
+
+
+def stream_listing_sentiment(
+    paths: Sequence[str],
+    chunksize: int,
+    partials_dir: Optional[Path] = None,
+    n_jobs: Optional[int] = 1,
+    score_chunksize: int = DEFAULT_CHUNKSIZE,
+    cache: Optional["ReviewCache"] = None,
+) -> pd.DataFrame:
+    """Listing-level sentiment (`avg_vader_score`, `most_common_sentiment`) streamed from `paths`."""
+    state = stream_sentiment_state(
+        paths, chunksize, partials_dir, n_jobs=n_jobs, score_chunksize=score_chunksize, cache=cache
+    )
+    return state.listing_sentiment()
@@ -0,0 +1,156 @@
+"""Sparse term-by-review index for word analysis of any listing segment.
+
+The index stage tokenizes `clean_text` once into a CSR matrix (reviews × terms)
+alongside a compact per-review table: listing id, sentiment, date and the
+listing's segment attributes as categoricals. A query such as "top negative
+words in >$300 listings" is then a boolean mask over that table, a row slice
+of the matrix and a column sum:
+
+    python -m sentiment_pricing.termindex --sentiment Negative --price-range ">\\$300"
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .config import SENTIMENT_LABELS
+
+# Listing attributes a query can filter on
+SEGMENT_COLUMNS = ["price_range", "room_type", "host_is_superhost", "neighbourhood_cleansed"]
+
+
+@dataclass
+class TermIndex:
+    matrix: "object"  # scipy.sparse.csr_matrix, reviews × terms
+    terms: np.ndarray
+    reviews: pd.DataFrame  # one row per matrix row: listing_id, sentiment, date, SEGMENT_COLUMNS
+
+    def mask(
+        self,
+        sentiment: Optional[str] = None,
+        start=None,
+        end=None,
+        listing_ids: Optional[Sequence] = None,
+        **segments,
+    ) -> np.ndarray:
+        """Boolean row mask for a sentiment label, date window [start, end] and segment values.
+
+        Segment filters take one value or a list of values, e.g.
+        `room_type=["Private room", "Hotel room"]`.
+        """
+        unknown = set(segments) - set(SEGMENT_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown segment(s): {', '.join(sorted(unknown))}")
+        keep = np.ones(len(self.reviews), dtype=bool)
+        filters = dict(segments)
+        if sentiment is not None:
+            filters["sentiment"] = sentiment
+        if listing_ids is not None:
+            filters["listing_id"] = list(listing_ids)
+        for column, values in filters.items():
+            values = values if isinstance(values, (list, tuple, set)) else [values]
+            codes, positions = self._codes(column)
+            # Code → selected lookup; the extra last slot catches missing values (code -1)
+            selected = np.zeros(len(positions) + 1, dtype=bool)
+            selected[[positions[v] for v in values if v in positions]] = True
+            keep &= selected[codes]
+        if start is not None or end is not None:
+            days = self._days()
+            if start is not None:
+                keep &= days >= pd.Timestamp(start).value
+            if end is not None:
+                keep &= days <= pd.Timestamp(end).value
+        return keep
+
+    def _codes(self, column: str):
+        """Category codes of a per-review column and each category's code, cached."""
+        cache = self.__dict__.setdefault("_code_cache", {})
+        if column not in cache:
+            values = self.reviews[column].cat
+            positions = {category: i for i, category in enumerate(values.categories.tolist())}
+            cache[column] = values.codes.to_numpy(), positions
+        return cache[column]
+
+    def _days(self) -> np.ndarray:
+        cache = self.__dict__.setdefault("_code_cache", {})
+        if "date" not in cache:
+            cache["date"] = self.reviews["date"].to_numpy(dtype="datetime64[ns]").view(np.int64)
+        return cache["date"]
+
+    def term_counts(self, rows: np.ndarray) -> np.ndarray:
+        """Total count of every term over the selected rows (a boolean mask)."""
+        if rows.sum() * 4 < len(rows):
+            # Small selections: sum only the selected rows' entries
+            return np.asarray(self.matrix[np.flatnonzero(rows)].sum(axis=0)).ravel()
+        return rows.astype(self.matrix.dtype) @ self.matrix
+
+    def top_terms(self, n: int = 10, **filters) -> pd.DataFrame:
+        """The `n` most frequent terms in reviews matching `filters` (see `mask`)."""
+        rows = self.mask(**filters)
+        counts = self.term_counts(rows)
+        n = min(n, int((counts > 0).sum()))
+        top = np.argpartition(-counts, n - 1)[:n] if n else np.array([], dtype=np.int64)
+        top = top[np.lexsort((self.terms[top], -counts[top]))]
+        return pd.DataFrame({"term": self.terms[top], "count": counts[top]})
+
+
+def build_term_index(reviews_df: pd.DataFrame, ri_df: pd.DataFrame) -> TermIndex:
+    """Index `clean_text` of scored reviews, with segment attributes from the listing table."""
+    from sklearn.feature_extraction.text import CountVectorizer
+
+    # `clean_text` is already tokenized, lowercased and stop-word filtered
+    vectorizer = CountVectorizer(analyzer=str.split, dtype=np.int32)
+    matrix = vectorizer.fit_transform(reviews_df["clean_text"])
+    terms = vectorizer.get_feature_names_out()
+
+    listing_ids = np.asarray(reviews_df["listing_id"])
+    listings = ri_df.drop_duplicates("listing_id").set_index("listing_id")
+    rows = listings.index.get_indexer(listing_ids)
+    reviews = pd.DataFrame(
+        {
+            "listing_id": pd.Categorical(listing_ids),
+            "sentiment": pd.Categorical(np.asarray(reviews_df["sentiment"]), categories=SENTIMENT_LABELS),
+            "date": pd.to_datetime(reviews_df["date"]).to_numpy(),
+        }
+    )
+    for column in SEGMENT_COLUMNS:
+        values = listings[column].astype("category")
+        codes = np.where(rows >= 0, values.cat.codes.to_numpy()[rows], -1)
+        reviews[column] = pd.Categorical.from_codes(codes, dtype=values.dtype)
+    return TermIndex(matrix.tocsr(), terms, reviews)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """`python -m sentiment_pricing.termindex [filters]`: top terms from the stored index."""
+    import argparse
+
+    from .pipeline import ArtifactStore
+
+    parser = argparse.ArgumentParser(prog="sentiment_pricing.termindex")
+    parser.add_argument("--workdir", default="artifacts", help="Run with 'term_index'")
+    parser.add_argument("-n", type=int, default=10, help="Number of terms")
+    parser.add_argument("--sentiment", choices=SENTIMENT_LABELS)
+    parser.add_argument("--price-range", dest="price_range", action="append")
+    parser.add_argument("--room-type", dest="room_type", action="append")
+    parser.add_argument("--superhost", dest="host_is_superhost", type=float, choices=[0, 1])
+    parser.add_argument("--neighbourhood", dest="neighbourhood_cleansed", action="append")
+    parser.add_argument("--start", help="First review date (inclusive)")
+    parser.add_argument("--end", help="Last review date (inclusive)")
+    args = vars(parser.parse_args(argv))
+
+    index = ArtifactStore(args.pop("workdir"))["term_index"]
+    n = args.pop("n")
+    filters = {k: v for k, v in args.items() if v is not None}
+    start = time.perf_counter()
+    top = index.top_terms(n, **filters)
+    elapsed = time.perf_counter() - start
+    print(top.to_string(index=False))
+    print(f"{int(index.mask(**filters).sum())} reviews, query in {elapsed * 1000:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
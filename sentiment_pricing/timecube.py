@@ -0,0 +1,201 @@
+"""Sentiment-over-time cube: review counts and score sums per time bucket and listing.
+
+For each bucket size (day, week, month) the cube holds one row per
+(bucket start, listing) with `n_reviews`, the exact compound-score sum (1e-4
+units, as in `aggregate`) and per-label counts. New reviews are added with
+`update`; trends for all listings, a set of listings or any listing segment
+(room type, neighbourhood, ...) are then read from the cube, never from the
+reviews:
+
+    cube = SentimentCube.from_reviews(scored_reviews)
+    cube.series("W", ri_df=ri_df, segment="room_type")
+    cube.ewma("D", halflife=14)
+"""
+
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .aggregate import COUNT_COLUMNS, SCORE_SCALE, _plain_keys
+from .config import SENTIMENT_LABELS
+
+FREQS = ("D", "W", "M")
+TOTAL_COLUMNS = ["n_reviews", "vader_sum"] + COUNT_COLUMNS
+
+
+def bucket_start(dates: pd.Series, freq: str) -> pd.Series:
+    """Start of the day, week (Monday) or month each date falls in."""
+    dates = pd.to_datetime(dates)
+    if freq == "D":
+        return dates.dt.normalize()
+    return dates.dt.to_period(freq).dt.start_time
+
+
+def bucket_totals(reviews_df: pd.DataFrame, freq: str) -> pd.DataFrame:
+    """Totals per (bucket, listing_id) for a batch of scored reviews."""
+    reviews_df = _plain_keys(reviews_df)
+    scaled = np.rint(reviews_df["vader_score"].to_numpy(dtype=np.float64) * SCORE_SCALE)
+    labels = pd.Categorical(np.asarray(reviews_df["sentiment"]), categories=SENTIMENT_LABELS)
+    frame = pd.DataFrame(
+        {
+            "bucket": bucket_start(reviews_df["date"], freq).to_numpy(),
+            "listing_id": reviews_df["listing_id"].to_numpy(),
+            "n_reviews": 1,
+            "vader_sum": scaled.astype(np.int64),
+        }
+    )
+    for code, column in enumerate(COUNT_COLUMNS):
+        frame[column] = (labels.codes == code).astype(np.int64)
+    return frame.groupby(["bucket", "listing_id"]).sum()
+
+
+class SentimentCube:
+    """Per-bucket, per-listing sentiment totals for each of `FREQS`."""
+
+    def __init__(self, tables: Optional[Dict[str, pd.DataFrame]] = None):
+        self.tables = tables or {}
+
+    @classmethod
+    def from_reviews(cls, reviews_df: pd.DataFrame) -> "SentimentCube":
+        return cls().update(reviews_df)
+
+    def update(self, reviews_df: pd.DataFrame) -> "SentimentCube":
+        """Add a batch of (new) scored reviews, in place."""
+        if not reviews_df.empty:
+            for freq in FREQS:
+                self._add(freq, bucket_totals(reviews_df, freq))
+        return self
+
+    def merge(self, other: "SentimentCube") -> "SentimentCube":
+        """Cube over the reviews of both cubes (e.g. two regions or two shards)."""
+        merged = SentimentCube(dict(self.tables))
+        for freq, table in other.tables.items():
+            merged._add(freq, table)
+        return merged
+
+    def _add(self, freq: str, part: pd.DataFrame) -> None:
+        table = self.tables.get(freq)
+        self.tables[freq] = part if table is None else table.add(part, fill_value=0).astype(np.int64)
+
+    def totals(
+        self,
+        freq: str = "D",
+        listing_ids: Optional[Sequence] = None,
+        ri_df: Optional[pd.DataFrame] = None,
+        segment: Optional[str] = None,
+    ) -> pd.DataFrame:
+        """Summed totals per bucket (and per `segment` value, looked up in `ri_df`)."""
+        if freq not in FREQS:
+            raise ValueError(f"Unknown bucket '{freq}'; choose from {', '.join(FREQS)}")
+        table = self.tables.get(freq)
+        if table is None:
+            return pd.DataFrame(columns=TOTAL_COLUMNS)
+        if listing_ids is not None:
+            table = table[table.index.get_level_values("listing_id").isin(np.asarray(listing_ids))]
+        if segment is None:
+            return table.groupby(level="bucket").sum()
+
+        lookup = ri_df.drop_duplicates("listing_id").set_index("listing_id")[segment]
+        keys = lookup.reindex(table.index.get_level_values("listing_id")).to_numpy()
+        keep = pd.notna(keys)
+        table = table[keep]
+        groups = [table.index.get_level_values("bucket"), pd.Index(keys[keep], name=segment)]
+        return table.groupby(groups).sum()
+
+    def series(self, freq: str = "D", **selection) -> pd.DataFrame:
+        """Per-bucket `n_reviews`, `avg_vader_score` and `negative_rate` (see `totals`)."""
+        return _rates(self.totals(freq, **selection))
+
+    def rolling(self, freq: str = "D", window: int = 7, **selection) -> pd.DataFrame:
+        """Review-weighted averages over the last `window` buckets (empty buckets count)."""
+        totals = _regular(self.totals(freq, **selection), freq)
+        return _rates(_by_segment(totals, lambda t: t.rolling(window, min_periods=1).sum()))
+
+    def ewma(self, freq: str = "D", halflife: float = 7, **selection) -> pd.DataFrame:
+        """Exponentially weighted, review-weighted averages with `halflife` in buckets."""
+        return ewma_rates(self.totals(freq, **selection), freq, halflife)
+
+
+def ewma_rates(totals: pd.DataFrame, freq: str, halflife: float) -> pd.DataFrame:
+    """`SentimentCube.ewma` over already summed per-bucket (and per-segment) totals."""
+    totals = _regular(totals, freq)
+    return _rates(_by_segment(totals, lambda t: t.ewm(halflife=halflife).mean()))
+
+
+def _regular(totals: pd.DataFrame, freq: str) -> pd.DataFrame:
+    """Totals with every bucket between the first and last present (zeros in the gaps)."""
+    if totals.empty:
+        return totals
+    step = {"D": "D", "W": "W-MON", "M": "MS"}[freq]
+    if totals.index.nlevels == 1:
+        full = pd.date_range(totals.index.min(), totals.index.max(), freq=step, name="bucket")
+        return totals.reindex(full, fill_value=0)
+    buckets = totals.index.get_level_values(0)
+    full = pd.date_range(buckets.min(), buckets.max(), freq=step, name="bucket")
+    segments = totals.index.get_level_values(1).unique()
+    index = pd.MultiIndex.from_product([full, segments], names=totals.index.names)
+    return totals.reindex(index, fill_value=0)
+
+
+def _by_segment(totals: pd.DataFrame, window) -> pd.DataFrame:
+    """Apply a window over buckets, separately for each segment value if there are any."""
+    if totals.index.nlevels == 1:
+        return window(totals)
+    segment = totals.index.names[1]
+    out = window(totals.unstack(segment)).stack(segment, future_stack=True)
+    return out.reindex(totals.index)
+
+
+def _rates(totals: pd.DataFrame) -> pd.DataFrame:
+    n = totals["n_reviews"].astype(np.float64)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return pd.DataFrame(
+            {
+                "n_reviews": totals["n_reviews"],
+                "avg_vader_score": totals["vader_sum"] / SCORE_SCALE / n,
+                "negative_rate": totals["n_negative"] / n,
+            },
+            index=totals.index,
+        )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """`python -m sentiment_pricing.timecube [options]`: a trend from the stored cube."""
+    import argparse
+    import time
+
+    from .pipeline import ArtifactStore
+
+    parser = argparse.ArgumentParser(prog="sentiment_pricing.timecube")
+    parser.add_argument("--workdir", default="artifacts", help="Run with 'sentiment_cube'")
+    parser.add_argument("--freq", choices=FREQS, default="W", help="Bucket size")
+    parser.add_argument("--segment", help="Listing column to split by, e.g. room_type")
+    parser.add_argument("--listing", dest="listing_ids", type=int, action="append")
+    window = parser.add_mutually_exclusive_group()
+    window.add_argument("--rolling", type=int, help="Rolling window, in buckets")
+    window.add_argument("--ewma", type=float, help="EWMA half-life, in buckets")
+    parser.add_argument("--tail", type=int, default=12, help="Buckets to print")
+    args = parser.parse_args(argv)
+
+    store = ArtifactStore(args.workdir)
+    cube = store["sentiment_cube"]
+    selection = {"listing_ids": args.listing_ids}
+    if args.segment:
+        selection.update(ri_df=store["listings"], segment=args.segment)
+    start = time.perf_counter()
+    if args.rolling:
+        trend = cube.rolling(args.freq, args.rolling, **selection)
+    elif args.ewma:
+        trend = cube.ewma(args.freq, args.ewma, **selection)
+    else:
+        trend = cube.series(args.freq, **selection)
+    elapsed = time.perf_counter() - start
+    buckets = trend.index.get_level_values("bucket").unique()[-args.tail:]
+    print(trend[trend.index.get_level_values("bucket").isin(buckets)].to_string())
+    print(f"query in {elapsed * 1000:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,283 @@
+"""Vectorized VADER scoring over batches of comments.
+
+`polarity_scores` walks every review token by token in Python, repeating the
+lexicon lookups and rule checks for each copy of a word. Here a batch is split
+into tokens once, the distinct tokens are looked up once, and VADER's rules run
+as NumPy operations over the flat token array, with neighbours reached by
+shifting that array:
+
+* lexicon valences, "no" handling and ALL-CAPS emphasis,
+* boosters/dampeners up to three words back (scaled 1, 0.95, 0.9),
+* negation ("not", "n't", "never so", "without doubt", "least", ...),
+* the special-case idioms and multi-word boosters ("kind of", "the bomb"),
+* the "but" rule, and "!"/"?" emphasis.
+
+The reference "but" rule finds each sentiment by value (`list.index`), so when
+a token's valence equals another token's rescaled valence it rescales the wrong
+one. To stay identical to `SentimentIntensityAnalyzer.polarity_scores`, the few
+reviews where that can happen are passed through the reference `_but_check`;
+all other reviews get the array version. `python -m sentiment_pricing.bench vader`
+reports agreement and throughput.
+"""
+
+import string
+from itertools import chain
+from typing import Dict, Sequence
+
+import numpy as np
+import pandas as pd
+
+_tables = None
+
+# Words the rules refer to directly
+RULE_WORDS = [
+    "no", "or", "nor", "kind", "of", "never", "so", "this", "without", "doubt",
+    "least", "at", "very", "but",
+]
+
+
+def _get_tables() -> dict:
+    """Lexicon, rule constants and emoji pattern, built once per process."""
+    global _tables
+    if _tables is None:
+        from vaderSentiment import vaderSentiment as vs
+
+        from .score import _get_analyzer
+
+        analyzer = _get_analyzer()
+        _tables = {
+            "module": vs,
+            "lexicon": analyzer.lexicon,
+            "emojis": analyzer.emojis,
+            # Only single characters can match in the reference's per-character scan
+            "emoji_chars": frozenset(e for e in analyzer.emojis if len(e) == 1),
+            "negate": set(vs.NEGATE),
+        }
+    return _tables
+
+
+def _replace_emojis(text: str, emojis: Dict[str, str]) -> str:
+    """Emoji → description substitution exactly as in `polarity_scores`."""
+    out = ""
+    prev_space = True
+    for ch in text:
+        if ch in emojis:
+            if not prev_space:
+                out += " "
+            out += emojis[ch]
+            prev_space = False
+        else:
+            out += ch
+            prev_space = ch == " "
+    return out
+
+
+def _strip_punc_if_word(token: str) -> str:
+    stripped = token.strip(string.punctuation)
+    return token if len(stripped) <= 2 else stripped
+
+
+def _shift(values: np.ndarray, k: int, pos: np.ndarray, length: np.ndarray, fill):
+    """`values` of the token k places later (k > 0) or earlier (k < 0) in the same review."""
+    out = np.full_like(values, fill)
+    if k < 0:
+        valid = pos >= -k
+        out[-k:] = values[:k]
+    else:
+        valid = pos + k < length
+        out[:-k] = values[k:]
+    return np.where(valid, out, fill)
+
+
+def score_batch(texts: Sequence[str]) -> np.ndarray:
+    """(n, 4) float32 array of neg/neu/pos/compound, like `score._score_chunk`."""
+    tables = _get_tables()
+    vs = tables["module"]
+    lexicon = tables["lexicon"]
+    emojis = tables["emojis"]
+    emoji_chars = tables["emoji_chars"]
+
+    # Emojis are non-ASCII, so most reviews skip the character scan entirely
+    texts = [str(t) for t in texts]
+    texts = [
+        (t if t.isascii() or emoji_chars.isdisjoint(t) else _replace_emojis(t, emojis)).strip()
+        for t in texts
+    ]
+    n_docs = len(texts)
+    split = [t.split() for t in texts]
+    lengths = np.fromiter(map(len, split), dtype=np.int64, count=n_docs)
+    doc = np.repeat(np.arange(n_docs), lengths)
+    n_tokens = len(doc)
+    starts = np.cumsum(lengths) - lengths
+    pos = np.arange(n_tokens) - np.repeat(starts, lengths)
+    length = lengths[doc]
+
+    # Per distinct raw token: stripped/lowercased form and its lexical properties
+    codes, uniques = pd.factorize(pd.Series(list(chain.from_iterable(split)), dtype=object))
+    words = [_strip_punc_if_word(u) for u in uniques]
+    lowered = [w.lower() for w in words]
+    word_ids, lower_uniques = pd.factorize(pd.Series(lowered, dtype=object))
+    lower_id = {w: i for i, w in enumerate(lower_uniques)}
+
+    def per_token(values, dtype):
+        return np.asarray(values, dtype=dtype)[codes] if n_tokens else np.empty(0, dtype)
+
+    lid = per_token(word_ids, np.int64)
+    valence = per_token([lexicon.get(w, 0.0) for w in lowered], np.float64)
+    in_lex = per_token([w in lexicon for w in lowered], bool)
+    boost = per_token([vs.BOOSTER_DICT.get(w, 0.0) for w in lowered], np.float64)
+    is_booster = per_token([w in vs.BOOSTER_DICT for w in lowered], bool)
+    upper = per_token([w.isupper() for w in words], bool)
+    negating = per_token([w in tables["negate"] or "n't" in w for w in lowered], bool)
+
+    ids = {w: lower_id.get(w, -2) for w in RULE_WORDS}
+
+    def prev(values, k, fill):
+        return _shift(values, -k, pos, length, fill)
+
+    def nxt(values, k, fill):
+        return _shift(values, k, pos, length, fill)
+
+    p1, p2, p3 = (prev(lid, k, -1) for k in (1, 2, 3))
+    n1 = nxt(lid, 1, -1)
+
+    def is_word(token_ids, *names):
+        return np.isin(token_ids, [ids[n] for n in names])
+
+    shifted_ids = {0: lid, -1: p1, -2: p2, -3: p3, 1: n1, 2: nxt(lid, 2, -1)}
+
+    def phrase(*parts):
+        """Tokens whose neighbours (offset, word) spell a phrase, e.g. ((-1, "the"), (0, "bomb"))."""
+        targets = [lower_id.get(word, -2) for _, word in parts]
+        if min(targets) < 0:
+            return np.zeros(n_tokens, dtype=bool)
+        match = np.ones(n_tokens, dtype=bool)
+        for (offset, _), target in zip(parts, targets):
+            match &= shifted_ids[offset] == target
+        return match
+
+    # Some but not all tokens of the review are ALL CAPS
+    caps = np.bincount(doc, weights=upper, minlength=n_docs)
+    cap_diff = ((lengths - caps > 0) & (lengths - caps < lengths))[doc]
+
+    # Lexicon valence, "no" rules and capitalization emphasis
+    v = valence.copy()
+    v = np.where(is_word(lid, "no") & nxt(in_lex, 1, False), 0.0, v)
+    after_no = is_word(p1, "no") | is_word(p2, "no") | (is_word(p3, "no") & is_word(p1, "or", "nor"))
+    v = np.where(after_no, valence * vs.N_SCALAR, v)
+    v = np.where(upper & cap_diff, np.where(v > 0, v + vs.C_INCR, v - vs.C_INCR), v)
+
+    # Boosters, negation and idioms looking up to three words back
+    for k, scale in ((1, 1.0), (2, 0.95), (3, 0.9)):
+        applies = (pos >= k) & ~prev(in_lex, k, True)
+        b = prev(boost, k, 0.0)
+        s = np.where(v < 0, -b, b)
+        emphasized = prev(is_booster, k, False) & prev(upper, k, False) & cap_diff
+        s = np.where(emphasized, np.where(v > 0, s + vs.C_INCR, s - vs.C_INCR), s)
+        if scale != 1.0:
+            s = np.where(s != 0, s * scale, s)
+        v = np.where(applies, v + s, v)
+
+        negated = prev(negating, k, False)
+        if k == 1:
+            v = np.where(applies & negated, v * vs.N_SCALAR, v)
+        elif k == 2:
+            never_so = is_word(p2, "never") & is_word(p1, "so", "this")
+            without_doubt = is_word(p2, "without") & is_word(p1, "doubt")
+            v = np.where(applies & never_so, v * 1.25, v)
+            v = np.where(applies & ~never_so & ~without_doubt & negated, v * vs.N_SCALAR, v)
+        else:
+            never_so = (is_word(p3, "never") & is_word(p2, "so", "this")) | is_word(p1, "so", "this")
+            without_doubt = is_word(p3, "without") & (is_word(p2, "doubt") | is_word(p1, "doubt"))
+            v = np.where(applies & never_so, v * 1.25, v)
+            v = np.where(applies & ~never_so & ~without_doubt & negated, v * vs.N_SCALAR, v)
+            v = _idioms(v, applies, phrase, vs)
+
+    least = is_word(p1, "least") & ~prev(in_lex, 1, True)
+    least &= (pos == 1) | ((pos > 1) & ~is_word(p2, "at", "very"))
+    v = np.where(least, v * vs.N_SCALAR, v)
+
+    scored = in_lex & ~is_booster & ~(is_word(lid, "kind") & is_word(n1, "of"))
+    sentiments = np.where(scored, v, 0.0)
+
+    # "but": halve what comes before the first one, scale what follows by 1.5
+    but_pos = np.full(n_docs, np.iinfo(np.int64).max)
+    is_but = is_word(lid, "but")
+    np.minimum.at(but_pos, doc[is_but], pos[is_but])
+    first_but = but_pos[doc]
+    has_but = first_but != np.iinfo(np.int64).max
+    scaled = np.where(has_but & (pos < first_but), sentiments * 0.5, sentiments)
+    scaled = np.where(has_but & (pos > first_but), sentiments * 1.5, scaled)
+
+    # The reference's by-value lookup only picks another token when a sentiment
+    # equals an already rescaled one in the same review; replay those reviews
+    nonzero = has_but & (sentiments != 0)
+    original = pd.DataFrame({"doc": doc[nonzero], "value": sentiments[nonzero]})
+    rescaled = pd.DataFrame({"doc": doc[nonzero], "value": scaled[nonzero]}).drop_duplicates()
+    replay = original.merge(rescaled, on=["doc", "value"])["doc"].unique()
+    but_check = vs.SentimentIntensityAnalyzer._but_check
+    for d in replay:
+        lo, hi = starts[d], starts[d] + lengths[d]
+        tokens = [words[c] for c in codes[lo:hi]]
+        scaled[lo:hi] = but_check(tokens, sentiments[lo:hi].tolist())
+
+    return _score_valence(texts, doc, scaled, lengths)
+
+
+def _idioms(v, applies, phrase, vs):
+    """Special-case idioms and multi-word boosters checked at the third word back."""
+    special = np.full(len(v), np.nan)
+    # Backward-looking sequences in the reference's order; the first match wins
+    for offsets in ((-1, 0), (-2, -1, 0), (-2, -1), (-3, -2, -1), (-3, -2)):
+        for text, value in vs.SPECIAL_CASES.items():
+            words = text.split()
+            if len(words) != len(offsets):
+                continue
+            hit = phrase(*zip(offsets, words)) & np.isnan(special)
+            special = np.where(hit, value, special)
+    # Forward-looking sequences override
+    for offsets in ((0, 1), (0, 1, 2)):
+        for text, value in vs.SPECIAL_CASES.items():
+            words = text.split()
+            if len(words) == len(offsets):
+                special = np.where(phrase(*zip(offsets, words)), value, special)
+    v = np.where(applies & ~np.isnan(special), special, v)
+
+    for offsets in ((-3, -2, -1), (-3, -2), (-2, -1)):
+        for text, value in vs.BOOSTER_DICT.items():
+            words = text.split()
+            if len(words) == len(offsets):
+                v = np.where(applies & phrase(*zip(offsets, words)), v + value, v)
+    return v
+
+
+def _score_valence(texts, doc, sentiments, lengths) -> np.ndarray:
+    """Per-review neg/neu/pos/compound from token sentiments, as `score_valence` does."""
+    n_docs = len(texts)
+    total = np.bincount(doc, weights=sentiments, minlength=n_docs)
+    pos_sum = np.bincount(doc, weights=np.where(sentiments > 0, sentiments + 1, 0.0), minlength=n_docs)
+    neg_sum = np.bincount(doc, weights=np.where(sentiments < 0, sentiments - 1, 0.0), minlength=n_docs)
+    neu_count = np.bincount(doc, weights=sentiments == 0, minlength=n_docs)
+
+    exclaims = np.minimum([t.count("!") for t in texts], 4) * 0.292
+    questions = np.array([t.count("?") for t in texts])
+    questions = np.where(questions > 3, 0.96, np.where(questions > 1, questions * 0.18, 0.0))
+    emphasis = exclaims + questions
+
+    total = np.where(total > 0, total + emphasis, np.where(total < 0, total - emphasis, total))
+    compound = np.clip(total / np.sqrt(total * total + 15), -1.0, 1.0)
+    more_pos, more_neg = pos_sum > np.abs(neg_sum), pos_sum < np.abs(neg_sum)
+    pos_sum = np.where(more_pos, pos_sum + emphasis, pos_sum)
+    neg_sum = np.where(more_neg, neg_sum - emphasis, neg_sum)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        denominator = pos_sum + np.abs(neg_sum) + neu_count
+        fractions = np.abs(np.stack([neg_sum, neu_count, pos_sum], axis=1) / denominator[:, None])
+
+    empty = lengths == 0
+    fractions[empty] = 0.0
+    compound[empty] = 0.0
+    out = np.empty((n_docs, 4), dtype=np.float32)
+    # Python's round() for the same decimal rounding as the reference
+    out[:, :3] = [[round(x, 3) for x in row] for row in fractions.tolist()]
+    out[:, 3] = [round(x, 4) for x in compound.tolist()]
+    return out